@@ -0,0 +1,120 @@
+"""
+导入耗时基准：每项在新的Python进程中测量导入语句耗时，并检查不应在导入时加载的重依赖
+
+测试执行器为每个DUT启动新进程，导入耗时会被放大数千倍；
+导入 pyinsts/pyinsts.libs/驱动类时不应加载 pyvisa、yaml 与 colorlog，
+加载了禁止的依赖或中位耗时超过基线(1+tolerance)倍时进程返回码为1
+
+example:
+    python benchmarks/bench_import.py --output import.json
+    python benchmarks/bench_import.py --baseline benchmarks/import_baseline.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 以 python -m benchmarks.bench_import 或从其他目录导入时同样可以找到同目录的bench_instruments
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_instruments import compare, format_comparison, summarize  # noqa: E402
+
+# 模块真正加载后才会出现的子模块，延迟导入的占位模块不算加载
+HEAVY_MODULES = {
+    'pyvisa': 'pyvisa.highlevel',
+    'yaml': 'yaml.loader',
+    'colorlog': 'colorlog.formatter',
+}
+
+# (名称, 导入语句, 导入后不应加载的依赖)
+CASES = (
+    ('import_pyinsts', 'import pyinsts', ('pyvisa', 'yaml', 'colorlog')),
+    ('import_libs', 'import pyinsts.libs', ('pyvisa', 'yaml', 'colorlog')),
+    ('import_common', 'from pyinsts import common', ('pyvisa', 'yaml', 'colorlog')),
+    ('import_n9020b', 'from pyinsts.libs import N9020b', ('pyvisa', 'yaml', 'colorlog')),
+    ('import_fswp', 'from pyinsts.libs import Fswp', ('pyvisa', 'yaml', 'colorlog')),
+)
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = [name for name, marker in {heavy!r}.items() if marker in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+'''
+
+
+def probe(statement: str) -> Dict:
+    """在新进程中执行导入语句，返回耗时与已加载的重依赖"""
+    output = subprocess.run([sys.executable, '-c', _PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat: int) -> Dict:
+    results = {}
+    violations = []
+    for name, statement, forbidden in CASES:
+        samples = []
+        loaded: List[str] = []
+        for _ in range(repeat):
+            result = probe(statement)
+            samples.append(result['elapsed'])
+            loaded = result['loaded']
+        results[name] = summarize(samples)
+        results[name]['loaded'] = loaded
+        for module in set(loaded) & set(forbidden):
+            violations.append(f'{statement}: 导入时加载了 {module}')
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+        'violations': violations,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='PyInst 导入耗时基准')
+    parser.add_argument('--repeat', type=int, default=10, help='每项启动的进程数')
+    parser.add_argument('--output', help='结果JSON文件路径')
+    parser.add_argument('--baseline', help='基线JSON文件路径，给出时输出比较结果')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='允许的相对退化比例')
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat)
+    print(f"{'benchmark':<22} {'median_ms':>11} {'p95_ms':>11}  loaded")
+    for name, result in report['results'].items():
+        print(f"{name:<22} {result['median_s'] * 1e3:>11.2f} {result['p95_s'] * 1e3:>11.2f}  "
+              f"{','.join(result['loaded']) or '-'}")
+    status = 0
+    for violation in report['violations']:
+        print(violation)
+        status = 1
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        rows = compare(report, baseline, args.tolerance)
+        report['comparison'] = {'baseline': args.baseline, 'tolerance': args.tolerance, 'rows': rows}
+        print()
+        print(format_comparison(rows))
+        if any(row['regressed'] for row in rows):
+            status = 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
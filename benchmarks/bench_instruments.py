@@ -0,0 +1,223 @@
+"""
+仪器驱动性能基准：设置命令吞吐、查询往返延时、wait_opc开销、迹线ASCII/二进制解码与连接建立耗时
+
+默认使用模拟仪器(sim://)，也可指向本地回环或真实仪器地址。结果输出为JSON，
+可与保存的基线比较，中位耗时超过基线(1+tolerance)倍的项目判为退化，进程返回码为1
+
+example:
+    python benchmarks/bench_instruments.py --output bench.json
+    python benchmarks/bench_instruments.py --baseline benchmarks/baseline.json --tolerance 0.15
+    python benchmarks/bench_instruments.py --n9020b TCPIP0::192.168.1.2::INSTR --fswp TCPIP0::192.168.1.1::INSTR
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from pyinsts.libs import Fswp, N9020b
+from pyinsts.libs.session_pool import session_pool
+
+DEFAULT_N9020B = 'sim://N9020B?latency=0.0002&sweep_time=0.01'
+DEFAULT_FSWP = 'sim://FSWP?latency=0.0002&sweep_time=0.01&points=1001'
+
+
+def summarize(samples: List[float], operations: int = 1) -> Dict[str, float]:
+    """汇总耗时样本(秒)
+
+    Args:
+        samples: 每次重复的耗时
+        operations: 每次重复包含的操作数，用于计算每秒操作数
+    """
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    return {
+        'repeat': len(ordered),
+        'operations': operations,
+        'median_s': median,
+        'mean_s': statistics.fmean(ordered),
+        'min_s': ordered[0],
+        'p95_s': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        'ops_per_s': operations / median if median > 0 else float('inf'),
+    }
+
+
+def measure(func: Callable[[], None], repeat: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_write(analyzer: N9020b, repeat: int, count: int) -> Dict[str, float]:
+    """设置命令吞吐：每次重复经 BaseInstrument.write 发送count条不同频率的设置"""
+    def run():
+        for i in range(count):
+            analyzer.write(f'FREQ:CENT {1e9 + i}Hz')
+    return summarize(measure(run, repeat), count)
+
+
+def bench_query(analyzer: N9020b, repeat: int) -> Dict[str, float]:
+    """查询往返延时"""
+    return summarize(measure(lambda: analyzer.query('FREQ:CENT?'), repeat))
+
+
+def bench_wait_opc(analyzer: N9020b, repeat: int) -> Dict[str, float]:
+    """仪器空闲时 wait_opc 的固定开销"""
+    return summarize(measure(analyzer.wait_opc, repeat))
+
+
+def bench_connect(address: str, repeat: int, pooled: bool) -> Dict[str, float]:
+    """_connect_instrument 建立连接耗时，pooled为False时每次清空会话池"""
+    def run():
+        if not pooled:
+            session_pool.close_all()
+        N9020b(address).close()
+    return summarize(measure(run, repeat))
+
+
+def bench_trace(fswp: Fswp, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Fswp.query_vcochar_* 迹线读取：ASCII逐项float解析与二进制块解码的端到端与纯解码耗时"""
+    results = {}
+
+    def ascii_fetch():
+        fswp.write('FORM ASC', shadow=True)
+        return fswp.query('TRAC1? TRACE1')
+
+    text = ascii_fetch()
+    results['trace_ascii_fetch'] = summarize(
+        measure(lambda: [float(value) for value in ascii_fetch().split(',')], repeat))
+    results['trace_ascii_decode'] = summarize(
+        measure(lambda: [float(value) for value in text.split(',')], repeat))
+
+    results['trace_binary_fetch'] = summarize(
+        measure(lambda: fswp.query_trace(1, refresh=True), repeat))
+    fswp.set_data_format(64)
+    fswp.write('TRAC1? TRACE1')
+    block = fswp.read_block()
+    results['trace_binary_decode'] = summarize(
+        measure(lambda: np.frombuffer(block, dtype='<f8'), repeat))
+    results['trace_points'] = {'points': len(text.split(',')) // 2}
+    return results
+
+
+def run(n9020b_address: str, fswp_address: str, repeat: int, count: int) -> Dict:
+    results: Dict[str, Dict[str, float]] = {}
+    results['connect_cold'] = bench_connect(n9020b_address, repeat, pooled=False)
+    results['connect_pooled'] = bench_connect(n9020b_address, repeat, pooled=True)
+
+    analyzer = N9020b(n9020b_address)
+    try:
+        results['write_setter'] = bench_write(analyzer, repeat, count)
+        results['query_roundtrip'] = bench_query(analyzer, repeat)
+        results['wait_opc'] = bench_wait_opc(analyzer, repeat)
+    finally:
+        analyzer.close()
+
+    fswp = Fswp(fswp_address)
+    try:
+        fswp.set_window('VCO Characterization')
+        results.update(bench_trace(fswp, repeat))
+    finally:
+        fswp.close()
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'n9020b': n9020b_address,
+            'fswp': fswp_address,
+            'repeat': repeat,
+            'count': count,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """按中位耗时与基线比较
+
+    Returns:
+        每个共同项目的比较结果，ratio为当前/基线
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or 'median_s' not in result or 'median_s' not in base:
+            continue
+        ratio = result['median_s'] / base['median_s'] if base['median_s'] > 0 else float('inf')
+        rows.append({
+            'name': name,
+            'baseline_s': base['median_s'],
+            'current_s': result['median_s'],
+            'ratio': ratio,
+            'regressed': ratio > 1 + tolerance,
+        })
+    return rows
+
+
+def format_results(report: Dict) -> str:
+    lines = [f"{'benchmark':<22} {'median_ms':>11} {'p95_ms':>11} {'ops_per_s':>12}"]
+    for name, result in report['results'].items():
+        if 'median_s' not in result:
+            continue
+        lines.append(f"{name:<22} {result['median_s'] * 1e3:>11.4f} {result['p95_s'] * 1e3:>11.4f} "
+                     f"{result['ops_per_s']:>12.1f}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'benchmark':<22} {'baseline_ms':>12} {'current_ms':>12} {'ratio':>8}"]
+    for row in rows:
+        flag = '  REGRESSION' if row['regressed'] else ''
+        lines.append(f"{row['name']:<22} {row['baseline_s'] * 1e3:>12.4f} {row['current_s'] * 1e3:>12.4f} "
+                     f"{row['ratio']:>8.2f}{flag}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='PyInst 仪器驱动性能基准')
+    parser.add_argument('--n9020b', default=DEFAULT_N9020B, help='N9020B地址，默认模拟仪器')
+    parser.add_argument('--fswp', default=DEFAULT_FSWP, help='FSWP地址，默认模拟仪器')
+    parser.add_argument('--repeat', type=int, default=50, help='每项重复次数')
+    parser.add_argument('--count', type=int, default=100, help='吞吐测试每次重复的写入条数')
+    parser.add_argument('--output', help='结果JSON文件路径')
+    parser.add_argument('--baseline', help='基线JSON文件路径，给出时输出比较结果')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='允许的相对退化比例')
+    args = parser.parse_args(argv)
+
+    report = run(args.n9020b, args.fswp, args.repeat, args.count)
+    print(format_results(report))
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        rows = compare(report, baseline, args.tolerance)
+        report['comparison'] = {'baseline': args.baseline, 'tolerance': args.tolerance, 'rows': rows}
+        print()
+        print(format_comparison(rows))
+        if any(row['regressed'] for row in rows):
+            status = 1
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text)
+    else:
+        print(text)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
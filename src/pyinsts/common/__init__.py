@@ -1,3 +1,22 @@
-from .log_data import setup_logging
+from .lazy import lazy_import
+from .log_data import SCPI_LOGGER, ScpiLogSampler, log_data, setup_logging, stop_logging
 
-__all__ = ["setup_logging"]
\ No newline at end of file
+# 结果存储在首次访问时才导入
+_LAZY = {
+    'ResultsStore': 'pyinsts.common.results_store',
+    'ResultEntry': 'pyinsts.common.results_store',
+}
+
+__all__ = ["lazy_import", "setup_logging", "stop_logging", "log_data", "ScpiLogSampler", "SCPI_LOGGER",
+           "ResultsStore", "ResultEntry"]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
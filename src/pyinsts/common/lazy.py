@@ -0,0 +1,30 @@
+"""
+延迟导入：模块在首次访问其属性时才真正加载，缩短 import pyinsts 的耗时
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """返回延迟加载的模块，模块已导入时直接返回
+
+    Args:
+        name: 模块名，例如 'pyvisa'
+
+    example:
+        pyvisa = lazy_import('pyvisa')
+        rm = pyvisa.ResourceManager()  # 此时才导入pyvisa
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
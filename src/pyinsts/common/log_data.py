@@ -1,18 +1,117 @@
 """
 日志处理
 """
+import atexit
+import copy
 import logging
 import os
-from logging.handlers import RotatingFileHandler
-import colorlog  # 导入 colorlog
-def setup_logging(log_file=None, log_level=logging.INFO, max_bytes=1 * 1024 * 1024, backup_count=5):
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from pyinsts.common.lazy import lazy_import
+
+colorlog = lazy_import('colorlog')  # 导入 colorlog，首次使用时才加载
+
+# 逐条SCPI命令的日志记录器，可单独设置等级或采样聚合
+SCPI_LOGGER = 'pyinsts.scpi'
+
+# 可以延迟到后台线程格式化的参数类型，其他参数(如numpy数组)可能在格式化前被修改
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+_listener = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """将日志记录放入队列，由QueueListener在后台线程格式化并写入
+
+    参数均为不可变类型时消息的格式化推迟到后台线程，否则在调用线程合并消息
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if isinstance(args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args):
+            record = copy.copy(record)
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+            return record
+        return super().prepare(record)
+
+
+class ScpiLogSampler(logging.Filter):
+    """逐条SCPI命令日志的采样与聚合
+
+    添加到pyinsts.scpi记录器上，同一消息模板(如"%s 写入: %s")在interval秒内只输出第一条，其余计数；
+    every大于0时另外每every条输出一条；输出的记录附带此前被合并的条数
+    """
+
+    def __init__(self, interval: float = 1.0, every: int = 0):
+        """
+        :param interval: 聚合时间窗(秒)，0为不按时间聚合
+        :param every: 每every条输出一条，0为不按条数采样
+        """
+        super().__init__()
+        self.interval = interval
+        self.every = every
+        self._state = {}  # 消息模板 -> [上次输出时刻, 合并条数]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.setdefault(record.msg, [-float('inf'), 0])
+            emit = (self.interval > 0 and now - state[0] >= self.interval) or \
+                   (self.every > 0 and state[1] + 1 >= self.every) or (self.interval <= 0 and self.every <= 0)
+            if not emit:
+                state[1] += 1
+                return False
+            suppressed, state[0], state[1] = state[1], now, 0
+        if not suppressed:
+            return True
+        # 原记录不修改，以附带合并条数的新记录代替输出
+        logging.getLogger(record.name).callHandlers(self.summarize(record, suppressed))
+        return False
+
+    @staticmethod
+    def summarize(record, suppressed: int):
+        """
+        构造附带合并条数的新记录，合并条数放在参数中，格式化仍可推迟
+        :param record: 原日志记录
+        :param suppressed: 此前被合并的条数
+        """
+        summary = logging.makeLogRecord(record.__dict__)
+        if isinstance(record.args, tuple) and record.args:
+            summary.msg, summary.args = f'{record.msg} (合并%d条)', record.args + (suppressed,)
+        else:
+            summary.msg, summary.args = '%s (合并%d条)', (record.getMessage(), suppressed)
+        return summary
+
+
+def stop_logging():
+    """停止后台日志线程，写入队列中剩余的日志"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def setup_logging(log_file=None, log_level=logging.INFO, max_bytes=1 * 1024 * 1024, backup_count=5,
+                  use_queue=False, scpi_level=None, scpi_interval=0.0, scpi_every=0):
     """
     配置日志记录，包括日志轮换和控制台输出，支持彩色日志
     :param log_file: 日志文件路径，如果为None则使用默认路径
     :param log_level: 日志等级
     :param max_bytes: 单个日志文件的最大字节数，默认为1MB
     :param backup_count: 保留的日志文件备份数
+    :param use_queue: 为True时根记录器只将日志放入队列，由后台线程格式化并写入文件与控制台，
+        测量线程不再等待磁盘I/O；程序退出时自动写完剩余日志，也可调用stop_logging()
+    :param scpi_level: 逐条SCPI命令日志(pyinsts.scpi)的等级，None与log_level相同
+    :param scpi_interval: 逐条SCPI命令日志的聚合时间窗(秒)，同类日志在时间窗内只输出一条
+    :param scpi_every: 逐条SCPI命令日志每scpi_every条输出一条
     """
+    stop_logging()
     if log_file is None:
         log_file = os.getenv('LOG_FILE_PATH', 'docs/log/test.log')
 
@@ -58,9 +157,24 @@ def setup_logging(log_file=None, log_level=logging.INFO, max_bytes=1 * 1024 * 10
     )
     console_handler.setFormatter(color_formatter)
 
+    # 逐条SCPI命令日志的等级与采样聚合
+    scpi_logger = logging.getLogger(SCPI_LOGGER)
+    scpi_logger.setLevel(log_level if scpi_level is None else scpi_level)
+    for log_filter in [f for f in scpi_logger.filters if isinstance(f, ScpiLogSampler)]:
+        scpi_logger.removeFilter(log_filter)
+    if scpi_interval > 0 or scpi_every > 0:
+        scpi_logger.addFilter(ScpiLogSampler(scpi_interval, scpi_every))
+
     # 将处理器添加到记录器中
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    if use_queue:
+        global _listener
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(DeferredQueueHandler(log_queue))
+        _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
 
     # 添加日志分隔符
     logger.info("=" * 60)
@@ -68,11 +182,22 @@ def setup_logging(log_file=None, log_level=logging.INFO, max_bytes=1 * 1024 * 10
     logger.info("=" * 60)
 
 
-def log_data(data):
+atexit.register(stop_logging)
+
+
+def log_data(data, store=None, dataset='data', **metadata):
     """
     记录数据的日志
+    :param data: 数据
+    :param store: ResultsStore，给出时数据写入结果存储，日志只记录数据集与结果id
+    :param dataset: 结果存储中的数据集名称
+    :param metadata: 写入结果存储的元数据，例如dut、idn、center_freq
     """
-    logging.info(f"数据记录: {data}")
+    if store is not None:
+        result_id = store.append(dataset, data, **metadata)
+        logging.info("数据记录: %s#%d", dataset, result_id)
+        return result_id
+    logging.info("数据记录: %s", data)
 
 
 # 通用异常处理装饰器
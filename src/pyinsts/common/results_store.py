@@ -0,0 +1,290 @@
+"""
+测量结果存储：迹线与标量结果追加到分块的内存映射numpy文件，元数据(DUT、仪器标识、中心频率、时间戳)
+记录在本地SQLite索引中，大批量结果可按条件查询并逐块加载，无需解析CSV或全部读入内存
+
+目录结构::
+
+    <root>/index.sqlite
+    <root>/<数据集>/chunk_000000.npy
+    <root>/<数据集>/chunk_000001.npy
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pyinsts.common.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS datasets (
+    name TEXT PRIMARY KEY,
+    dtype TEXT NOT NULL,
+    shape TEXT NOT NULL,
+    chunk_rows INTEGER NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    dut TEXT,
+    idn TEXT,
+    center_freq REAL,
+    timestamp REAL NOT NULL,
+    meta TEXT
+);
+CREATE INDEX IF NOT EXISTS results_dataset ON results (dataset, row);
+CREATE INDEX IF NOT EXISTS results_dut ON results (dut);
+CREATE INDEX IF NOT EXISTS results_timestamp ON results (timestamp);
+'''
+
+
+def _dump_dtype(dtype) -> str:
+    """保存数据类型，结构化类型保留字段名称"""
+    return json.dumps(np.lib.format.dtype_to_descr(dtype))
+
+
+def _load_dtype(text: str):
+    try:
+        descr = json.loads(text)
+    except ValueError:
+        descr = text  # 早期版本保存的dtype.str
+    return np.lib.format.descr_to_dtype(descr)
+
+
+@dataclass(frozen=True)
+class ResultEntry:
+    """索引中的一条结果"""
+    id: int
+    dataset: str
+    row: int
+    dut: Optional[str]
+    idn: Optional[str]
+    center_freq: Optional[float]
+    timestamp: float
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Dataset:
+    dtype: 'np.dtype'
+    shape: Tuple[int, ...]
+    chunk_rows: int
+    rows: int
+
+
+class ResultsStore:
+    """分块内存映射的测量结果存储
+
+    每个数据集的各行形状与类型相同(如固定点数的迹线或标量)，按chunk_rows行一个.npy文件存放；
+    索引与数据在flush()/close()时提交，写满一个数据块时也会提交
+
+    example:
+        with ResultsStore('results/lot42') as store:
+            store.append('spectrum', power, dut='SN001', idn=sa.idn, center_freq=1e9)
+            store.append('jitter_fs', 203.4, dut='SN001')
+
+        store = ResultsStore('results/lot42')
+        entries = store.query('spectrum', dut='SN001')
+        for entries, traces in store.iter_chunks(entries):
+            ...
+    """
+
+    def __init__(self, root: str, chunk_rows: int = 1024):
+        """
+        Args:
+            root: 存储目录，不存在时创建
+            chunk_rows: 新数据集每个数据块的行数
+        """
+        self.root = root
+        self.chunk_rows = chunk_rows
+        os.makedirs(root, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._datasets: Dict[str, _Dataset] = {}
+        self._writers: Dict[str, Tuple[int, Any]] = {}  # 数据集 -> (数据块序号, 可写memmap)
+        for name, dtype, shape, chunk_rows, rows in self._db.execute('SELECT * FROM datasets'):
+            self._datasets[name] = _Dataset(_load_dtype(dtype), tuple(json.loads(shape)), chunk_rows, rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def datasets(self) -> Dict[str, Tuple[Tuple[int, ...], str, int]]:
+        """数据集名称 -> (行形状, 类型, 行数)，结构化类型为 [(字段, 类型), ...]"""
+        return {name: (info.shape, np.lib.format.dtype_to_descr(info.dtype), info.rows) for name, info in self._datasets.items()}
+
+    def append(self, dataset: str, data, dut: Optional[str] = None, idn: Optional[str] = None,
+               center_freq: Optional[float] = None, timestamp: Optional[float] = None, cast: bool = False,
+               **meta) -> int:
+        """追加一行结果
+
+        Args:
+            dataset: 数据集名称，例如'spectrum'
+            data: 迹线数组或标量，首次写入时确定该数据集的行形状与类型
+            dut: 被测件编号
+            idn: 仪器标识
+            center_freq: 中心频率(Hz)
+            timestamp: 时间戳(秒)，默认为当前时间
+            cast: 数据类型与数据集不同且不能无损转换(如float64写入float32数据集)时是否强制转换，否则抛出ValueError
+            meta: 其他可JSON序列化的元数据
+
+        Returns:
+            结果id
+        """
+        data = np.asarray(data)
+        with self._lock:
+            info = self._datasets.get(dataset)
+            if info is None:
+                info = self._create(dataset, data)
+            elif data.shape != info.shape:
+                raise ValueError(f"数据集 {dataset} 的行形状为{info.shape}，实际为{data.shape}")
+            elif data.dtype != info.dtype and not (cast or np.can_cast(data.dtype, info.dtype, 'safe')):
+                raise ValueError(f"数据集 {dataset} 的类型为{info.dtype}，实际为{data.dtype}，"
+                                 f"确认可以转换时传入cast=True")
+            chunk, offset = divmod(info.rows, info.chunk_rows)
+            self._writer(dataset, info, chunk)[offset] = data
+            info.rows += 1
+            cursor = self._db.execute(
+                'INSERT INTO results (dataset, row, dut, idn, center_freq, timestamp, meta) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (dataset, info.rows - 1, dut, idn, center_freq, time.time() if timestamp is None else timestamp,
+                 json.dumps(meta, ensure_ascii=False) if meta else None))
+            self._db.execute('UPDATE datasets SET rows = ? WHERE name = ?', (info.rows, dataset))
+            if offset + 1 == info.chunk_rows:
+                self.flush()
+            return cursor.lastrowid
+
+    def query(self, dataset: Optional[str] = None, dut: Optional[str] = None, idn: Optional[str] = None,
+              center_freq: Optional[Tuple[float, float]] = None, since: Optional[float] = None,
+              until: Optional[float] = None, limit: Optional[int] = None) -> List[ResultEntry]:
+        """按元数据查询结果，按写入顺序返回
+
+        Args:
+            dataset: 数据集名称
+            dut: 被测件编号
+            idn: 仪器标识
+            center_freq: 中心频率范围(最小, 最大)，Hz
+            since: 起始时间戳(含)
+            until: 结束时间戳(不含)
+            limit: 最多返回条数
+        """
+        conditions, values = [], []
+        for column, value in (('dataset', dataset), ('dut', dut), ('idn', idn)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                values.append(value)
+        if center_freq is not None:
+            conditions.append('center_freq BETWEEN ? AND ?')
+            values.extend(center_freq)
+        if since is not None:
+            conditions.append('timestamp >= ?')
+            values.append(since)
+        if until is not None:
+            conditions.append('timestamp < ?')
+            values.append(until)
+        sql = 'SELECT id, dataset, row, dut, idn, center_freq, timestamp, meta FROM results'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY id'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        with self._lock:
+            rows = self._db.execute(sql, values).fetchall()
+        return [ResultEntry(*row[:7], json.loads(row[7]) if row[7] else {}) for row in rows]
+
+    def load(self, entries: Sequence[ResultEntry]):
+        """读取结果数据，各条结果须属于同一数据集
+
+        Returns:
+            形状为 (len(entries),) + 行形状 的数组
+        """
+        parts = [data for _, data in self.iter_chunks(entries)]
+        if not parts:
+            return np.empty((0,))
+        return np.concatenate(parts)
+
+    def iter_chunks(self, entries: Sequence[ResultEntry]) -> Iterator[Tuple[List[ResultEntry], Any]]:
+        """按数据块逐块读取结果，内存占用不超过一个数据块
+
+        Returns:
+            (该块中的结果, 对应数据数组) 迭代器，保持entries中连续属于同一数据块的顺序
+        """
+        if not entries:
+            return
+        datasets = {entry.dataset for entry in entries}
+        if len(datasets) != 1:
+            raise ValueError(f"结果属于多个数据集: {', '.join(sorted(datasets))}")
+        dataset = datasets.pop()
+        info = self._datasets[dataset]
+        self.flush()
+        start = 0
+        while start < len(entries):
+            chunk = entries[start].row // info.chunk_rows
+            stop = start
+            while stop < len(entries) and entries[stop].row // info.chunk_rows == chunk:
+                stop += 1
+            block = entries[start:stop]
+            array = np.load(self._chunk_path(dataset, chunk), mmap_mode='r')
+            yield block, np.array(array[[entry.row - chunk * info.chunk_rows for entry in block]])
+            start = stop
+
+    def open_chunk(self, dataset: str, chunk: int):
+        """以只读内存映射打开一个数据块，前 rows - chunk * chunk_rows 行有效"""
+        self.flush()
+        return np.load(self._chunk_path(dataset, chunk), mmap_mode='r')
+
+    def flush(self) -> None:
+        """将数据块写入磁盘并提交索引"""
+        with self._lock:
+            for _, array in self._writers.values():
+                array.flush()
+            self._db.commit()
+
+    def close(self) -> None:
+        """提交并关闭存储"""
+        with self._lock:
+            self.flush()
+            self._writers.clear()
+            self._db.close()
+
+    def _create(self, dataset: str, data) -> _Dataset:
+        if not dataset or os.sep in dataset or (os.altsep and os.altsep in dataset) or dataset.startswith('.'):
+            raise ValueError(f"数据集名称无效: {dataset!r}")
+        if data.dtype.hasobject:
+            raise ValueError(f"数据集 {dataset} 不支持对象类型数据")
+        info = _Dataset(data.dtype, data.shape, self.chunk_rows, 0)
+        os.makedirs(os.path.join(self.root, dataset), exist_ok=True)
+        self._db.execute('INSERT INTO datasets VALUES (?, ?, ?, ?, ?)',
+                         (dataset, _dump_dtype(info.dtype), json.dumps(list(info.shape)), info.chunk_rows, 0))
+        self._datasets[dataset] = info
+        return info
+
+    def _chunk_path(self, dataset: str, chunk: int) -> str:
+        return os.path.join(self.root, dataset, f'chunk_{chunk:06d}.npy')
+
+    def _writer(self, dataset: str, info: _Dataset, chunk: int):
+        current = self._writers.get(dataset)
+        if current is not None and current[0] == chunk:
+            return current[1]
+        if current is not None:
+            current[1].flush()
+        path = self._chunk_path(dataset, chunk)
+        if os.path.exists(path):
+            array = np.load(path, mmap_mode='r+')
+        else:
+            array = np.lib.format.open_memmap(path, mode='w+', dtype=info.dtype,
+                                              shape=(info.chunk_rows,) + info.shape)
+        self._writers[dataset] = (chunk, array)
+        return array
@@ -1,11 +1,43 @@
 # libs/__init__.py
-from .baseinstrument import BaseInstrument
-from .rs import Fswp
-from .keysight import *
+# 驱动类在首次访问时才导入，import pyinsts.libs 不加载 pyvisa/numpy 等依赖
+import importlib
+
+_DRIVERS = {
+    'BaseInstrument': 'pyinsts.libs.baseinstrument',
+    'Fswp': 'pyinsts.libs.rs',
+    'N9020b': 'pyinsts.libs.keysight',
+    'AsyncBaseInstrument': 'pyinsts.libs.asyncinstrument',
+    'AsyncFswp': 'pyinsts.libs.asyncinstrument',
+    'AsyncN9020b': 'pyinsts.libs.asyncinstrument',
+    'Axis': 'pyinsts.libs.sweep',
+    'Measurement': 'pyinsts.libs.sweep',
+    'Sweep': 'pyinsts.libs.sweep',
+    'Scheduler': 'pyinsts.libs.scheduler',
+}
 
 __all__ = \
     [
     'BaseInstrument',
     'Fswp',
     'N9020b',
-    ]
\ No newline at end of file
+    'AsyncBaseInstrument',
+    'AsyncFswp',
+    'AsyncN9020b',
+    'Axis',
+    'Measurement',
+    'Sweep',
+    'Scheduler',
+    ]
+
+
+def __getattr__(name):
+    module = _DRIVERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
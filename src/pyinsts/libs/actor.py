@@ -0,0 +1,177 @@
+"""
+仪器I/O Actor：每台仪器由专用I/O线程与有界命令队列独占访问，多个线程可安全共享同一台仪器
+
+write只入队不等待，query返回concurrent.futures.Future；
+队列中连续的写入合并为一条复合命令发送，同一设置参数的连续写入只保留最后一次
+"""
+import functools
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from pyinsts.libs.shadow import coupled_headers, split_setting
+
+_STOP = object()
+
+
+@dataclass
+class _Request:
+    """队列中的请求，kind为write/call"""
+    kind: str
+    future: Future
+    command: str = ''
+    shadow: bool = False
+    func: Optional[Callable[[], Any]] = None
+
+
+def coalesce(writes: List[Tuple[str, bool]]) -> List[int]:
+    """合并连续写入，返回需要发送的写入序号
+
+    可缓存的设置命令被之后对同一参数的写入覆盖时丢弃，
+    中间若有耦合参数(如FREQ:STAR与FREQ:CENT)或其他命令的写入则保留
+
+    Args:
+        writes: (命令, 是否为可缓存设置命令) 序列
+    """
+    keep: List[Optional[int]] = []
+    latest = {}  # 参数 -> keep中的位置
+    for index, (command, shadow) in enumerate(writes):
+        if shadow and ';' not in command:
+            header, _ = split_setting(command)
+            position = latest.get(header)
+            if position is not None:
+                keep[position] = None
+            for coupled in coupled_headers(header):
+                latest.pop(coupled, None)
+            latest[header] = len(keep)
+        else:
+            latest.clear()
+        keep.append(index)
+    return [index for index in keep if index is not None]
+
+
+class InstrumentActor:
+    """仪器I/O Actor
+
+    运行期间I/O线程独占会话，其他线程直接调用仪器的I/O方法抛出RuntimeError；未显式定义的仪器方法通过属性访问
+    自动包装为在I/O线程执行并返回Future的调用，例如 ``actor.query_trace().result()``
+
+    example:
+        actor = n9020b.actor()
+        actor.write('FREQ:CENT 1GHz', shadow=True)  # GUI线程，立即返回
+        power = actor.query('CALC:MARK1:Y?').result()  # 测试线程
+        actor.stop()
+    """
+
+    def __init__(self, instrument, max_queue: int = 256):
+        """
+        Args:
+            instrument: 已连接的BaseInstrument
+            max_queue: 命令队列长度，队列满时入队阻塞
+        """
+        self.instrument = instrument
+        self.model = instrument.model
+        self.coalesced = 0  # 被合并丢弃的写入次数
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name=f'pyinsts-actor-{instrument.model}', daemon=True)
+        self._thread.start()
+
+    def write(self, command: str, shadow: bool = False) -> Future:
+        """写入命令，入队后立即返回
+
+        Returns:
+            命令发送后完成的Future，发送失败时携带异常，调用方可以忽略
+        """
+        return self._put(_Request('write', Future(), command, shadow))
+
+    def query(self, command: str) -> Future:
+        """查询命令，返回响应的Future"""
+        return self.call(self.instrument.query, command)
+
+    def call(self, func: Callable, *args, **kwargs) -> Future:
+        """在I/O线程中执行func(*args, **kwargs)，返回结果的Future"""
+        return self._put(_Request('call', Future(), func=functools.partial(func, *args, **kwargs)))
+
+    def __getattr__(self, name):
+        attr = getattr(self.instrument, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def method(*args, **kwargs) -> Future:
+            return self.call(attr, *args, **kwargs)
+
+        return method
+
+    def flush(self) -> None:
+        """等待此前入队的全部命令执行完成"""
+        self.call(lambda: None).result()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """执行完已入队的命令后结束I/O线程，不关闭仪器连接"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _put(self, request: _Request) -> Future:
+        if not self._thread.is_alive():
+            raise RuntimeError(f"{self.model} I/O线程已结束")
+        self._queue.put(request)
+        return request.future
+
+    def _run(self) -> None:
+        carry = None
+        while True:
+            request = carry if carry is not None else self._queue.get()
+            carry = None
+            if request is _STOP:
+                break
+            if request.kind == 'call':
+                self._execute(request)
+                continue
+            # 取出队列中紧随其后的写入，合并发送
+            writes = [request]
+            while True:
+                try:
+                    following = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if following is not _STOP and following.kind == 'write':
+                    writes.append(following)
+                else:
+                    carry = following
+                    break
+            self._send(writes)
+
+    def _execute(self, request: _Request) -> None:
+        if not request.future.set_running_or_notify_cancel():
+            return
+        try:
+            request.future.set_result(request.func())
+        except BaseException as e:
+            request.future.set_exception(e)
+
+    def _send(self, writes: List[_Request]) -> None:
+        writes = [request for request in writes if request.future.set_running_or_notify_cancel()]
+        selected = coalesce([(request.command, request.shadow) for request in writes])
+        self.coalesced += len(writes) - len(selected)
+        try:
+            with self.instrument.batch():
+                for index in selected:
+                    self.instrument.write(writes[index].command, shadow=writes[index].shadow)
+        except BaseException as e:
+            logging.error(f"{self.model} 写入失败: {e}")
+            for request in writes:
+                request.future.set_exception(e)
+            return
+        for request in writes:
+            request.future.set_result(None)
@@ -0,0 +1,120 @@
+"""
+asyncio 仪器接口：每台仪器的VISA会话由独立的I/O线程服务，
+多台仪器可通过 asyncio.gather 并行测量
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from pyinsts.libs.baseinstrument import BaseInstrument
+from pyinsts.libs.keysight import N9020b
+from pyinsts.libs.rs import Fswp
+
+
+class AsyncBaseInstrument:
+    """BaseInstrument的asyncio封装
+
+    未显式定义的同步方法通过属性访问自动包装为协程，例如
+    ``await fswp.set_cent_freq(10)``
+
+    example:
+        async with await AsyncFswp.open(fswp_addr) as fswp, await AsyncN9020b.open(n9020b_addr) as sa:
+            await asyncio.gather(fswp.wait_complete('INIT:IMM'), sa.wait_complete('INIT:IMM'))
+    """
+    sync_class = BaseInstrument
+
+    def __init__(self, instrument: BaseInstrument, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Args:
+            instrument: 已连接的同步仪器对象
+            executor: 该仪器专用的单线程执行器，默认新建
+        """
+        self.instrument = instrument
+        self.model = instrument.model
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f'pyinsts-{instrument.model}')
+
+    @classmethod
+    async def open(cls, *args, **kwargs):
+        """在该仪器的I/O线程中连接仪器，参数与同步类构造函数一致"""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'pyinsts-{cls.sync_class.__name__}')
+        loop = asyncio.get_running_loop()
+        try:
+            instrument = await loop.run_in_executor(
+                executor, functools.partial(cls.sync_class, *args, **kwargs))
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        return cls(instrument, executor)
+
+    async def call(self, func, *args, **kwargs):
+        """在该仪器的I/O线程中执行func(*args, **kwargs)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self.instrument, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.call(attr, *args, **kwargs)
+
+        return method
+
+    async def write(self, command: str, check_complete: bool = False, shadow: bool = False) -> None:
+        """写入命令"""
+        await self.call(self.instrument.write, command, check_complete, shadow)
+
+    async def query(self, command: str, check_complete: bool = False) -> str:
+        """查询命令"""
+        return await self.call(self.instrument.query, command, check_complete)
+
+    async def fetch_trace(self, command: str, bits: int = 32):
+        """以二进制块读取迹线数据"""
+        return await self.call(self.instrument.fetch_trace, command, bits)
+
+    async def wait_complete(self, command: str, timeout: Optional[float] = None,
+                            response: bool = False):
+        """发送耗时操作命令并等待仪器SRQ完成通知
+
+        Returns:
+            查询命令返回其响应，否则返回耗时(秒)
+        """
+        def run():
+            return self.instrument.start(command, timeout, response).result()
+
+        return await self.call(run)
+
+    async def close(self) -> None:
+        """关闭仪器连接并结束I/O线程"""
+        try:
+            await self.call(self.instrument.close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+class AsyncFswp(AsyncBaseInstrument):
+    """Fswp的asyncio封装"""
+    sync_class = Fswp
+
+    async def run_single(self, timeout: float = 60) -> float:
+        """单次扫描并等待完成，返回耗时(秒)"""
+        return await self.call(lambda: self.instrument.run_single(timeout).wait())
+
+
+class AsyncN9020b(AsyncBaseInstrument):
+    """N9020b的asyncio封装"""
+    sync_class = N9020b
+
+    async def run_single(self, timeout: Optional[float] = None) -> float:
+        """单次扫描并等待完成，返回耗时(秒)"""
+        return await self.call(lambda: self.instrument.run_single(timeout).wait())
@@ -1,15 +1,27 @@
 import logging
+import threading
 import time
 
-import pyvisa
-from typing import Callable, Optional
-import os
-import inspect
+import numpy as np
+from typing import Callable, List, Optional, Sequence
+from contextlib import contextmanager
 from functools import wraps
 
-from pyvisa import VisaIOError
+from pyinsts.common.lazy import lazy_import
+from pyinsts.common.log_data import SCPI_LOGGER
+from pyinsts.libs.completion import Completion
+from pyinsts.libs.data import InstrumentEntry, config_registry
+from pyinsts.libs.metrics import IoMetrics, profile
+from pyinsts.libs.recovery import Backoff, is_retryable
+from pyinsts.libs.scpi import REAL_DTYPES, join_commands, parse_block_header
+from pyinsts.libs.session_pool import get_resource_manager, session_pool
+from pyinsts.libs.shadow import ShadowState
+from pyinsts.libs.timeouts import TimeoutPolicy
 
-from pyinsts.libs.data import load_config
+pyvisa = lazy_import('pyvisa')  # 建立连接时才加载
+
+# 逐条命令的日志，参数延迟格式化，可通过setup_logging单独设置等级或采样聚合
+scpi_log = logging.getLogger(SCPI_LOGGER)
 
 
 def handle_instrument_error(func: Callable) -> Callable:
@@ -25,6 +37,22 @@ def handle_instrument_error(func: Callable) -> Callable:
     return wrapper
 
 
+def reconnect_on_failure(func: Callable) -> Callable:
+    """会话断开时重新连接、重放设置后重试一次的装饰器，Actor运行期间拒绝其他线程直接访问会话"""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        self._check_owner()
+        try:
+            return func(self, *args, **kwargs)
+        except Exception as e:
+            if not self.auto_reconnect or self._reconnecting or not is_retryable(e):
+                raise
+            self.reconnect(e)
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
 class BaseInstrument:
     """基础仪器控制类"""
 
@@ -46,7 +74,43 @@ class BaseInstrument:
         self.opc_timeout = 100  # 默认OPC超时时间100秒
 
 
-        self.opc_poll_interval = 0.01  # 默认OPC轮询间隔0.01秒
+        self.opc_poll_interval = 0.01  # 默认OPC轮询间隔0.01秒，已不再轮询，仅保留兼容
+        self._srq = None  # 会话是否支持SRQ事件，None表示尚未配置
+
+        # 设置影子缓存，跳过与上次写入值相同的设置命令
+        self.shadow = ShadowState()
+
+        # 当前扫描已读取的迹线缓存，发送任何设置或触发命令时清空；
+        # 连续扫描状态未知(None)或连续扫描时不缓存
+        self._trace_cache = {}
+        self._continuous: Optional[bool] = None
+
+        # VISA超时策略，按命令配置超时，可选自适应
+        self.timeout_policy = TimeoutPolicy()
+
+        # I/O统计，为None时不记录
+        self.metrics: Optional[IoMetrics] = None
+
+        # 批量写入：单条复合命令最大长度、嵌套深度与待发送命令队列
+        self.max_command_length = 1024
+        self._batch_depth = 0
+        self._batch_queue = []
+        self._batch_opc = False  # 批量期间有check_complete的写入，退出时以*OPC?等待
+
+        # I/O Actor，启用后由专用线程独占访问会话
+        self._actor = None
+
+        # 连接退避策略；读写时会话断开则自动重连并重放影子缓存中的设置
+        self.backoff = Backoff()
+        self.auto_reconnect = True
+        self._reconnecting = False
+
+        # 会话记录，启用后会话上的每次读写追加到记录文件
+        self._recorder = None
+        self._record_path: Optional[str] = None
+
+        # 应用配置文件中的超时与选项
+        self._apply_config(self.config_entry)
 
         # 连接仪器
         self.idn = self._connect_instrument()
@@ -62,94 +126,144 @@ class BaseInstrument:
     def _get_instrument_address(self, address: str, config_path: str) -> str:
         """获取仪器地址
 
-        优先使用传入的地址，否则从配置文件读取
+        优先使用传入的地址，否则从配置注册表读取，
+        配置文件按路径与修改时间缓存，同一文件只解析一次
         支持.yaml和.json格式的配置文件
         """
+        self.config_entry = None
         if address:
             return address
 
-        # 处理配置文件路径
-        if not os.path.isabs(config_path):
-            # 获取继承类的文件所在目录
-            derived_class_file = inspect.getmodule(self.__class__).__file__
-            derived_class_dir = os.path.dirname(
-                os.path.abspath(derived_class_file))
-            config_path = os.path.join(derived_class_dir, config_path)
-
-        # 如果没有指定扩展名，先尝试.yaml，再尝试.json
-        if not os.path.splitext(config_path)[1]:
-            yaml_path = config_path + '.yaml'
-            json_path = config_path + '.json'
-            
-            if os.path.exists(yaml_path):
-                config_path = yaml_path
-            elif os.path.exists(json_path):
-                config_path = json_path
-                
-        config = load_config(config_path)
-        address = config.get("instruments", {}).get(self.model)
-        if not address:
+        path = config_registry.resolve_path(config_path, self.__class__)
+        entry = config_registry.resolve(self.model, path)
+        if entry is None:
             raise ValueError(f"未找到{self.model}的仪器地址配置")
-
-        return address
+        self.config_entry = entry
+        return entry.address
+
+    def _apply_config(self, entry: Optional[InstrumentEntry]) -> None:
+        """应用仪器清单中的超时与选项"""
+        if entry is None:
+            return
+        timeouts = entry.timeouts
+        if 'write' in timeouts:
+            self.timeout_policy.write_timeout = int(timeouts['write'])
+        if 'query' in timeouts:
+            self.timeout_policy.query_timeout = int(timeouts['query'])
+        if 'opc' in timeouts:
+            self.opc_timeout = timeouts['opc']
+        if 'max_command_length' in entry.options:
+            self.max_command_length = int(entry.options['max_command_length'])
+        if entry.options.get('record'):
+            self._record_path = str(entry.options['record'])
+
+    @property
+    def rm(self) -> 'pyvisa.ResourceManager':
+        """进程内共享的ResourceManager，模拟仪器不需要时不创建"""
+        return get_resource_manager()
 
     @handle_instrument_error
-    def _connect_instrument(self) -> None:
-        """建立仪器连接,返回仪器标识"""
-        max_retries = 3  # 最大重试次数
+    def _connect_instrument(self) -> str:
+        """建立仪器连接,返回仪器标识
 
-        retry_count = 0
-        
-        while retry_count < max_retries:
+        可重试的错误(会话断开、仪器忙或重启中)按带抖动的指数退避重试，其他错误直接抛出
+        """
+        delays = self.backoff.delays()
+        while True:
             try:
                 print(f"型号:{self.model}, 地址:{self.address}")
-                self.rm = pyvisa.ResourceManager()
-                self.instrument = self.rm.open_resource(self.address)
+                # 从会话池获取会话，复用的会话无需重新*CLS与*IDN?
+                self.instrument, idn = session_pool.acquire(self.address)
+                if self._recorder is not None:
+                    # 重连后继续记录到同一文件
+                    object.__setattr__(self._recorder, 'resource', self.instrument)
+                    self.instrument = self._recorder
+                elif self._record_path:
+                    self.idn = idn
+                    self.record(self._record_path)
+                self.shadow.invalidate()
+                self.invalidate_traces()
+                self._continuous = None
+                self.timeout_policy.reset()
+                self._srq = None
 
-                self.instrument.write('*CLS')
-                logging.info('清除仪器寄存器信息')
-
-
-                # 验证连接
-                idn = self.instrument.query("*IDN?")
                 logging.info(f'仪器标识:{idn}, 成功连接{self.model}')
                 return idn
-            except(pyvisa.VisaIOError, pyvisa.VisaTypeError, TimeoutError):
-                retry_count += 1
-                if retry_count < max_retries:
-                    logging.info(f"等待1秒后重试...")
-                    time.sleep(1)
-                    # 确保之前的连接被关闭
-                    if hasattr(self, 'instrument'):
-                        self.instrument.close()
-                    if hasattr(self, 'rm'):
-                        self.rm.close()
-                else:
-                    logging.error(f"连接失败次数超过最大重试次数({max_retries})")
+            except Exception as e:
+                delay = next(delays, None) if is_retryable(e, connecting=True) else None
+                if delay is None:
+                    logging.error(f"{self.model} 连接失败: {e}")
                     raise
+                logging.info(f"{self.model} 连接失败({e})，{delay * 1000:.0f}毫秒后重试...")
+                time.sleep(delay)
+
+    def reconnect(self, error: Optional[BaseException] = None) -> None:
+        """重新建立连接，并按写入顺序重放影子缓存中的设置以恢复仪器状态
 
-        return None
+        读写过程中会话断开时自动调用；未发送的批量命令在重放之后发送
 
+        Args:
+            error: 触发重连的异常，仅用于日志
+        """
+        logging.warning(f"{self.model} 会话断开({error})，重新连接")
+        settings = self.shadow.settings()
+        pending, self._batch_queue = self._batch_queue, []
+        srq = self._srq
+        instrument, self.instrument = self._session(), None
+        session_pool.discard(self.address, instrument)
+        self._reconnecting = True
+        try:
+            self.idn = self._connect_instrument()
+            with self.batch():
+                for command in settings:
+                    self.write(command, shadow=True)
+                self._batch_queue.extend(pending)
+            if srq:
+                self._enable_srq()
+        finally:
+            self._reconnecting = False
+        logging.info(f"{self.model} 重连完成，重放{len(settings)}条设置")
 
     @handle_instrument_error
+    @reconnect_on_failure
     def write(self, command: str,
-              check_complete: bool = False) -> None:
+              check_complete: bool = False, shadow: bool = False) -> None:
         """写入命令
 
         Args:
             command: SCPI命令
-            check_complete: 是否等待命令完成
+            check_complete: 是否等待命令完成，batch()期间推迟到最外层退出时以*OPC?等待
+            shadow: 是否为可缓存的设置命令，值与上次写入相同时跳过
 
         example:
-            self.write(f'SENSE1:FREQ:CENT 1GHz')
+            self.write(f'SENSE1:FREQ:CENT 1GHz', shadow=True)
         """
-        self.instrument.timeout = 100000
+        if shadow and self.shadow.is_unchanged(command):
+            scpi_log.debug("%s 设置未变化，跳过: %s", self.model, command)
+            return
+        if self._batch_depth:
+            self._batch_queue.append(command)
+            self.shadow.update(command, shadow)
+            self._track_command(command)
+            if check_complete:
+                self._batch_opc = True
+            return
+        policy = self.timeout_policy
+        policy.apply(self.instrument, policy.timeout_for(command))
+        start_time = time.perf_counter()
         self.instrument.write(command)
+        elapsed = time.perf_counter() - start_time
+        policy.observe(command, elapsed)
+        if self.metrics is not None:
+            self.metrics.record(self.model, 'write', command, elapsed, bytes_out=len(command))
+        self.shadow.update(command, shadow)
+        self._track_command(command)
         if check_complete:
             self.wait_opc()
-        logging.debug(f"{self.model} 写入: {command}")
+        scpi_log.debug("%s 写入: %s", self.model, command)
 
     @handle_instrument_error
+    @reconnect_on_failure
     def query(self, command: str,
               check_complete: bool = False) -> str:
         """查询命令
@@ -165,17 +279,238 @@ class BaseInstrument:
             result = self.query("*IDN?")
             print(result)
         """
-        self.instrument.timeout = 20000
+        if self._batch_queue:
+            self.flush()
+        if ';' in command:
+            self._track_command(command)  # 复合查询中可能夹带设置命令
+        policy = self.timeout_policy
+        policy.apply(self.instrument, policy.timeout_for(command, query=True))
         try:
+            start_time = time.perf_counter()
             result = self.instrument.query(command)
+            elapsed = time.perf_counter() - start_time
+            policy.observe(command, elapsed)
+            if self.metrics is not None:
+                self.metrics.record(self.model, 'query', command, elapsed,
+                                    bytes_out=len(command), bytes_in=len(result))
             if check_complete:
                 self.wait_opc()
-            logging.debug(f"{self.model} 查询: {command}, 结果: {result}")
+            scpi_log.debug("%s 查询: %s, 结果: %s", self.model, command, result)
             return result
-        except VisaIOError as e:
+        except pyvisa.VisaIOError as e:
             logging.error(f"{self.model} 查询失败: {e}")
             raise
-    
+
+    @handle_instrument_error
+    def query_many(self, commands: Sequence[str]) -> List[str]:
+        """将多条命令合并为复合查询发送，返回各查询的响应
+
+        命令中可以夹带设置命令(如"CALC:MARK1:MAX")，只有查询命令产生响应；
+        超过max_command_length时拆分为多次传输
+
+        Args:
+            commands: SCPI命令序列
+
+        Returns:
+            按顺序排列的查询响应
+
+        example:
+            x, y = self.query_many(['CALC:MARK1:MAX', 'CALC:MARK1:X?', 'CALC:MARK1:Y?'])
+        """
+        responses = []
+        for message in join_commands(commands, self.max_command_length):
+            if '?' in message:
+                responses.extend(self.query(message).split(';'))
+            else:
+                self.write(message)
+        return responses
+
+    @contextmanager
+    def batch(self, opc: bool = False):
+        """批量写入上下文，退出时将期间的write合并为复合命令一次发送
+
+        期间的query、wait_opc会先发送已排队的命令；支持嵌套，最外层退出时发送；
+        期间write(..., check_complete=True)不拆分批量，退出发送后以*OPC?等待；
+        发生异常时丢弃未发送的命令
+
+        Args:
+            opc: 发送后是否以*OPC?等待全部命令完成
+
+        example:
+            with self.batch(opc=True):
+                self.write('FREQ:CENT 1GHz')
+                self.write('BAND:RES 1kHz')
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._batch_opc = False
+                if self._batch_queue:
+                    logging.warning(f"{self.model} 批量写入异常，丢弃{len(self._batch_queue)}条命令")
+                    self._batch_queue.clear()
+                    self.shadow.invalidate()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            opc, self._batch_opc = opc or self._batch_opc, False
+            self.flush(opc=opc)
+
+    @handle_instrument_error
+    @reconnect_on_failure
+    def flush(self, opc: bool = False) -> None:
+        """发送批量队列中的命令
+
+        Args:
+            opc: 发送后是否以wait_opc()等待全部命令完成
+        """
+        commands, self._batch_queue = self._batch_queue, []
+        if commands:
+            policy = self.timeout_policy
+            try:
+                for message in join_commands(commands, self.max_command_length):
+                    policy.apply(self.instrument, policy.timeout_for(message))
+                    start_time = time.perf_counter()
+                    self.instrument.write(message)
+                    if self.metrics is not None:
+                        self.metrics.record(self.model, 'batch', message, time.perf_counter() - start_time,
+                                            bytes_out=len(message))
+                    scpi_log.debug("%s 批量写入: %s", self.model, message)
+            except Exception as e:
+                if is_retryable(e):
+                    # 会话断开：命令放回队列，重连后重放设置并重新发送
+                    self._batch_queue[:0] = commands
+                else:
+                    # 无法确定哪些命令已生效
+                    self.shadow.invalidate()
+                raise
+        if opc:
+            self.wait_opc()  # 按opc_timeout等待，不计入*OPC?查询的耗时统计与自适应超时
+
+    def invalidate(self, header: Optional[str] = None) -> None:
+        """清除设置影子缓存，仪器状态被外部修改后调用
+
+        Args:
+            header: 只清除该设置，例如'FREQ:CENT'，None表示全部清除
+        """
+        self.shadow.invalidate(header)
+
+    def invalidate_traces(self) -> None:
+        """清空迹线缓存，下次读取时重新从仪器获取"""
+        self._trace_cache.clear()
+
+    def _track_command(self, message: str) -> None:
+        """设置或触发命令可能改变测量结果：清空迹线缓存，并记录连续扫描状态
+
+        查询与状态系统命令(*OPC、*WAI、*CLS、*ESE、*SRE)不影响迹线
+        """
+        for command in message.split(';'):
+            header, _, args = command.strip().lstrip(':').partition(' ')
+            header = header.upper()
+            if not header or '?' in header or header in ('*OPC', '*WAI', '*CLS', '*ESE', '*SRE'):
+                continue
+            if header.startswith('INIT:CONT'):
+                self._continuous = args.strip().upper() not in ('OFF', '0')
+            elif header == '*RST':
+                self._continuous = None
+            self._trace_cache.clear()
+
+    @handle_instrument_error
+    def set_data_format(self, bits: int = 32) -> None:
+        """设置迹线传输格式为小端 REAL,32/64
+
+        格式已一致时不重复发送命令
+
+        Args:
+            bits: 浮点位宽，32或64
+        """
+        if bits not in REAL_DTYPES:
+            raise ValueError(f"不支持的数据位宽: {bits}")
+        self.write(f'FORM REAL,{bits}', shadow=True)
+        self.write('FORM:BORD SWAP', shadow=True)
+
+    @handle_instrument_error
+    def read_block(self) -> bytes:
+        """读取一个IEEE 488.2二进制块，返回数据部分
+
+        Returns:
+            块数据字节，不含块头与结束符
+        """
+        termination = self.instrument.read_termination or ''
+        header = self.instrument.read_bytes(2)
+        if header[:1] == b'#' and header[1:2] != b'0':
+            header += self.instrument.read_bytes(int(header[1:2]))
+        _, length = parse_block_header(header)
+        if length < 0:
+            # 不定长块以END结束，去掉结束符
+            data = self.instrument.read_raw()
+            return data[:len(data) - len(termination)] if termination else data
+        data = self.instrument.read_bytes(length)
+        if termination:
+            self.instrument.read_bytes(len(termination))
+        return data
+
+    @handle_instrument_error
+    @reconnect_on_failure
+    def fetch_trace(self, command: str, bits: int = 32) -> np.ndarray:
+        """以二进制块读取迹线数据
+
+        Args:
+            command: 迹线查询命令，例如："TRAC1? TRACE1"
+            bits: 浮点位宽，32或64
+
+        Returns:
+            直接基于接收缓冲区构造的只读numpy数组(不复制)
+
+        example:
+            data = self.fetch_trace("TRAC:DATA? TRACE1")
+        """
+        self.set_data_format(bits)
+        if self._batch_queue:
+            self.flush()
+        if ';' in command:
+            self._track_command(command)
+        policy = self.timeout_policy
+        policy.apply(self.instrument, policy.timeout_for(command, query=True))
+        start_time = time.perf_counter()
+        self.instrument.write(command)
+        data = np.frombuffer(self.read_block(), dtype=REAL_DTYPES[bits])
+        elapsed = time.perf_counter() - start_time
+        policy.observe(command, elapsed)
+        if self.metrics is not None:
+            self.metrics.record(self.model, 'trace', command, elapsed,
+                                bytes_out=len(command), bytes_in=data.nbytes)
+        scpi_log.debug("%s 读取迹线: %s, 点数: %d", self.model, command, data.size)
+        return data
+
+    @handle_instrument_error
+    @reconnect_on_failure
+    def query_block(self, command: str) -> bytes:
+        """发送查询并读取二进制块，例如截图、仪器上的文件内容
+
+        Args:
+            command: 查询命令，例如：'MMEM:DATA? "D:\\screen.png"'
+
+        Returns:
+            数据块内容
+        """
+        if self._batch_queue:
+            self.flush()
+        policy = self.timeout_policy
+        policy.apply(self.instrument, policy.timeout_for(command, query=True))
+        start_time = time.perf_counter()
+        self.instrument.write(command)
+        data = self.read_block()
+        elapsed = time.perf_counter() - start_time
+        policy.observe(command, elapsed)
+        if self.metrics is not None:
+            self.metrics.record(self.model, 'block', command, elapsed,
+                                bytes_out=len(command), bytes_in=len(data))
+        scpi_log.debug("%s 读取数据块: %s, 字节数: %d", self.model, command, len(data))
+        return data
+
     @handle_instrument_error
     def set_opc_timeout(self, timeout: float=0.1, poll_interval: float = None):
         """临时设置OPC超时时间
@@ -191,42 +526,169 @@ class BaseInstrument:
 
     @handle_instrument_error
     def wait_opc(self, timeout=None, opc_poll_interval=None):
-        """等待OPC完成
+        """等待OPC完成，以一次阻塞的*OPC?查询等待，VISA超时与OPC超时一致
         Args:
-            timeout: 超时时间(秒)，默认使用self.timeout
-            opc_poll_interval: 轮询间隔(秒)，默认使用self.poll_interval
+            timeout: 超时时间(秒)，默认使用self.opc_timeout
+            opc_poll_interval: 已不再轮询，仅保留兼容
         """
+        self._check_owner()
         self.opc_timeout = timeout or self.opc_timeout
+        if self._batch_queue:
+            self.flush()  # *OPC?须在已排队的命令之后发送
         try:
             start_time = time.time()
-            logging.info(f"开始等待opc?")
-
-            while True:
-                try:
-                    opc = self.instrument.query("*OPC?")
-                    if opc.strip() == '1':
-                        logging.info("opc运行完成")
-                        break
-                except VisaIOError as e:
-                    logging.warning(f"OPC查询失败: {str(e)}")
-                    # break  # 通信异常时终止
-
-                elapsed = time.time() - start_time
-                if elapsed >= self.opc_timeout:
-                    logging.warning(f"运行超时（已耗时：{elapsed:.1f}秒）")
-                    break
-                time.sleep(opc_poll_interval or self.opc_poll_interval)
+            scpi_log.info("开始等待opc?")
+            self.timeout_policy.apply(self.instrument, int(self.opc_timeout * 1000))
+            try:
+                self.instrument.query("*OPC?")
+                scpi_log.info("opc运行完成")
+            except pyvisa.VisaIOError as e:
+                logging.warning(f"运行超时（已耗时：{time.time() - start_time:.1f}秒）: {e}")
+                # 清除仪器输出队列，避免迟到的响应打乱后续查询
+                self.instrument.clear()
             end_time = time.time()
             total_time = end_time - start_time
-            logging.info(f"总运行时间: {total_time:.2f}秒")
+            scpi_log.info("总运行时间: %.2f秒", total_time)
+            if self.metrics is not None:
+                self.metrics.record(self.model, 'wait', '*OPC?', total_time)
             return total_time  # 返回时间供外部使用
         except Exception as e:
             logging.error(f"发生错误: {str(e)}")
             return str(e)
 
+    def profile(self, top: int = 10, metrics: Optional[IoMetrics] = None):
+        """统计代码块内的I/O，退出时打印累计耗时最多的命令
+
+        example:
+            with self.profile() as metrics:
+                self.set_run_single()
+            metrics.to_json('profile.json')
+        """
+        return profile(self, top=top, metrics=metrics)
+
+    def _enable_srq(self) -> bool:
+        """配置*ESE 1/*SRE 32并启用SRQ事件队列，每次连接只配置一次
+
+        Returns:
+            会话是否支持SRQ事件
+        """
+        if self._srq is None:
+            try:
+                self.instrument.enable_event(pyvisa.constants.EventType.service_request,
+                                             pyvisa.constants.EventMechanism.queue)
+                self._srq = True
+            except (pyvisa.VisaIOError, NotImplementedError, AttributeError) as e:
+                logging.info(f"{self.model} 不支持SRQ事件，回退为*OPC?等待: {e}")
+                self._srq = False
+            self.instrument.write('*ESE 1;*SRE 32')
+        if self._srq:
+            self.instrument.discard_events(pyvisa.constants.EventType.service_request,
+                                           pyvisa.constants.EventMechanism.queue)
+        return self._srq
+
+    @handle_instrument_error
+    @reconnect_on_failure
+    def start(self, command: str, timeout: Optional[float] = None,
+              response: bool = False) -> Completion:
+        """发送耗时操作命令并立即返回完成句柄，仪器通过SRQ通知完成
+
+        Args:
+            command: 操作命令，例如："INIT:IMM"
+            timeout: 等待超时时间(秒)，默认使用self.opc_timeout
+            response: 命令是否为查询(如"*CAL?")，完成后读取其响应
+
+        Returns:
+            Completion句柄，可通过done()/wait()/result()获取完成状态
+
+        example:
+            handle = self.start('INIT:IMM')
+            handle.wait()
+        """
+        srq = self._enable_srq()
+        # 与批量队列中尚未发送的命令合并为一次传输
+        self._batch_queue.append(f'{command};*OPC')
+        self.shadow.update(command, shadow=False)
+        self._track_command(command)
+        self.flush()
+        scpi_log.debug("%s 启动操作: %s", self.model, command)
+        return Completion(self, command, timeout or self.opc_timeout, srq, response)
+
+    def actor(self, max_queue: int = 256):
+        """启用I/O Actor模式，返回该仪器的InstrumentActor
+
+        启用后多个线程通过Actor共享仪器：write入队即返回，query返回Future，
+        连续写入自动合并；重复调用返回同一个Actor。Actor运行期间由其I/O线程独占会话，
+        其他线程直接调用write/query等方法抛出RuntimeError，actor.stop()或close()后恢复直接访问
+
+        Args:
+            max_queue: 命令队列长度
+
+        example:
+            actor = self.actor()
+            future = actor.query('*IDN?')
+            print(future.result())
+        """
+        from pyinsts.libs.actor import InstrumentActor
+
+        if self._actor is None or not self._actor._thread.is_alive():
+            self._actor = InstrumentActor(self, max_queue)
+        return self._actor
+
+    def _check_owner(self) -> None:
+        """Actor运行期间只允许其I/O线程访问会话"""
+        actor = self._actor
+        if actor is not None and actor._thread.ident != threading.get_ident() and actor._thread.is_alive():
+            raise RuntimeError(f"{self.model} 已由I/O Actor独占，请通过actor()访问或先调用actor.stop()")
+
+    def record(self, path: str) -> None:
+        """开始记录会话，每条命令、响应与时间戳追加到二进制记录文件
+
+        记录可通过 ``replay://<path>`` 地址回放，无需仪器即可复现生产测试序列；
+        也可在配置文件的options中写 ``record: <path>``，连接后自动开始记录
+
+        Args:
+            path: 记录文件路径，已存在时追加一段新会话
+
+        example:
+            fswp.record('lot42.scpi')
+            ...
+            fswp.stop_recording()
+            replayed = Fswp('replay://lot42.scpi?speed=10')
+        """
+        from pyinsts.libs.recorder import SessionRecorder
+
+        if self._recorder is not None:
+            self.stop_recording()
+        self._recorder = SessionRecorder(self.instrument, path, address=self.address, model=self.model,
+                                         idn=getattr(self, 'idn', ''))
+        self.instrument = self._recorder
+        logging.info(f"{self.model} 开始记录会话: {path}")
+
+    def stop_recording(self) -> None:
+        """停止记录会话并关闭记录文件"""
+        recorder, self._recorder = self._recorder, None
+        self._record_path = None
+        if recorder is None:
+            return
+        if self.instrument is recorder:
+            self.instrument = recorder.resource
+        recorder.detach()
+        logging.info(f"{self.model} 停止记录会话: {recorder.path}")
+
+    def _session(self):
+        """当前VISA会话，不含会话记录的包装"""
+        return self._recorder.resource if self._recorder is not None else self.instrument
+
     @handle_instrument_error
     def close(self) -> None:
-        """关闭仪器连接"""
-        self.instrument.close()
+        """关闭仪器连接，会话归还会话池供下次连接复用"""
+        if self._actor is not None:
+            self._actor.stop()
+            self._actor = None
+        if self._recorder is not None:
+            self.stop_recording()
+        instrument, self.instrument = self.instrument, None
+        if instrument is None:
+            return
+        session_pool.release(self.address, instrument, self.idn)
         logging.info(f"{self.model} 连接已关闭")
-
@@ -0,0 +1,108 @@
+"""
+仪器操作完成句柄：基于 *ESE 1/*SRE 32 与 *OPC 的服务请求(SRQ)通知
+
+支持SRQ的会话通过VISA事件队列等待，仪器置位即返回；
+不支持SRQ的会话回退为一次带匹配VISA超时的阻塞 *OPC? 查询
+"""
+import logging
+import time
+from typing import Optional
+
+from pyinsts.common.lazy import lazy_import
+from pyinsts.common.log_data import SCPI_LOGGER
+
+pyvisa = lazy_import('pyvisa')
+scpi_log = logging.getLogger(SCPI_LOGGER)
+
+ESB_BIT = 0x20  # 状态字节中的标准事件状态汇总位
+
+
+class Completion:
+    """仪器操作完成句柄"""
+
+    def __init__(self, instrument, command: str, timeout: float, srq: bool,
+                 response: bool = False):
+        """
+        Args:
+            instrument: 发起操作的BaseInstrument
+            command: 已发送的操作命令
+            timeout: 默认等待超时时间(秒)
+            srq: 会话是否支持SRQ事件
+            response: 命令是否为查询，完成后读取其响应
+        """
+        self.instrument = instrument
+        self.command = command
+        self.timeout = timeout
+        self.srq = srq
+        self.start_time = time.time()
+        self.elapsed: Optional[float] = None
+        self.response: Optional[str] = None
+        self._response_pending = response
+
+    def done(self) -> bool:
+        """非阻塞检查操作是否完成"""
+        if self.elapsed is not None:
+            return True
+        self.instrument._check_owner()
+        resource = self.instrument.instrument
+        if self.srq:
+            event = resource.wait_on_event(pyvisa.constants.EventType.service_request, 0, capture_timeout=True)
+            fired = not event.timed_out
+        else:
+            fired = bool(resource.read_stb() & ESB_BIT)
+        if fired:
+            self._finish()
+        return fired
+
+    def wait(self, timeout: Optional[float] = None) -> float:
+        """阻塞等待操作完成
+
+        Args:
+            timeout: 超时时间(秒)，默认使用创建时的超时时间
+
+        Returns:
+            从发送命令到完成的时间(秒)
+        """
+        if self.elapsed is not None:
+            return self.elapsed
+        self.instrument._check_owner()
+        timeout = self.timeout if timeout is None else timeout
+        remaining_ms = max(int((self.start_time + timeout - time.time()) * 1000), 1)
+        resource = self.instrument.instrument
+        if self.srq:
+            event = resource.wait_on_event(pyvisa.constants.EventType.service_request, remaining_ms, capture_timeout=True)
+            if event.timed_out:
+                raise TimeoutError(f"{self.instrument.model} 等待{self.command}完成超时({timeout}秒)")
+        else:
+            self.instrument.timeout_policy.apply(resource, remaining_ms)
+            try:
+                if self._response_pending:
+                    self.response = resource.read()
+                    self._response_pending = False
+                else:
+                    resource.query('*OPC?')
+            except pyvisa.VisaIOError as e:
+                # 清除仪器输出队列，避免迟到的响应打乱后续查询
+                resource.clear()
+                raise TimeoutError(f"{self.instrument.model} 等待{self.command}完成超时({timeout}秒)") from e
+        self._finish()
+        return self.elapsed
+
+    def result(self, timeout: Optional[float] = None):
+        """等待完成并返回查询响应，非查询命令返回耗时(秒)"""
+        elapsed = self.wait(timeout)
+        return self.response if self.response is not None else elapsed
+
+    def _finish(self) -> None:
+        """读取响应并清除状态寄存器"""
+        resource = self.instrument.instrument
+        if self._response_pending:
+            self.response = resource.read()
+            self._response_pending = False
+        if self.srq:
+            resource.read_stb()
+        resource.query('*ESR?')
+        self.elapsed = time.time() - self.start_time
+        if self.instrument.metrics is not None:
+            self.instrument.metrics.record(self.instrument.model, 'wait', self.command, self.elapsed)
+        scpi_log.info("%s %s 完成，耗时: %.2f秒", self.instrument.model, self.command, self.elapsed)
@@ -1,3 +1,4 @@
 from .load_config import load_config
+from .registry import ConfigRegistry, InstrumentEntry, config_registry
 
-__all__ = ['load_config']
\ No newline at end of file
+__all__ = ['load_config', 'ConfigRegistry', 'InstrumentEntry', 'config_registry']
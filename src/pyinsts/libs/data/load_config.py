@@ -1,8 +1,11 @@
 import os
 import json
-import yaml
 import logging
 
+from pyinsts.common.lazy import lazy_import
+
+yaml = lazy_import('yaml')  # 只在读取YAML配置时加载
+
 
 def load_config(config_path="config.yaml"):
     """加载配置文件，支持YAML和JSON格式
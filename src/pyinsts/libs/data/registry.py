@@ -0,0 +1,209 @@
+"""
+进程级配置注册表：每个配置文件只解析一次，按路径与修改时间缓存，
+提供按型号索引的仪器清单(地址、选项、超时)，可选编译缓存使冷启动跳过YAML解析
+"""
+import hashlib
+import json
+import logging
+import os
+import stat
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from pyinsts.libs.data.load_config import load_config
+
+CONFIG_EXTENSIONS = ('.yaml', '.json')
+
+
+@dataclass(frozen=True)
+class InstrumentEntry:
+    """仪器清单条目
+
+    配置文件中可以只写地址，也可以写成字典::
+
+        instruments:
+          FSWP: TCPIP0::192.168.1.1::INSTR
+          N9030B:
+            address: TCPIP0::192.168.1.2::INSTR
+            timeouts: {write: 5000, query: 3000, opc: 60}
+            options: {max_command_length: 512}
+    """
+    model: str
+    address: str
+    options: Dict[str, Any] = field(default_factory=dict)
+    timeouts: Dict[str, float] = field(default_factory=dict)
+
+
+def _parse_inventory(config: Dict) -> Dict[str, InstrumentEntry]:
+    inventory = {}
+    for model, value in (config.get('instruments') or {}).items():
+        if isinstance(value, dict):
+            entry = InstrumentEntry(str(model), value.get('address'), dict(value.get('options') or {}),
+                                    dict(value.get('timeouts') or {}))
+        else:
+            entry = InstrumentEntry(str(model), value)
+        if entry.address:
+            inventory[entry.model] = entry
+    return inventory
+
+
+def _default_cache_dir() -> str:
+    if os.name == 'nt':
+        base = os.getenv('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pyinsts')
+
+
+def _is_private_dir(path: str) -> bool:
+    """目录属于当前用户且组与其他用户不可写，Windows上不检查"""
+    if not hasattr(os, 'getuid'):
+        return True
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        logging.warning(f"配置编译缓存目录不属于当前用户或其他用户可写，不使用缓存: {path}")
+        return False
+    return True
+
+
+class ConfigRegistry:
+    """配置注册表
+
+    example:
+        config_registry.enable_compiled_cache()
+        entry = config_registry.resolve('FSWP', 'config.yaml')
+        print(entry.address, entry.timeouts)
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: 编译缓存目录，为None时不使用编译缓存；
+                也可通过环境变量 PYINSTS_CONFIG_CACHE 指定
+        """
+        self.cache_dir = cache_dir or os.getenv('PYINSTS_CONFIG_CACHE') or None
+        self._configs: Dict[str, Tuple[Tuple[int, int], Dict, Dict[str, InstrumentEntry]]] = {}
+        self._paths: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self.parses = 0  # 实际解析配置文件的次数
+
+    def enable_compiled_cache(self, cache_dir: Optional[str] = None) -> None:
+        """启用编译缓存，解析结果以JSON保存，文件未修改时冷启动直接读取，跳过YAML解析
+
+        缓存只保存数据，读取时不会执行代码；无法无损保存为JSON的配置(如日期、非字符串键)不缓存；
+        默认目录为当前用户的缓存目录，目录不属于当前用户或其他用户可写时不读取缓存
+
+        Args:
+            cache_dir: 缓存目录，默认为 ~/.cache/pyinsts (Windows为 %LOCALAPPDATA%\\pyinsts)
+        """
+        self.cache_dir = cache_dir or _default_cache_dir()
+
+    def resolve_path(self, config_path: str, owner: Optional[type] = None) -> str:
+        """解析配置文件路径
+
+        相对路径相对owner类所在模块的目录；未给出扩展名时依次尝试.yaml、.json
+
+        Args:
+            config_path: 配置文件路径
+            owner: 使用配置的类，例如仪器驱动类
+        """
+        module_file = getattr(sys.modules.get(owner.__module__), '__file__', '') if owner else ''
+        key = (config_path, module_file or '')
+        path = self._paths.get(key)
+        if path is not None:
+            return path
+        path = config_path
+        if not os.path.isabs(path) and module_file:
+            path = os.path.join(os.path.dirname(os.path.abspath(module_file)), path)
+        if not os.path.splitext(path)[1]:
+            for extension in CONFIG_EXTENSIONS:
+                if os.path.exists(path + extension):
+                    path += extension
+                    break
+        path = os.path.abspath(path)
+        self._paths[key] = path
+        return path
+
+    def load(self, path: str) -> Dict:
+        """读取配置，文件未修改时返回缓存(调用方不应修改返回的字典)"""
+        return self._entry(path)[1]
+
+    def inventory(self, path: str) -> Dict[str, InstrumentEntry]:
+        """返回配置文件中的仪器清单，型号 -> InstrumentEntry"""
+        return dict(self._entry(path)[2])
+
+    def resolve(self, model: str, path: str) -> Optional[InstrumentEntry]:
+        """按型号查找仪器清单条目，未配置时返回None"""
+        return self._entry(path)[2].get(model)
+
+    def clear(self) -> None:
+        """清空内存缓存"""
+        with self._lock:
+            self._configs.clear()
+            self._paths.clear()
+
+    def _entry(self, path: str):
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            logging.error(f"配置文件未找到: {path}")
+            raise FileNotFoundError(f"配置文件未找到: {path}") from None
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._configs.get(path)
+            if cached is not None and cached[0] == version:
+                return cached
+        config = self._read_compiled(path, version)
+        if config is None:
+            config = load_config(path) or {}
+            self.parses += 1
+            self._write_compiled(path, version, config)
+        entry = (version, config, _parse_inventory(config))
+        with self._lock:
+            self._configs[path] = entry
+        return entry
+
+    def _compiled_path(self, path: str) -> str:
+        digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f'{os.path.basename(path)}.{digest}.json')
+
+    def _read_compiled(self, path: str, version: Tuple[int, int]) -> Optional[Dict]:
+        if not self.cache_dir or not _is_private_dir(self.cache_dir):
+            return None
+        try:
+            with open(self._compiled_path(path), encoding='utf-8') as file:
+                cached = json.load(file)
+            cached_version, config = tuple(cached['version']), cached['config']
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        return config if cached_version == version and isinstance(config, dict) else None
+
+    def _write_compiled(self, path: str, version: Tuple[int, int], config: Dict) -> None:
+        if not self.cache_dir:
+            return
+        try:
+            text = json.dumps({'version': version, 'config': config}, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        if json.loads(text)['config'] != config:
+            return  # 例如整数键会被转换为字符串
+        target = self._compiled_path(path)
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            if not _is_private_dir(self.cache_dir):
+                return
+            temp = f'{target}.{os.getpid()}.tmp'
+            with open(temp, 'w', encoding='utf-8') as file:
+                file.write(text)
+            os.replace(temp, target)
+        except OSError as e:
+            logging.warning(f"写入配置编译缓存失败: {e}")
+
+
+config_registry = ConfigRegistry()
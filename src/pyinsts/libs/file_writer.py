@@ -0,0 +1,115 @@
+"""
+后台文件写入：截图、迹线等数据经队列交给写入线程，CSV编码与磁盘I/O不占用测量线程
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """后台文件写入线程
+
+    example:
+        writer = get_background_writer()
+        writer.write_bytes('dut1.png', n9020b.fetch_screenshot())
+        writer.write_csv('dut1.csv', (freq, power), header='freq,power')
+        writer.flush()
+    """
+
+    def __init__(self, max_queue: int = 64):
+        """
+        Args:
+            max_queue: 待写入队列长度，队列满时提交阻塞，避免数据在内存中无限堆积
+        """
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name='pyinsts-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """在写入线程中执行func(*args, **kwargs)，返回结果的Future"""
+        if not self._thread.is_alive():
+            raise RuntimeError('后台写入线程已结束')
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def write_bytes(self, path: str, data: bytes) -> Future:
+        """写入二进制文件，例如PNG截图"""
+        return self.submit(_write_bytes, path, data)
+
+    def write_csv(self, path: str, columns: Sequence[np.ndarray], header: str = '',
+                  fmt: str = '%.10g') -> Future:
+        """将等长的列写入CSV文件
+
+        Args:
+            path: 文件路径
+            columns: 数据列，例如(频率, 功率)
+            header: 表头行，例如 'freq,power'
+            fmt: 数值格式
+        """
+        return self.submit(_write_csv, path, columns, header, fmt)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """等待已提交的写入全部完成"""
+        self.submit(lambda: None).result(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """写完已提交的文件后结束写入线程"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            future, func, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                logging.error(f'后台写入失败: {e}')
+                future.set_exception(e)
+
+
+def _write_bytes(path: str, data: bytes) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(data)
+    logging.info(f'已保存: {path}')
+    return path
+
+
+def _write_csv(path: str, columns: Sequence[np.ndarray], header: str, fmt: str) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savetxt(path, np.column_stack(columns), delimiter=',', header=header, comments='', fmt=fmt)
+    logging.info(f'已保存: {path}')
+    return path
+
+
+_writer: Optional[BackgroundWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_background_writer() -> BackgroundWriter:
+    """获取进程内共享的后台写入线程，首次调用时创建，进程退出前写完全部文件"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter()
+            atexit.register(_writer.close)
+        return _writer
@@ -1,13 +1,43 @@
-import os
-import sys
 from typing import  Literal
 
 import time
 import logging
+import tempfile
 
-# 将项目根目录（pyinsts）添加到Python路径
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+import numpy as np
+
+from pyinsts.common.log_data import SCPI_LOGGER
 from pyinsts.libs.baseinstrument import BaseInstrument
+from pyinsts.libs.completion import Completion
+from pyinsts.libs.file_writer import BackgroundWriter, get_background_writer
+from pyinsts.libs.markers import marker_table
+from pyinsts.libs.peaks import find_peaks
+from pyinsts.libs.scpi import join_commands
+
+# 逐条设置/读取的确认日志与SCPI命令日志一样可单独设置等级或采样聚合
+scpi_log = logging.getLogger(SCPI_LOGGER)
+
+MAX_SWEEP_POINTS = 40001
+
+
+def plan_segments(start: float, stop: float, rbw: float, max_points: int = MAX_SWEEP_POINTS,
+                  bins_per_rbw: float = 2.0):
+    """
+    规划宽带扫描的分段：每个RBW至少bins_per_rbw个频点，单段点数不超过max_points，各段跨度相同、首尾相接
+    :param start: 起始频率(Hz)
+    :param stop: 终止频率(Hz)
+    :param rbw: 分辨带宽(Hz)
+    :param max_points: 单段最大扫描点数
+    :param bins_per_rbw: 每个RBW内的频点数
+    :return: (各段(起始, 终止)频率数组, 单段点数)
+    """
+    if stop <= start or rbw <= 0:
+        raise ValueError(f"扫描范围或RBW无效: {start}~{stop}Hz, RBW {rbw}Hz")
+    bins = int(np.ceil((stop - start) * bins_per_rbw / rbw))
+    count = int(np.ceil(bins / (max_points - 1)))
+    points = int(np.ceil(bins / count)) + 1
+    edges = np.linspace(start, stop, count + 1)
+    return np.column_stack((edges[:-1], edges[1:])), points
 
 
 
@@ -33,8 +63,8 @@ class N9020b(BaseInstrument):
         :return:
         """
 
-        self.write(f'SENS:FREQ {freq}{unit}')
-        logging.info(f'设置频率: {freq}{unit}')
+        self.write(f'SENS:FREQ {freq}{unit}', shadow=True)
+        scpi_log.info('设置频率: %s%s', freq, unit)
 
     def set_freq_cent(self, freq:float, unit:Literal['GHz', 'MHz', 'kHz', 'Hz']):
         """
@@ -44,8 +74,8 @@ class N9020b(BaseInstrument):
         :return:
         """
 
-        self.write(f'FREQ:CENT {freq}{unit}',True)
-        logging.info(f'设置中心频率: {freq}{unit}')
+        self.write(f'FREQ:CENT {freq}{unit}',True, shadow=True)
+        scpi_log.info('设置中心频率: %s%s', freq, unit)
 
 
     def set_freq_span(self, freq:float , unit:Literal['GHz', 'MHz', 'kHz', 'Hz']):
@@ -56,9 +86,9 @@ class N9020b(BaseInstrument):
         :return:
         """
 
-        self.write(f'FREQ:SPAN {freq}{unit}; *WAI')  # 设置后使用 *WAI 等待命令执行完成
+        self.write(f'FREQ:SPAN {freq}{unit}; *WAI', shadow=True)  # 设置后使用 *WAI 等待命令执行完成
 
-        logging.info(f'已设置频谱跨度为: {freq}{unit}')
+        scpi_log.info('已设置频谱跨度为: %s%s', freq, unit)
 
 
     def set_freq_span_max(self):
@@ -66,9 +96,9 @@ class N9020b(BaseInstrument):
         设置频谱的跨度 (span)为最大
         :return:
         """
-        self.write(f'FREQ:SPAN MAX; *WAI')  # 设置后使用 *WAI 等待命令执行完成
+        self.write(f'FREQ:SPAN MAX; *WAI', shadow=True)  # 设置后使用 *WAI 等待命令执行完成
         time.sleep(0.001)  # 稍作延迟以确保指令被正确执行
-        logging.info(f'已设置频谱跨度为max')
+        scpi_log.info('已设置频谱跨度为max')
 
     def set_freq_start(self, freq: float, unit:Literal['GHz', 'MHz', 'kHz', 'Hz']):
         """
@@ -78,8 +108,8 @@ class N9020b(BaseInstrument):
         :return:
         """
 
-        self.write(f'FREQ:STAR {freq}{unit}')
-        logging.info(f'设置起始频率: {freq}{unit}')
+        self.write(f'FREQ:STAR {freq}{unit}', shadow=True)
+        scpi_log.info('设置起始频率: %s%s', freq, unit)
 
 
     def set_freq_stop(self, freq: float, unit:Literal['GHz', 'MHz', 'kHz', 'Hz']):
@@ -90,8 +120,8 @@ class N9020b(BaseInstrument):
         :return:
         """
 
-        self.write(f'FREQ:STOP {freq}{unit}')
-        logging.info(f'设置结束频率: {freq}{unit}')
+        self.write(f'FREQ:STOP {freq}{unit}', shadow=True)
+        scpi_log.info('设置结束频率: %s%s', freq, unit)
 
 
     def set_ref_level(self, level: float):
@@ -101,18 +131,22 @@ class N9020b(BaseInstrument):
         :return:
         """
 
-        self.write(f'DISP:WIND:TRAC:Y:RLEV {level}dBm')  # 设置参考电平
-        logging.info(f'已设置参考电平为: {level} dBm')
+        self.write(f'DISP:WIND:TRAC:Y:RLEV {level}dBm', shadow=True)  # 设置参考电平
+        scpi_log.info('已设置参考电平为: %s dBm', level)
 
 
-    def set_auto_tune(self):
+    def set_auto_tune(self, wait: bool = True):
         """
         自动设置参考电平
-        :return:
+        :param wait: 是否等待调谐完成
+        :return: Completion句柄
         """
 
-        self.write('SENS:FREQ:TUNE:IMM; *WAI')  # 设置后使用 *WAI 等待命令执行完成
-        logging.info('已设置自动调频')
+        handle = self.start('SENS:FREQ:TUNE:IMM')
+        if wait:
+            handle.wait()
+        scpi_log.info('已设置自动调频')
+        return handle
 
     def set_rbw(self, rbw: float, unit:Literal['MHz', 'kHz', 'Hz']):
         """
@@ -121,8 +155,8 @@ class N9020b(BaseInstrument):
         :param unit:
         :return:
         """
-        self.write(f'BAND:RES {rbw}{unit}; *WAI')  # 设置后使用 *WAI 等待命令执行完成
-        logging.info(f'已设置分辨带宽为: {rbw}{unit}')
+        self.write(f'BAND:RES {rbw}{unit}; *WAI', shadow=True)  # 设置后使用 *WAI 等待命令执行完成
+        scpi_log.info('已设置分辨带宽为: %s%s', rbw, unit)
 
 
     def set_rbw_auto(self):
@@ -131,10 +165,10 @@ class N9020b(BaseInstrument):
         :return:
         """
         try:
-            self.write('BWID:AUTO ON')  # 设置 RBW 为自动模式并等待
-            logging.info('已将分辨率带宽设置为自动模式')
+            self.write('BWID:AUTO ON', shadow=True)  # 设置 RBW 为自动模式并等待
+            scpi_log.info('已将分辨率带宽设置为自动模式')
         except Exception as e:
-            logging.error(f"设置 RBW 时发生错误: {e}")
+            logging.error('设置 RBW 时发生错误: %s', e)
 
 
     def set_vbw(self, vbw: float, unit:Literal['MHz', 'kHz', 'Hz']):
@@ -147,10 +181,10 @@ class N9020b(BaseInstrument):
 
         try:
             # 构建 SCPI 命令
-            self.write(f'BAND:VID {vbw}{unit}; *WAI')  # 设置后使用 *WAI 等待命令执行完成
-            logging.info(f'已设置视频带宽为: {vbw} {unit}')
+            self.write(f'BAND:VID {vbw}{unit}; *WAI', shadow=True)  # 设置后使用 *WAI 等待命令执行完成
+            scpi_log.info('已设置视频带宽为: %s %s', vbw, unit)
         except Exception as e:
-            logging.error(f"设置视频带宽时发生错误: {e}")
+            logging.error('设置视频带宽时发生错误: %s', e)
 
     def set_vbw_auto(self):
         """
@@ -159,10 +193,10 @@ class N9020b(BaseInstrument):
         """
 
         try:
-            self.write('BAND:VID AUTO; *WAI')  # 设置 VBW 为自动模式并等待
-            logging.info('已将视频带宽设置为自动模式')
+            self.write('BAND:VID AUTO; *WAI', shadow=True)  # 设置 VBW 为自动模式并等待
+            scpi_log.info('已将视频带宽设置为自动模式')
         except Exception as e:
-            logging.error(f"设置 VBW 时发生错误: {e}")
+            logging.error('设置 VBW 时发生错误: %s', e)
 
 
     def set_peak_search(self):
@@ -170,15 +204,15 @@ class N9020b(BaseInstrument):
         peak search
         :return:
         """
-        self.instrument.write(f"CALC:MARK1:MAX:PEAK")
-        logging.info('执行peak search')
+        self.write(f"CALC:MARK1:MAX:PEAK")
+        scpi_log.info('执行peak search')
     def set_next_peak(self):
         """
         next peak
         :return:
         """
         self.write(f"CALC:MARK1:MAX:NEXT")
-        logging.info('执行next peak')
+        scpi_log.info('执行next peak')
 
     def set_marker_freq(self, frequency: float,unit: Literal['GHz', 'MHz', 'kHz', 'Hz'] = 'Hz', mark_number: int = 1):
         """
@@ -190,9 +224,9 @@ class N9020b(BaseInstrument):
         """
         try:
             self.write(f'CALC:MARK{mark_number}:FREQ {frequency}{unit}; *WAI')  # 设置指定标记的频率并等待
-            logging.info(f'已将标记{mark_number}的频率设置为: {frequency}{unit}')
+            scpi_log.info('已将标记%s的频率设置为: %s%s', mark_number, frequency, unit)
         except Exception as e:
-            logging.error(f"设置标记{mark_number}频率时发生错误: {e}")
+            logging.error('设置标记%s频率时发生错误: %s', mark_number, e)
 
     def set_mark_delt_on(self, x):
         """
@@ -201,7 +235,7 @@ class N9020b(BaseInstrument):
         :return:
         """
         self.write(f"CALC:MARK{x}:MODE DELT")
-        logging.info(f'开启delt标记: MARK{x}')
+        scpi_log.info('开启delt标记: MARK%s', x)
 
     def set_mark_all_off(self):
         """
@@ -209,7 +243,7 @@ class N9020b(BaseInstrument):
         :return:
         """
         self.write(f"CALC:MARK:AOFF")
-        logging.info('关闭所有标记')
+        scpi_log.info('关闭所有标记')
 
 
     def set_mark_del_freq(self, mark_number: int, freq:float, unit: Literal['GHz', 'MHz', 'kHz', 'Hz']):
@@ -222,7 +256,7 @@ class N9020b(BaseInstrument):
         """
 
         self.write(f"CALC:MARK{mark_number}:X {freq}{unit}")
-        logging.info(f'设置MARK{mark_number}的delt频率为: {freq}{unit}')
+        scpi_log.info('设置MARK%s的delt频率为: %s%s', mark_number, freq, unit)
 
 
     def query_mark_delta_x(self, mark_number: int, unit: Literal['GHz', 'MHz', 'kHz', 'Hz']):
@@ -241,7 +275,7 @@ class N9020b(BaseInstrument):
             value = float(value) / 1e3
         elif unit == 'Hz':
             value = float(value)
-        logging.info(f'读取MARK{mark_number}的偏移频率: {value}{unit}')
+        scpi_log.info('读取MARK%s的偏移频率: %s%s', mark_number, value, unit)
         return value, unit
 
 
@@ -262,7 +296,7 @@ class N9020b(BaseInstrument):
             value = float(value.replace("\n", "").replace("\r", "")) / 1e3
         elif unit == 'Hz':
             value = float(value.replace("\n", "").replace("\r", ""))
-        logging.info(f'读取MARK频率为:{value}{unit}')
+        scpi_log.info('读取MARK频率为:%s%s', value, unit)
         return value, unit
 
 
@@ -273,16 +307,58 @@ class N9020b(BaseInstrument):
         """
         value = self.query(f"CALC:MARK:Y?")
         value = float(value.replace("\n", "").replace("\r", ""))  # 删除字符串中的换行符和回车符
-        logging.info(f'读取MARK频率为:{value} dBm')
+        scpi_log.info('读取MARK频率为:%s dBm', value)
         return value
 
+    def set_markers(self, positions, unit: Literal['GHz', 'MHz', 'kHz', 'Hz'] = 'Hz', mode: str = 'POS',
+                    start: int = 1):
+        """
+        一次传输放置多个marker
+        :param positions: 各marker的X值
+        :param unit: X值单位
+        :param mode: marker模式，POS/DELT/FIXed
+        :param start: 第一个marker的编号
+        :return:
+        """
+        with self.batch():
+            for number, position in enumerate(positions, start):
+                self.write(f'CALC:MARK{number}:MODE {mode}')
+                self.write(f'CALC:MARK{number}:X {position}{unit}')
+        scpi_log.info('放置%s个marker', len(positions))
+
+    def query_markers(self, markers=(1,), positions=None, unit: Literal['GHz', 'MHz', 'kHz', 'Hz'] = 'Hz'):
+        """
+        以一次复合查询读取多个marker的X、Y与模式，只应查询已打开的marker
+        :param markers: marker编号
+        :param positions: 给出时先将各marker放置到这些X值，与读取合并为同一次传输
+        :param unit: positions的单位
+        :return: 结构化数组，字段为 marker, x(Hz), y(dBm), mode
+        """
+        markers = list(markers)
+        commands = []
+        if positions is not None:
+            for number, position in zip(markers, positions):
+                commands += [f'CALC:MARK{number}:MODE POS', f'CALC:MARK{number}:X {position}{unit}']
+        for number in markers:
+            commands += [f'CALC:MARK{number}:MODE?', f'CALC:MARK{number}:X?', f'CALC:MARK{number}:Y?']
+        responses = self.query_many(commands)
+        return marker_table(markers, responses[1::3], responses[2::3], responses[0::3])
+
+    def query_trace(self, trace: int = 1):
+        """
+        以二进制块读取迹线幅度数据,单位dBm
+        :param trace: 迹线编号，1~6
+        :return: numpy数组
+        """
+        return self.fetch_trace(f'TRAC:DATA? TRACE{trace}')
+
     def set_peak_search_continuous_on(self):
         """
         设置peak search连续最终打开
         :return:
         """
         self.write(f"CALC:MARK:CPS ON")
-        logging.info(f'set_peak_search_continuous 成功')
+        scpi_log.info('set_peak_search_continuous 成功')
 
     def set_mark_to_cf(self,mark_number: int = 1):
         """
@@ -291,7 +367,7 @@ class N9020b(BaseInstrument):
         :return:
         """
         self.write(f"CALC:MARK{mark_number}:CENT")
-        logging.info(f'CALC:MARK{mark_number}:CENT 成功')
+        scpi_log.info('CALC:MARK%s:CENT 成功', mark_number)
 
 
     def save_png(self, file_path):
@@ -302,43 +378,188 @@ class N9020b(BaseInstrument):
         """
         self.write(f'MMEM:STOR:TRAC:DATA TRACE1, "{file_path}.csv"; *WAI')
         self.write(f'MMEM:STOR:SCR "{file_path}.PNG"; *WAI')
-
-        logging.info(f'保存屏幕截图到: {file_path}.PNG')
-
-        time.sleep(1)
+        self.query('*OPC?')  # 等待仪器写完文件，取代固定延时
+
+        scpi_log.info('保存屏幕截图到: %s.PNG', file_path)
+
+    def fetch_screenshot(self, temp_file: str = r'D:\pyinsts_screen.png') -> bytes:
+        """
+        截图并经总线读取PNG数据，不在本地保存
+        :param temp_file: 仪器上的临时文件
+        :return: PNG文件内容
+        """
+        self.write(f'MMEM:STOR:SCR "{temp_file}"; *WAI')
+        data = self.query_block(f'MMEM:DATA? "{temp_file}"')
+        self.write(f'MMEM:DEL "{temp_file}"')
+        return data
+
+    def fetch_trace_xy(self, trace: int = 1):
+        """
+        读取迹线及对应频率
+        :param trace: 迹线编号，1~6
+        :return: (频率Hz, 幅度dBm) numpy数组
+        """
+        power = self.query_trace(trace)
+        start, stop = (float(value) for value in self.query_many(['FREQ:STAR?', 'FREQ:STOP?']))
+        return np.linspace(start, stop, power.size), power
+
+    def query_peaks(self, count: int = 20, threshold: float = None, excursion: float = 6.0, spacing: float = 0.0,
+                    trace=1):
+        """
+        读取一次迹线，在主机侧搜索峰值，代替 peak search/next peak 与逐个marker查询的多次往返
+        :param count: 最多返回的峰值个数，按幅度从高到低
+        :param threshold: 峰值门限(dBm)，None为不设门限
+        :param excursion: 峰值相对两侧基底至少高出的幅度(dB)
+        :param spacing: 峰值之间的最小频率间隔(Hz)
+        :param trace: 迹线编号，给出序列时多条迹线一并搜索
+        :return: 字段为 (index, x, y) 的结构化数组，x为频率Hz，y为幅度dBm；多条迹线时为二维数组
+        """
+        if np.isscalar(trace):
+            freq, power = self.fetch_trace_xy(trace)
+        else:
+            power = np.stack([self.query_trace(number) for number in trace])
+            start, stop = (float(value) for value in self.query_many(['FREQ:STAR?', 'FREQ:STOP?']))
+            freq = np.linspace(start, stop, power.shape[-1])
+        peaks = find_peaks(power, freq, count, threshold, excursion, spacing)
+        scpi_log.info('找到%s个峰值', np.count_nonzero(peaks["index"] >= 0))
+        return peaks
+
+    def scan(self, start: float, stop: float, rbw: float, max_points: int = MAX_SWEEP_POINTS,
+             bins_per_rbw: float = 2.0, trace: int = 1, out: np.ndarray = None, timeout: float = None):
+        """
+        分段拼接的宽带扫描：每段以二进制读取迹线，直接写入结果数组；
+        读取当前段迹线与下一段的频率设置、触发合并为同一次传输，仪器输出迹线后立即开始下一段扫描
+        频率结果与out为None时的幅度结果写入匿名临时文件上的np.memmap(关闭后自动删除)，由操作系统按需换出，
+        扫描很宽时内存占用不随范围增长；需要逐段处理而不保留整条结果时使用iter_scan
+        :param start: 起始频率(Hz)
+        :param stop: 终止频率(Hz)
+        :param rbw: 分辨带宽(Hz)
+        :param max_points: 单段最大扫描点数
+        :param bins_per_rbw: 每个RBW内的频点数
+        :param trace: 迹线编号
+        :param out: 幅度结果数组，例如np.empty(...)或np.lib.format.open_memmap打开的文件
+        :param timeout: 单段扫描超时时间(秒)
+        :return: (频率Hz, 幅度dBm)，频率为np.memmap，幅度为out或np.memmap
+        """
+        segments, points = plan_segments(start, stop, rbw, max_points, bins_per_rbw)
+        step = points - 1
+        total = len(segments) * step + 1
+        if out is not None and out.shape != (total,):
+            raise ValueError(f"结果数组形状应为({total},)，实际为{out.shape}")
+        freq = np.memmap(tempfile.TemporaryFile(), dtype=np.float64, mode='w+', shape=(total,))
+        power = np.memmap(tempfile.TemporaryFile(), dtype=np.float32, mode='w+', shape=(total,)) if out is None else out
+        scanned = self.iter_scan(start, stop, rbw, max_points, bins_per_rbw, trace, timeout)
+        for index, (segment_freq, data) in enumerate(scanned):
+            freq[index * step:index * step + points] = segment_freq
+            power[index * step:index * step + points] = data
+        return freq, power
+
+    def iter_scan(self, start: float, stop: float, rbw: float, max_points: int = MAX_SWEEP_POINTS,
+                  bins_per_rbw: float = 2.0, trace: int = 1, timeout: float = None):
+        """
+        逐段产出分段拼接的宽带扫描结果，只保留当前段数据，相邻段首尾频点相同
+        提前结束迭代时等待已启动的扫描完成，会话可继续使用
+        :param start: 起始频率(Hz)
+        :param stop: 终止频率(Hz)
+        :param rbw: 分辨带宽(Hz)
+        :param max_points: 单段最大扫描点数
+        :param bins_per_rbw: 每个RBW内的频点数
+        :param trace: 迹线编号
+        :param timeout: 单段扫描超时时间(秒)
+        :return: (该段频率Hz, 该段幅度dBm) 迭代器
+        """
+        segments, points = plan_segments(start, stop, rbw, max_points, bins_per_rbw)
+        logging.info('宽带扫描 %s~%sHz，RBW %sHz，%s段 x %s点', start, stop, rbw, len(segments), points)
+
+        with self.batch():
+            self.write('INIT:CONT 0', shadow=True)
+            self.write(f'BAND:RES {rbw}Hz', shadow=True)
+            self.write(f'SWE:POIN {points}', shadow=True)
+            self.write(f'FREQ:STAR {segments[0][0]}Hz', shadow=True)
+            self.write(f'FREQ:STOP {segments[0][1]}Hz', shadow=True)
+            handle = self.start('INIT:IMM', timeout)
+        try:
+            for index, segment in enumerate(segments):
+                handle.wait()
+                if index + 1 < len(segments):
+                    data, handle = self._fetch_and_start(trace, segments[index + 1], timeout)
+                else:
+                    data, handle = self.query_trace(trace), None
+                yield np.linspace(segment[0], segment[1], points), data
+        finally:
+            if handle is not None and handle.elapsed is None:
+                handle.wait()
+
+    def _fetch_and_start(self, trace: int, segment, timeout: float = None):
+        """读取迹线，并在同一条复合命令中设置下一段频率、启动扫描"""
+        srq = self._enable_srq()
+        settings = [f'FREQ:STAR {segment[0]}Hz', f'FREQ:STOP {segment[1]}Hz']
+        command = next(join_commands([f'TRAC:DATA? TRACE{trace}', *settings, 'INIT:IMM', '*OPC'], float('inf')))
+        data = self.fetch_trace(command)
+        for setting in settings:
+            self.shadow.update(setting, True)
+        return data, Completion(self, 'INIT:IMM', timeout or self.opc_timeout, srq)
+
+    def save_png_local(self, file_path, trace: int = 1, writer: BackgroundWriter = None):
+        """
+        截图与迹线经总线读回，由后台线程保存到本地 {file_path}.png 与 {file_path}.csv，立即返回
+        :param file_path: 本地文件路径，不含扩展名
+        :param trace: 迹线编号
+        :param writer: 后台写入线程，默认使用进程内共享的写入线程
+        :return: (png写入Future, csv写入Future)
+        """
+        writer = writer or get_background_writer()
+        freq, power = self.fetch_trace_xy(trace)
+        csv = writer.write_csv(f'{file_path}.csv', (freq, power), header='freq_hz,power_dbm')
+        png = writer.write_bytes(f'{file_path}.png', self.fetch_screenshot())
+        return png, csv
 
     def set_single(self):
         """
         单次运行
         :return:
         """
-        self.write(f"INIT:CONT 0")
-        logging.info(f'set_single 成功')
+        self.write(f"INIT:CONT 0", shadow=True)
+        scpi_log.info('set_single 成功')
 
 
+    def run_single(self, timeout: float = None):
+        """
+        单次扫描，立即返回，仪器通过SRQ通知扫描完成
+        :param timeout: 等待扫描完成的超时时间(秒)
+        :return: Completion句柄，handle.wait()等待完成
+        """
+        with self.batch():
+            self.write(f"INIT:CONT 0", shadow=True)
+            return self.start(f"INIT:IMM", timeout)
+
     def set_cont(self):
         """
         连续运行
         :return:
         """
-        self.write(f"INIT:CONT 1")
-        logging.info(f'set_cont 成功')
+        self.write(f"INIT:CONT 1", shadow=True)
+        scpi_log.info('set_cont 成功')
 
-    def set_cal_all(self):
+    def set_cal_all(self, wait: bool = True):
         """
         自校准all
-        :return:
+        :param wait: 是否等待校准完成
+        :return: Completion句柄，handle.result()为*CAL?结果
         """
-        self.write(f"*CAL?",True)
-        logging.info(f'自校准all 成功')
+        handle = self.start(f"*CAL?", response=True)
+        if wait:
+            handle.wait()
+            scpi_log.info('自校准all 成功')
+        return handle
 
     def close(self):
         """
         关闭仪器端口
         :return:
         """
-        self.close()
-        logging.info(f'关闭频谱仪{self.model}端口')
+        super().close()
+        logging.info('关闭频谱仪%s端口', self.model)
 
 
 if __name__ == '__main__':
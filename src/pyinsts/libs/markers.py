@@ -0,0 +1,30 @@
+"""
+marker表：批量读取的marker结果以结构化数组 (marker, x, y, mode) 表示
+"""
+from typing import Sequence
+
+import numpy as np
+
+MARKER_DTYPE = np.dtype([('marker', 'i4'), ('x', 'f8'), ('y', 'f8'), ('mode', 'U5')])
+
+# 各仪器marker状态查询的响应与统一模式名称的对应
+_MODES = {'1': 'POS', '0': 'OFF', 'ON': 'POS', 'NORM': 'POS', 'POS': 'POS', 'DELT': 'DELT', 'FIX': 'FIX',
+          'FIXED': 'FIX', 'OFF': 'OFF'}
+
+
+def marker_table(markers: Sequence[int], x: Sequence[str], y: Sequence[str],
+                 modes: Sequence[str]) -> np.ndarray:
+    """由复合查询的响应构造marker表
+
+    Args:
+        markers: marker编号
+        x: 各marker的X响应
+        y: 各marker的Y响应
+        modes: 各marker的状态或模式响应，例如 "POS"、"1"
+    """
+    table = np.empty(len(markers), dtype=MARKER_DTYPE)
+    table['marker'] = markers
+    table['x'] = [float(value) for value in x]
+    table['y'] = [float(value) for value in y]
+    table['mode'] = [_MODES.get(value.strip().upper(), value.strip().upper()) for value in modes]
+    return table
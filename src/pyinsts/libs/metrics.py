@@ -0,0 +1,196 @@
+"""
+仪器I/O耗时统计：按仪器型号、操作类型与SCPI命令模板统计次数、字节数与耗时分布
+"""
+import csv
+import io
+import json
+import math
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from pyinsts.libs.scpi import command_template
+
+# 直方图按对数划分：1us ~ 1000s，每十倍程20个桶
+_BUCKETS_PER_DECADE = 20
+_MIN_EXPONENT = -6
+_BUCKET_COUNT = 9 * _BUCKETS_PER_DECADE + 1
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """对数分桶耗时直方图，内存固定，百分位误差约为桶宽(~12%)"""
+
+    __slots__ = ('counts', 'count')
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        if seconds > 0:
+            index = int((math.log10(seconds) - _MIN_EXPONENT) * _BUCKETS_PER_DECADE)
+            index = min(max(index, 0), _BUCKET_COUNT - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+
+    def percentile(self, percent: float) -> float:
+        """返回百分位耗时(秒)，取所在桶的几何中点"""
+        if not self.count:
+            return 0.0
+        target = percent / 100 * self.count
+        cumulative = 0
+        for index, bucket in enumerate(self.counts):
+            cumulative += bucket
+            if cumulative >= target:
+                return 10 ** (_MIN_EXPONENT + (index + 0.5) / _BUCKETS_PER_DECADE)
+        return 10 ** (_MIN_EXPONENT + 9)
+
+
+class CommandStats:
+    """单类命令的统计"""
+
+    __slots__ = ('model', 'kind', 'template', 'count', 'total', 'min', 'max',
+                 'bytes_out', 'bytes_in', 'histogram')
+
+    def __init__(self, model: str, kind: str, template: str):
+        self.model = model
+        self.kind = kind
+        self.template = template
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.histogram = LatencyHistogram()
+
+    def as_dict(self) -> Dict:
+        row = {
+            'model': self.model,
+            'kind': self.kind,
+            'command': self.template,
+            'count': self.count,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else 0.0,
+            'min_s': self.min if self.count else 0.0,
+            'max_s': self.max,
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+        }
+        for percent in PERCENTILES:
+            row[f'p{percent}_s'] = self.histogram.percentile(percent)
+        return row
+
+
+class IoMetrics:
+    """仪器I/O统计
+
+    赋值给仪器的 ``metrics`` 属性后开始记录，为None时不记录，开销仅为一次属性判断
+
+    example:
+        metrics = IoMetrics()
+        fswp.metrics = metrics
+        ...
+        print(metrics.report())
+        metrics.to_json('io_metrics.json')
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str, str], CommandStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, kind: str, command: str, elapsed: float,
+               bytes_out: int = 0, bytes_in: int = 0) -> None:
+        """记录一次I/O
+
+        Args:
+            model: 仪器型号
+            kind: 操作类型，write/query/batch/trace/wait
+            command: SCPI命令，按模板归类
+            elapsed: 耗时(秒)
+            bytes_out: 发送字节数
+            bytes_in: 接收字节数
+        """
+        key = (model, kind, command_template(command))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = CommandStats(*key)
+            stats.count += 1
+            stats.total += elapsed
+            stats.min = min(stats.min, elapsed)
+            stats.max = max(stats.max, elapsed)
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            stats.histogram.add(elapsed)
+
+    def stats(self) -> List[Dict]:
+        """返回各命令统计，按累计耗时降序"""
+        with self._lock:
+            rows = [stats.as_dict() for stats in self._stats.values()]
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+
+    def top(self, n: int = 10) -> List[Dict]:
+        """返回累计耗时最多的n类命令"""
+        return self.stats()[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """导出为JSON，给出path时同时写入文件"""
+        text = json.dumps(self.stats(), ensure_ascii=False, indent=2)
+        if path:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+        return text
+
+    def to_csv(self, path: Optional[str] = None) -> str:
+        """导出为CSV，给出path时同时写入文件"""
+        rows = self.stats()
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        text = buffer.getvalue()
+        if path:
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                file.write(text)
+        return text
+
+    def report(self, n: int = 10) -> str:
+        """格式化输出累计耗时最多的n类命令"""
+        lines = [f"{'model':<10} {'kind':<8} {'count':>8} {'total_s':>11} {'p50_ms':>10} "
+                 f"{'p95_ms':>10} {'p99_ms':>10} {'bytes_in':>12}  command"]
+        for row in self.top(n):
+            lines.append(f"{row['model']:<10} {row['kind']:<8} {row['count']:>8} {row['total_s']:>11.3f} "
+                         f"{row['p50_s'] * 1e3:>10.2f} {row['p95_s'] * 1e3:>10.2f} "
+                         f"{row['p99_s'] * 1e3:>10.2f} {row['bytes_in']:>12}  {row['command']}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def profile(*instruments, top: int = 10, metrics: Optional[IoMetrics] = None):
+    """统计代码块内指定仪器的I/O，退出时打印累计耗时最多的命令
+
+    example:
+        with profile(fswp, n9020b) as metrics:
+            fswp.set_run_single()
+        metrics.to_csv('profile.csv')
+    """
+    metrics = metrics or IoMetrics()
+    previous = [instrument.metrics for instrument in instruments]
+    for instrument in instruments:
+        instrument.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        for instrument, old in zip(instruments, previous):
+            instrument.metrics = old
+        print(metrics.report(top))
@@ -0,0 +1,109 @@
+"""
+主机侧峰值搜索：一次读取迹线后在numpy中完成门限、偏移量(excursion)、最小间隔与前N个峰值的筛选，
+代替仪器上 peak search / next peak 与逐个marker查询的多次往返
+"""
+from typing import Optional
+
+import numpy as np
+
+PEAK_DTYPE = np.dtype([('index', 'i8'), ('x', 'f8'), ('y', 'f8')])
+
+
+def _local_maxima(y: np.ndarray) -> np.ndarray:
+    """局部最大值掩码，平顶峰取第一个点，迹线两端不计"""
+    mask = np.zeros(y.shape, dtype=bool)
+    mask[..., 1:-1] = (y[..., 1:-1] > y[..., :-2]) & (y[..., 1:-1] >= y[..., 2:])
+    return mask
+
+
+def _bases(heights: np.ndarray, gaps: np.ndarray) -> np.ndarray:
+    """单调栈求各峰到一侧最近的更高峰(无则到迹线端点)之间的最小值
+
+    Args:
+        heights: 候选峰幅度，按扫描方向排列
+        gaps: gaps[k]为第k个峰与扫描方向上前一个峰(或端点)之间的最小值
+    """
+    bases = []
+    stack = []  # (峰幅度, 该峰与栈中前一个峰之间的最小值)
+    for height, low in zip(heights.tolist(), gaps.tolist()):
+        while stack and stack[-1][0] <= height:
+            popped = stack.pop()[1]
+            if popped < low:
+                low = popped
+        bases.append(low)
+        stack.append((height, low))
+    return np.asarray(bases)
+
+
+def _prominence(line: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """各候选峰相对两侧基底高出的幅度，取两侧中较小者"""
+    heights = line[candidates]
+    # gaps[k]为第k-1与第k个候选峰之间的最小值，gaps[0]与gaps[-1]延伸到迹线两端
+    gaps = np.minimum.reduceat(line, np.concatenate(([0], candidates)))
+    left = _bases(heights, gaps[:-1])
+    right = _bases(heights[::-1], gaps[:0:-1])[::-1]
+    return heights - np.maximum(left, right)
+
+
+def _select(x: np.ndarray, line: np.ndarray, mask: np.ndarray, excursion: float, spacing: float,
+            count: Optional[int]) -> np.ndarray:
+    candidates = np.flatnonzero(mask)
+    if candidates.size and excursion > 0:
+        candidates = candidates[_prominence(line, candidates) >= excursion]
+    order = candidates[np.argsort(-line[candidates], kind='stable')]
+    if spacing > 0 and order.size > 1:
+        kept = []
+        for index in order:
+            if all(abs(x[index] - x[other]) >= spacing for other in kept):
+                kept.append(index)
+                if count is not None and len(kept) >= count:
+                    break
+        order = np.asarray(kept, dtype=np.int64)
+    if count is not None:
+        order = order[:count]
+    peaks = np.empty(order.size, dtype=PEAK_DTYPE)
+    peaks['index'] = order
+    peaks['x'] = x[order]
+    peaks['y'] = line[order]
+    return peaks
+
+
+def find_peaks(y, x=None, count: Optional[int] = None, threshold: Optional[float] = None,
+               excursion: float = 0.0, spacing: float = 0.0) -> np.ndarray:
+    """搜索迹线峰值，按幅度从高到低排列
+
+    Args:
+        y: 迹线幅度，可为多条迹线堆叠的数组，最后一维为迹线点
+        x: 迹线横坐标(如频率Hz)，为None时使用点序号
+        count: 最多返回的峰值个数，为None时返回全部
+        threshold: 峰值门限，低于门限的峰值忽略
+        excursion: 峰值相对两侧基底至少高出的幅度(dB)，与仪器的peak excursion含义相同
+        spacing: 峰值之间的最小横坐标间隔，较低的峰值在间隔内被忽略
+
+    Returns:
+        一维输入返回字段为 (index, x, y) 的结构化数组；
+        多条迹线返回形状为 y.shape[:-1] + (count,) 的数组，不足count个的以index=-1、x/y=nan补齐
+
+    example:
+        freq, power = n9020b.fetch_trace_xy()
+        spurs = find_peaks(power, freq, count=20, threshold=-80, excursion=6, spacing=1e6)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(y.shape[-1], dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    mask = _local_maxima(y)
+    if threshold is not None:
+        mask &= y >= threshold
+    if y.ndim == 1:
+        return _select(x, y, mask, excursion, spacing, count)
+
+    lines = y.reshape(-1, y.shape[-1])
+    masks = mask.reshape(lines.shape)
+    found = [_select(x, line, line_mask, excursion, spacing, count) for line, line_mask in zip(lines, masks)]
+    width = count if count is not None else max((peaks.size for peaks in found), default=0)
+    result = np.empty((len(found), width), dtype=PEAK_DTYPE)
+    result['index'] = -1
+    result['x'] = np.nan
+    result['y'] = np.nan
+    for row, peaks in zip(result, found):
+        row[:peaks.size] = peaks
+    return result.reshape(y.shape[:-1] + (width,))
@@ -0,0 +1,151 @@
+"""
+相位噪声分析：由一次读取的单边带相位噪声迹线L(f)在主机侧计算积分相位噪声、RMS抖动、剩余调频与点噪声
+
+相邻迹线点之间按幂律(L在对数频率上线性)积分，积分区间端点落在迹线点之间时同样按幂律插值；
+所有函数对多条迹线(noise的前导维度)与多个积分区间同时向量化计算
+"""
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+Ranges = Union[Tuple[float, float], Sequence[Tuple[float, float]], np.ndarray]
+
+
+def _prepare(offsets, noise) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.asarray(offsets, dtype=np.float64)
+    noise = np.asarray(noise, dtype=np.float64)
+    if offsets.ndim != 1 or noise.shape[-1] != offsets.size or offsets.size < 2:
+        raise ValueError(f"迹线点数不匹配: offsets {offsets.shape}, noise {noise.shape}")
+    if offsets[0] > offsets[-1]:
+        offsets, noise = offsets[::-1], noise[..., ::-1]
+    return offsets, noise
+
+
+def _ranges(ranges: Ranges) -> np.ndarray:
+    ranges = np.asarray(ranges, dtype=np.float64)
+    if ranges.shape[-1] != 2:
+        raise ValueError(f"积分区间应为(起始, 终止)偏移频率: {ranges.shape}")
+    return ranges.reshape(-1, 2)
+
+
+def _power_integral(start, stop, density, slope):
+    """幂律密度 density*(f/start)^slope 在[start, stop]上的积分"""
+    exponent = slope + 1
+    ratio = stop / start
+    near_log = np.abs(exponent) < 1e-9
+    safe = np.where(near_log, 1.0, exponent)
+    return density * start * np.where(near_log, np.log(ratio), (ratio ** safe - 1) / safe)
+
+
+def _integrate(offsets: np.ndarray, noise: np.ndarray, ranges: np.ndarray, weight: int) -> np.ndarray:
+    """对 f**weight * 10**(L/10) 在各区间上积分
+
+    Returns:
+        形状为 noise.shape[:-1] + (区间数,) 的积分结果
+    """
+    log_f = np.log(offsets)
+    density = 10 ** (noise / 10) * offsets ** weight
+    slope = np.diff(np.log(density), axis=-1) / np.diff(log_f)
+    # 迹线点处的累积积分
+    segments = _power_integral(offsets[:-1], offsets[1:], density[..., :-1], slope)
+    cumulative = np.concatenate([np.zeros(noise.shape[:-1] + (1,)), np.cumsum(segments, axis=-1)], axis=-1)
+
+    bounds = np.clip(ranges, offsets[0], offsets[-1])
+    index = np.clip(np.searchsorted(offsets, bounds, side='right') - 1, 0, offsets.size - 2)
+    partial = _power_integral(offsets[index], bounds, density[..., index], slope[..., index])
+    at_bounds = cumulative[..., index] + partial
+    return at_bounds[..., 1] - at_bounds[..., 0]
+
+
+def spot_noise(offsets, noise, at) -> np.ndarray:
+    """按对数频率线性插值读取任意偏移处的点噪声
+
+    Args:
+        offsets: 迹线偏移频率(Hz)
+        noise: L(f)(dBc/Hz)，可为多条迹线堆叠的数组，最后一维为迹线点
+        at: 读取点噪声的偏移频率(Hz)
+
+    Returns:
+        形状为 noise.shape[:-1] + (len(at),) 的点噪声(dBc/Hz)，超出迹线范围的取端点值
+    """
+    offsets, noise = _prepare(offsets, noise)
+    log_f = np.log(offsets)
+    log_at = np.log(np.clip(np.atleast_1d(np.asarray(at, dtype=np.float64)), offsets[0], offsets[-1]))
+    index = np.clip(np.searchsorted(log_f, log_at, side='right') - 1, 0, offsets.size - 2)
+    fraction = (log_at - log_f[index]) / (log_f[index + 1] - log_f[index])
+    return noise[..., index] * (1 - fraction) + noise[..., index + 1] * fraction
+
+
+def integrated_phase_noise(offsets, noise, ranges: Ranges) -> np.ndarray:
+    """积分相位噪声，双边带，dBc
+
+    Args:
+        offsets: 迹线偏移频率(Hz)
+        noise: L(f)(dBc/Hz)，最后一维为迹线点
+        ranges: 积分区间(起始, 终止)，单个或多个
+
+    Returns:
+        形状为 noise.shape[:-1] + (区间数,) 的数组
+    """
+    offsets, noise = _prepare(offsets, noise)
+    return 10 * np.log10(2 * _integrate(offsets, noise, _ranges(ranges), 0))
+
+
+def rms_phase(offsets, noise, ranges: Ranges) -> np.ndarray:
+    """RMS相位误差，rad"""
+    offsets, noise = _prepare(offsets, noise)
+    return np.sqrt(2 * _integrate(offsets, noise, _ranges(ranges), 0))
+
+
+def rms_jitter(offsets, noise, carrier, ranges: Ranges) -> np.ndarray:
+    """RMS抖动，fs
+
+    Args:
+        offsets: 迹线偏移频率(Hz)
+        noise: L(f)(dBc/Hz)，最后一维为迹线点
+        carrier: 载波频率(Hz)，多条迹线时可为与noise.shape[:-1]对应的数组
+        ranges: 积分区间(起始, 终止)，单个或多个
+    """
+    carrier = np.asarray(carrier, dtype=np.float64)[..., np.newaxis]
+    return rms_phase(offsets, noise, ranges) / (2 * np.pi * carrier) * 1e15
+
+
+def residual_fm(offsets, noise, ranges: Ranges) -> np.ndarray:
+    """剩余调频(RMS频偏)，Hz"""
+    offsets, noise = _prepare(offsets, noise)
+    return np.sqrt(2 * _integrate(offsets, noise, _ranges(ranges), 2))
+
+
+@dataclass(frozen=True)
+class PhaseNoiseTrace:
+    """一次读取的相位噪声迹线，在主机侧按任意区间与偏移重复分析
+
+    example:
+        trace = fswp.fetch_phase_noise()
+        trace.jitter([(1e3, 1e7), (1e4, 1e8)])
+        trace.spot([1e3, 1e4, 1e5, 1e6])
+    """
+    offsets: np.ndarray
+    noise: np.ndarray
+    carrier: Union[float, np.ndarray]
+
+    def spot(self, at) -> np.ndarray:
+        """点噪声，dBc/Hz"""
+        return spot_noise(self.offsets, self.noise, at)
+
+    def integrated(self, ranges: Ranges) -> np.ndarray:
+        """积分相位噪声，dBc"""
+        return integrated_phase_noise(self.offsets, self.noise, ranges)
+
+    def phase(self, ranges: Ranges) -> np.ndarray:
+        """RMS相位误差，rad"""
+        return rms_phase(self.offsets, self.noise, ranges)
+
+    def jitter(self, ranges: Ranges) -> np.ndarray:
+        """RMS抖动，fs"""
+        return rms_jitter(self.offsets, self.noise, self.carrier, ranges)
+
+    def residual_fm(self, ranges: Ranges) -> np.ndarray:
+        """剩余调频，Hz"""
+        return residual_fm(self.offsets, self.noise, ranges)
@@ -0,0 +1,315 @@
+"""
+SCPI会话记录与回放：记录会话上的每条命令、响应与时间戳到紧凑的追加式二进制文件，
+回放会话按记录的(或加速的)节奏返回记录的响应，无需仪器即可离线复现、分析生产测试序列
+
+文件格式：8字节文件头，之后为连续的记录，每条记录为
+类型(1字节) + 相对会话开始的时间(float64秒) + 数据长度(uint32) + 数据，均为小端；
+'H'记录开始一段会话，数据为JSON(地址、仪器标识、开始时间)，同一文件可追加多段会话
+"""
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+from urllib.parse import parse_qsl
+
+from pyinsts.common.lazy import lazy_import
+
+pyvisa = lazy_import('pyvisa')
+
+MAGIC = b'PYSCPI\x00\x01'
+_RECORD = struct.Struct('<cdI')
+
+HEADER = b'H'  # 会话开始，JSON
+WRITE = b'W'  # 写入的命令
+READ = b'R'  # 读取的响应
+STB = b'S'  # 状态字节
+EVENT = b'E'  # 等待事件，b'1'为超时
+CLEAR = b'C'  # 设备清除
+ERROR = b'X'  # 上一操作抛出的VISA错误码
+
+
+@dataclass(frozen=True)
+class Record:
+    """一条会话记录"""
+    kind: bytes
+    time: float
+    data: bytes
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """按顺序读取记录文件中的全部记录，文件末尾不完整的记录(记录中断)忽略"""
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"不是SCPI会话记录文件: {path}")
+        while True:
+            head = file.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            kind, timestamp, length = _RECORD.unpack(head)
+            data = file.read(length)
+            if len(data) < length:
+                return
+            yield Record(kind, timestamp, data)
+
+
+def read_sessions(path: str) -> List[List[Record]]:
+    """按会话分组读取记录，每组以'H'记录开头"""
+    sessions = []
+    for record in read_records(path):
+        if record.kind == HEADER or not sessions:
+            sessions.append([])
+        sessions[-1].append(record)
+    return sessions
+
+
+class SessionRecorder:
+    """包装VISA会话，将每次读写以追加方式记录到文件，接口与被包装的会话一致
+
+    example:
+        fswp.record('lot42.scpi')
+        ...
+        fswp.stop_recording()
+    """
+
+    def __init__(self, resource, path: str, **header):
+        """
+        Args:
+            resource: 被包装的VISA会话
+            path: 记录文件路径，已存在时追加一段新会话
+            header: 写入会话头的信息，例如address、idn
+        """
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        file = open(path, 'ab')
+        if new:
+            file.write(MAGIC)
+        object.__setattr__(self, 'resource', resource)
+        object.__setattr__(self, 'path', path)
+        object.__setattr__(self, '_file', file)
+        object.__setattr__(self, '_lock', threading.Lock())
+        object.__setattr__(self, '_start', time.perf_counter())
+        header.setdefault('started', time.time())
+        self._record(HEADER, json.dumps(header, ensure_ascii=False).encode('utf-8'))
+
+    def __getattr__(self, name):
+        return getattr(self.resource, name)
+
+    def __setattr__(self, name, value):
+        # timeout、read_termination等会话属性设置到被包装的会话上
+        setattr(self.resource, name, value)
+
+    def _record(self, kind: bytes, data: bytes) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(_RECORD.pack(kind, time.perf_counter() - self._start, len(data)))
+            self._file.write(data)
+
+    def _call(self, kind: bytes, func, *args, encode=bytes, payload: bytes = b'', **kwargs):
+        try:
+            result = func(*args, **kwargs)
+        except pyvisa.VisaIOError as e:
+            self._record(kind, payload)
+            self._record(ERROR, str(int(e.error_code)).encode())
+            raise
+        self._record(kind, encode(result))
+        return result
+
+    # ---- 传输 ----
+    def write(self, message: str, *args, **kwargs) -> int:
+        data = message.encode('utf-8')
+        return self._call(WRITE, self.resource.write, message, *args, encode=lambda _: data, payload=data, **kwargs)
+
+    def write_raw(self, message: bytes) -> int:
+        data = bytes(message)
+        return self._call(WRITE, self.resource.write_raw, message, encode=lambda _: data, payload=data)
+
+    def query(self, message: str, delay: Optional[float] = None) -> str:
+        self.write(message)
+        if delay:
+            time.sleep(delay)
+        return self.read()
+
+    def read(self, *args, **kwargs) -> str:
+        return self._call(READ, self.resource.read, *args, encode=lambda text: text.encode('utf-8'), **kwargs)
+
+    def read_raw(self, *args, **kwargs) -> bytes:
+        return self._call(READ, self.resource.read_raw, *args, **kwargs)
+
+    def read_bytes(self, *args, **kwargs) -> bytes:
+        return self._call(READ, self.resource.read_bytes, *args, **kwargs)
+
+    def clear(self) -> None:
+        self._call(CLEAR, self.resource.clear, encode=lambda _: b'')
+
+    # ---- 状态与事件 ----
+    def read_stb(self) -> int:
+        return self._call(STB, self.resource.read_stb, encode=lambda stb: str(int(stb)).encode())
+
+    def wait_on_event(self, *args, **kwargs):
+        return self._call(EVENT, self.resource.wait_on_event, *args,
+                          encode=lambda event: b'1' if event.timed_out else b'0', **kwargs)
+
+    def flush(self) -> None:
+        """将已记录的内容写入文件"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def detach(self):
+        """停止记录并关闭记录文件，返回被包装的会话"""
+        with self._lock:
+            self._file.close()
+        return self.resource
+
+
+@dataclass
+class _Event:
+    """wait_on_event的回放结果"""
+    timed_out: bool
+
+
+class ReplayResource:
+    """按记录文件回放的会话，接口与pyvisa.resources.MessageBasedResource一致
+
+    写入的命令与记录不一致时按strict抛出ValueError或只记录警告；
+    记录开始前由会话池发送的*CLS、*IDN?在记录中不存在时直接应答
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, session: int = 0, strict: bool = True):
+        """
+        Args:
+            path: 记录文件路径
+            speed: 回放速度倍数，1为按记录节奏，10为10倍速，0为不等待
+            session: 文件中第几段会话
+            strict: 写入命令与记录不一致时是否抛出异常
+        """
+        sessions = read_sessions(path)
+        if not 0 <= session < len(sessions):
+            raise ValueError(f"记录文件 {path} 只有{len(sessions)}段会话")
+        records = sessions[session]
+        has_header = records[0].kind == HEADER
+        self.header = json.loads(records[0].data) if has_header else {}
+        self.resource_name = f'replay://{path}'
+        self.timeout = 2000
+        self.read_termination = '\n'
+        self.write_termination = '\n'
+        self.chunk_size = 20 * 1024
+        self.speed = speed
+        self.strict = strict
+        self._records = records[1:] if has_header else records
+        self._position = 0
+        self._start = time.perf_counter()
+        self._idn_pending = False
+        self._buffer = b''
+
+    @property
+    def remaining(self) -> int:
+        """尚未回放的记录数"""
+        return len(self._records) - self._position
+
+    def _peek(self) -> Optional[Record]:
+        return self._records[self._position] if self._position < len(self._records) else None
+
+    def _next(self, kind: bytes) -> Record:
+        record = self._peek()
+        if record is None:
+            raise ValueError(f"回放记录已结束，无法回放 {kind.decode()} 操作")
+        if record.kind != kind:
+            raise ValueError(f"回放记录第{self._position}条为 {record.kind.decode()}，"
+                             f"实际操作为 {kind.decode()}")
+        self._position += 1
+        if self.speed > 0:
+            delay = self._start + record.time / self.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        following = self._peek()
+        if following is not None and following.kind == ERROR:
+            self._position += 1
+            raise pyvisa.VisaIOError(int(following.data))
+        return record
+
+    # ---- 传输 ----
+    def write(self, message: str, *args, **kwargs) -> int:
+        record = self._peek()
+        expected = record.data.decode('utf-8') if record is not None and record.kind == WRITE else None
+        if expected != message and message.strip() in ('*CLS', '*IDN?'):
+            # 会话池打开会话时发送，记录从连接之后开始时不包含
+            self._idn_pending = message.strip() == '*IDN?'
+            return len(message)
+        self._next(WRITE)
+        if expected != message:
+            text = f"回放命令不一致: 记录为 {expected!r}，实际为 {message!r}"
+            if self.strict:
+                raise ValueError(text)
+            logging.warning(text)
+        return len(message)
+
+    def write_raw(self, message: bytes) -> int:
+        return self.write(message.decode('utf-8'))
+
+    def query(self, message: str, delay: Optional[float] = None) -> str:
+        self.write(message)
+        return self.read()
+
+    def read(self, *args, **kwargs) -> str:
+        if self._idn_pending:
+            self._idn_pending = False
+            return self.header.get('idn', '')
+        return self._next(READ).data.decode('utf-8')
+
+    def read_raw(self, size: Optional[int] = None) -> bytes:
+        if self._buffer:
+            data, self._buffer = self._buffer, b''
+            return data
+        return self._next(READ).data
+
+    def read_bytes(self, count: int, chunk_size: Optional[int] = None,
+                   break_on_termchar: bool = False) -> bytes:
+        # 记录与回放的分块方式不同时，按字节数从连续的读取记录中取出
+        while len(self._buffer) < count:
+            self._buffer += self._next(READ).data
+        data, self._buffer = self._buffer[:count], self._buffer[count:]
+        return data
+
+    def clear(self) -> None:
+        self._buffer = b''
+        self._next(CLEAR)
+
+    def close(self) -> None:
+        pass
+
+    # ---- 状态与事件 ----
+    def read_stb(self) -> int:
+        return int(self._next(STB).data)
+
+    def enable_event(self, event_type, mechanism, context=None) -> None:
+        pass
+
+    def disable_event(self, event_type, mechanism) -> None:
+        pass
+
+    def discard_events(self, event_type, mechanism) -> None:
+        pass
+
+    def wait_on_event(self, in_event_type, timeout: int, capture_timeout: bool = False) -> _Event:
+        timed_out = self._next(EVENT).data == b'1'
+        if timed_out and not capture_timeout:
+            raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+        return _Event(timed_out)
+
+
+def open_replay(address: str) -> ReplayResource:
+    """按 ``replay://<记录文件>?参数`` 打开回放会话
+
+    example:
+        open_replay('replay://lot42.scpi')
+        open_replay('replay://D:/logs/lot42.scpi?speed=10&session=1&strict=0')
+    """
+    path, _, query = address[len('replay://'):].partition('?')
+    options = dict(parse_qsl(query))
+    return ReplayResource(path, speed=float(options.get('speed', 1.0)), session=int(options.get('session', 0)),
+                          strict=options.get('strict', '1').lower() not in ('0', 'false', 'no'))
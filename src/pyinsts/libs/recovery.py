@@ -0,0 +1,76 @@
+"""
+连接恢复：可重试VISA错误分类与带抖动的指数退避
+"""
+import random
+from typing import Iterator
+
+from pyinsts.common.lazy import lazy_import
+
+pyvisa = lazy_import('pyvisa')
+
+# 会话已断开，重新连接后可恢复
+_DISCONNECTED = ('error_connection_lost', 'error_io', 'error_invalid_object', 'error_closing_failed',
+                 'error_system_error')
+# 仪器暂不可用(重启中、被其他会话锁定)，只在建立连接时重试
+_UNAVAILABLE = ('error_timeout', 'error_resource_busy', 'error_resource_locked', 'error_resource_not_found')
+
+
+def _status_codes(names) -> set:
+    codes = pyvisa.constants.StatusCode
+    return {getattr(codes, name) for name in names if hasattr(codes, name)}
+
+
+def is_retryable(error: BaseException, connecting: bool = False) -> bool:
+    """判断错误是否可通过重新连接恢复
+
+    读写过程中只有会话断开类错误可重试；超时可能是仪器仍在执行，重发命令会打乱响应顺序，不重试
+
+    Args:
+        error: 捕获的异常
+        connecting: 是否为建立连接阶段，此时仪器忙、被锁定、未找到与超时也可重试
+    """
+    if isinstance(error, pyvisa.VisaIOError):
+        names = _DISCONNECTED + (_UNAVAILABLE if connecting else ())
+        return error.error_code in _status_codes(names)
+    if isinstance(error, ConnectionError):
+        return True
+    if connecting:
+        return isinstance(error, (pyvisa.VisaTypeError, TimeoutError, OSError))
+    return False
+
+
+class Backoff:
+    """带抖动的指数退避
+
+    第n次重试前等待 min(initial * factor**n, maximum) * U(1 - jitter, 1) 秒，
+    抖动避免多台仪器同时断开后同步重连
+
+    example:
+        for delay in Backoff().delays():
+            try:
+                return connect()
+            except VisaIOError:
+                time.sleep(delay)
+    """
+
+    def __init__(self, initial: float = 0.005, factor: float = 2.0, maximum: float = 2.0,
+                 jitter: float = 0.5, attempts: int = 8):
+        """
+        Args:
+            initial: 首次重试等待时间(秒)
+            factor: 每次重试等待时间的倍数
+            maximum: 单次等待时间上限(秒)
+            jitter: 抖动比例，0~1
+            attempts: 最多尝试次数(含第一次)
+        """
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.jitter = jitter
+        self.attempts = attempts
+
+    def delays(self) -> Iterator[float]:
+        """产出各次尝试失败后的等待时间，共attempts - 1个"""
+        for attempt in range(self.attempts - 1):
+            delay = min(self.initial * self.factor ** attempt, self.maximum)
+            yield delay * random.uniform(1 - self.jitter, 1)
@@ -34,42 +34,94 @@ SOFTWARE.
 """
 
 import logging
-import pyvisa
 import time
+from dataclasses import dataclass
 
+import numpy as np
+
+from pyinsts.common.lazy import lazy_import
+from pyinsts.libs.baseinstrument import BaseInstrument
+from pyinsts.libs.file_writer import BackgroundWriter, get_background_writer
+from pyinsts.libs.markers import marker_table
+from pyinsts.libs.phase_noise import PhaseNoiseTrace
+
+pyvisa = lazy_import('pyvisa')
+
+
+@dataclass(frozen=True)
+class VcoCharResult:
+    """
+    一次扫描的VCO特性测量结果，TRAC1~TRAC4各读取一次，
+    各列均为交织迹线上步进为2的numpy视图
+    """
+    trace1: np.ndarray  # vt, freq(Hz)
+    trace2: np.ndarray  # vt, power(dBm)
+    trace3: np.ndarray  # vt, 调谐灵敏度(Hz/V)
+    trace4: np.ndarray  # vt, icc
+
+    @property
+    def vt(self):
+        return self.trace1[0::2]
+
+    @property
+    def freq(self):
+        """频率,GHz"""
+        return self.trace1[1::2] / 1e9
+
+    @property
+    def power(self):
+        return self.trace2[1::2]
+
+    @property
+    def sen(self):
+        """调谐灵敏度,MHz/V"""
+        return self.trace3[1::2] / 1e6
+
+    @property
+    def icc(self):
+        return self.trace4[1::2] / 1e6
 
 
 # 定义Fswp类，连接Fswp信号源分析仪
-class Fswp:
-    def __init__(self, instrument_address):
+class Fswp(BaseInstrument):
+    def __init__(self, instrument_address=None, config_path="config.yaml", model="FSWP"):
         """
         设置Fswp仪器地址，连接Fswp信号源分析仪
         :param instrument_address:写入仪器地址，例如："USB0::0x0957::0x0E09::MY47402409::0::INSTR"
+        :param config_path: 配置文件路径，未给出地址时从中读取
+        :param model: 仪器型号
         """
-        self.instrument_address = instrument_address
-        self.rm = pyvisa.ResourceManager()
-        self.Fswp = self.rm.open_resource(self.instrument_address)
-        time.sleep(0.01)
-        response = self.Fswp.query("*IDN?")
-        response = response.replace("\n", "").replace("\r", "")  # 删除字符串中的换行符和回车符
-        logging.info(f'Instrument identification:{response}')
+        super().__init__(address=instrument_address, config_path=config_path, model=model)
+        self.instrument_address = self.address
         logging.info('FSWP连接成功')
 
+    @property
+    def Fswp(self):
+        """
+        兼容旧代码的VISA会话别名
+        :return:
+        """
+        return self.instrument
+
     def run_cont(self):
         """
         cont运行
         :return:
         """
-        self.Fswp.write('INIT:CONT OFF')
-        self.Fswp.write('INIT:CONT ON')
+        self.invalidate_traces()
+        self.write('INIT:CONT OFF')
+        self.write('INIT:CONT ON')
 
-    def run_single(self):
+    def run_single(self, timeout=60):
         """
-        RUN SINGLE
-        :return:
+        RUN SINGLE，立即返回，仪器通过SRQ通知扫描完成
+        :param timeout: 等待扫描完成的超时时间(秒)
+        :return: Completion句柄，handle.wait()等待完成
         """
-        self.Fswp.write('INIT:CONT OFF')
-        self.Fswp.write('INIT:IMM')
+        self.invalidate_traces()
+        with self.batch():
+            self.write('INIT:CONT OFF', shadow=True)
+            return self.start('INIT:IMM', timeout)
 
     def set_run_single1(self):
         """
@@ -77,12 +129,13 @@ class Fswp:
         RUN SINGLE
         :return:
         """
-        self.Fswp.write('INIT:CONT OFF')
-        self.Fswp.write('INIT:IMM')
+        self.invalidate_traces()
+        self.write('INIT:CONT OFF')
+        self.write('INIT:IMM')
         #
         star_time = time.time()
         while True:
-            opc = self.Fswp.query("*OPC?")
+            opc = self.query("*OPC?")
             if opc.strip() == '1':
                 logging.info('run single运行完成')
                 break
@@ -95,36 +148,13 @@ class Fswp:
         设置仪器为单次运行模式，并等待运行完成，同时记录运行时间。
         """
         try:
-            # 设置 PyVISA 的超时时间为 10 秒
-            self.Fswp.timeout = 10000  # 单位为毫秒，10 秒
-
-            # 记录开始时间
-            start_time = time.time()
-
-            # 发送 SCPI 指令：关闭连续运行，启动单次运行
-            self.Fswp.write('INIT:CONT OFF')
-            self.Fswp.write('INIT:IMM')
-
-            # 轮询 OPC 状态
-            while True:
-                opc = self.Fswp.query("*OPC?")
-                if opc.strip() == '1':  # 操作完成
-                    logging.info('run single 运行完成')
-                    break
-
-                # 检查是否超时（超时时间为 60 秒）
-                if time.time() - start_time > 60:
-                    logging.error('运行超时')
-                    break
-
-                # 每 1 秒检查一次
-                time.sleep(0.5)
-
-            # 记录结束时间并计算运行时间
-            end_time = time.time()
-            elapsed_time = end_time - start_time  # 运行时间，单位为秒
+            # 发送 SCPI 指令：关闭连续运行，启动单次运行，等待SRQ完成通知（超时时间为 60 秒）
+            elapsed_time = self.run_single(timeout=60).wait()
+            logging.info('run single 运行完成')
             logging.info(f'运行时间: {elapsed_time:.2f} 秒')
 
+        except TimeoutError:
+            logging.error('运行超时')
         except pyvisa.errors.VisaIOError as e:
             logging.error(f"VisaIOError: {e}")
         except Exception as e:
@@ -136,7 +166,7 @@ class Fswp:
         :param freq:
         :return:
         """
-        self.Fswp.write(f'FREQ:CENT {freq}GHz')
+        self.write(f'FREQ:CENT {freq}GHz', shadow=True)
         time.sleep(0.001)
 
     def set_window(self, window):
@@ -145,7 +175,8 @@ class Fswp:
         :param window:
         :return:
         """
-        self.Fswp.write(f'INST "{window}"')
+        self.invalidate_traces()
+        self.write(f'INST "{window}"', shadow=True)
 
     def set_marker_x(self, x, offset):
         """
@@ -155,9 +186,9 @@ class Fswp:
         :param offset:1K,10K,100K,1M,10M,20M,100M
         :return:
         """
-        marker_on = self.Fswp.write(f'CALC:MARK{x} ON')  # 打开marker
-        self.Fswp.write(f'DISP:MTAB ON')  # 显示marker表
-        self.Fswp.write(f'CALC:MARK{x}:X {offset}Hz')
+        self.write(f'CALC:MARK{x} ON')  # 打开marker
+        self.write(f'DISP:MTAB ON')  # 显示marker表
+        self.write(f'CALC:MARK{x}:X {offset}Hz')
         time.sleep(0.01)
 
     def query_marker_x(self, x):
@@ -166,15 +197,53 @@ class Fswp:
         :param x: 1,2,3,4,5,6,7
         :return:
         """
-        marker_value = self.Fswp.query(f'CALC:MARK{x}:Y?')
+        marker_value = self.query(f'CALC:MARK{x}:Y?')
         return marker_value
 
+    def set_markers(self, offsets, start=1):
+        """
+        一次传输打开并放置多个marker
+        :param offsets: 各marker的偏移频率(Hz)，例如[1e3, 1e4, 1e5, 1e6, 1e7]
+        :param start: 第一个marker的编号
+        :return:
+        """
+        with self.batch():
+            self.write('DISP:MTAB ON', shadow=True)  # 显示marker表
+            for number, offset in enumerate(offsets, start):
+                self.write(f'CALC:MARK{number} ON')
+                self.write(f'CALC:MARK{number}:X {offset}Hz')
+
+    def query_markers(self, markers=(1,), offsets=None):
+        """
+        以一次复合查询读取多个marker的X、Y与状态
+        :param markers: marker编号，例如range(1, 8)
+        :param offsets: 给出时先打开各marker并放置到这些偏移频率(Hz)，与读取合并为同一次传输
+        :return: 结构化数组，字段为 marker, x(偏移Hz), y(dBc/Hz), mode(POS/OFF)
+        """
+        markers = list(markers)
+        commands = []
+        if offsets is not None:
+            for number, offset in zip(markers, offsets):
+                commands += [f'CALC:MARK{number} ON', f'CALC:MARK{number}:X {offset}Hz']
+        for number in markers:
+            commands += [f'CALC:MARK{number}?', f'CALC:MARK{number}:X?', f'CALC:MARK{number}:Y?']
+        responses = self.query_many(commands)
+        return marker_table(markers, responses[1::3], responses[2::3], responses[0::3])
+
+    def query_spot_noise(self, offsets):
+        """
+        读取各偏移频率处的点噪声，marker放置与读取在同一次传输内完成
+        :param offsets: 偏移频率(Hz)，例如[1e3, 1e4, 1e5, 1e6, 1e7, 2e7, 1e8]
+        :return: marker表，y为各偏移处的相位噪声(dBc/Hz)
+        """
+        return self.query_markers(range(1, len(offsets) + 1), offsets)
+
     def query_rms(self):
         """
         读取积分抖动rms,fs
         :return:
         """
-        jitter_value = float(self.Fswp.query('FETC:RANG2:PNO2:RMS?')) * 1e15
+        jitter_value = float(self.query('FETC:RANG2:PNO2:RMS?')) * 1e15
         print('jitter时间：', jitter_value)
         return jitter_value
 
@@ -184,9 +253,9 @@ class Fswp:
         :param filename: 文件名需包含路径，'Z:\\DATA\\186_5514\\186_5514_SIOA201P8_GND_REF300_12000_+35'
         :return:
         """
-        self.Fswp.write(f'MMEM:STOR1:TRAC 1,"{filename}.csv"')
-        self.Fswp.write(f'MMEM:NAME "{filename}.png"')
-        self.Fswp.write('HCOP:IMM')
+        self.write(f'MMEM:STOR1:TRAC 1,"{filename}.csv"')
+        self.write(f'MMEM:NAME "{filename}.png"')
+        self.write('HCOP:IMM')
         logging.info('save_csv_png 运行完成')
 
     def save_png(self, filename):
@@ -195,10 +264,49 @@ class Fswp:
         :param filename: 文件名需包含路径，'Z:\\DATA\\186_5514\\186_5514_SIOA201P8_GND_REF300_12000_+35'
         :return:
         """
-        self.Fswp.write(f'MMEM:NAME "{filename}.png"')
-        self.Fswp.write('HCOP:IMM')
+        self.write(f'MMEM:NAME "{filename}.png"')
+        self.write('HCOP:IMM')
         logging.info('save_png 运行完成')
 
+    def fetch_screenshot(self, temp_file=r'C:\R_S\Instr\user\pyinsts_screen.png'):
+        """
+        截图并经总线读取PNG数据，不在本地保存
+        :param temp_file: 仪器上的临时文件
+        :return: PNG文件内容
+        """
+        with self.batch():
+            self.write('HCOP:DEV:LANG PNG', shadow=True)
+            self.write(f'MMEM:NAME "{temp_file}"')
+            self.write('HCOP:IMM;*WAI')
+        data = self.query_block(f'MMEM:DATA? "{temp_file}"')
+        self.write(f'MMEM:DEL "{temp_file}"')
+        return data
+
+    def save_csv_png_local(self, filename, window=1, trace=1, writer: BackgroundWriter = None):
+        """
+        截图与迹线经总线读回，由后台线程保存到本地 {filename}.png 与 {filename}.csv，立即返回
+        :param filename: 本地文件路径，不含扩展名
+        :param window: 迹线所在窗口
+        :param trace: 迹线编号
+        :param writer: 后台写入线程，默认使用进程内共享的写入线程
+        :return: (png写入Future, csv写入Future)
+        """
+        writer = writer or get_background_writer()
+        x, y = self.query_trace_pairs(window, trace)
+        csv = writer.write_csv(f'{filename}.csv', (x, y), header='x,y')
+        png = writer.write_bytes(f'{filename}.png', self.fetch_screenshot())
+        return png, csv
+
+    def save_png_local(self, filename, writer: BackgroundWriter = None):
+        """
+        截图经总线读回，由后台线程保存到本地 {filename}.png，立即返回
+        :param filename: 本地文件路径，不含扩展名
+        :param writer: 后台写入线程，默认使用进程内共享的写入线程
+        :return: 写入Future
+        """
+        writer = writer or get_background_writer()
+        return writer.write_bytes(f'{filename}.png', self.fetch_screenshot())
+
     def set_dc_power(self, on_off):
         """
         设置DC POWER
@@ -206,7 +314,7 @@ class Fswp:
         :return:
         """
 
-        self.Fswp.write(f'SOUR:VOLT {on_off}')
+        self.write(f'SOUR:VOLT {on_off}', shadow=True)
 
     def set_dc_supply_volt(self, volt):
         """
@@ -215,21 +323,21 @@ class Fswp:
         :return:
         """
 
-        self.Fswp.write(f'SOUR:VOLT:POW:LEV:AMPL {volt}')
+        self.write(f'SOUR:VOLT:POW:LEV:AMPL {volt}', shadow=True)
 
     def set_dc_power_on(self):
         """
         设置DC POWER ON
         :return:
         """
-        self.Fswp.write(f'SOUR:VOLT ON')
+        self.write(f'SOUR:VOLT ON', shadow=True)
 
     def set_dc_power_off(self):
         """
         设置DC POWER off
         :return:
         """
-        self.Fswp.write(f'SOUR:VOLT OFF')
+        self.write(f'SOUR:VOLT OFF', shadow=True)
 
     def set_vtune(self, vt):
         """
@@ -237,7 +345,7 @@ class Fswp:
         :param vt:
         :return:
         """
-        self.Fswp.write(f'SOUR:VOLT:CONT:LEV:AMPL {vt}')
+        self.write(f'SOUR:VOLT:CONT:LEV:AMPL {vt}', shadow=True)
 
     def set_auto_search_off(self):
         """
@@ -245,24 +353,22 @@ class Fswp:
         :return:
         """
 
-        self.Fswp.write(f'SENS:ADJ:CONF:FREQ:AUT:STAT OFF')
+        self.write(f'SENS:ADJ:CONF:FREQ:AUT:STAT OFF', shadow=True)
 
     def query_freq_cent(self):
         """
         查询频率
         :return:
         """
-        freq = float(self.Fswp.query(f'FREQ:CENT?')) / 1e9
+        freq = float(self.query(f'FREQ:CENT?')) / 1e9
         return freq
 
     def query_singal_power(self):
-        power = float(self.Fswp.query(f'POW:RLEV?'))
+        power = float(self.query(f'POW:RLEV?'))
         return power
 
     def close(self):
-        self.Fswp.close()
-        # self.rm.close()
-        # print('关闭Fswp连接')
+        super().close()
         logging.info('关闭Fswp连接')
 
     def set_select_pn(self):
@@ -270,66 +376,68 @@ class Fswp:
         选择相噪模式窗口
         :return:
         """
-        self.Fswp.write('INST PNO')
+        self.invalidate_traces()
+        self.write('INST PNO', shadow=True)
 
     def set_select_sp(self):
         """
         选择频谱模式窗口
         :return:
         """
-        self.Fswp.write('INST SAN')
+        self.invalidate_traces()
+        self.write('INST SAN', shadow=True)
 
     def set_peak_search(self):
-        self.Fswp.write('CALC:MARK:MAX')
+        self.write('CALC:MARK:MAX')
 
     def set_mark_delt(self):
-        self.Fswp.write('CALC:DELT ON')
+        self.write('CALC:DELT ON')
 
     def set_mark_delt_freq(self, x, freq):
-        self.Fswp.write(f'CALC:DELT{x}:X {freq}MHz')
+        self.write(f'CALC:DELT{x}:X {freq}MHz')
 
     def query_mark_delt_x(self, x):
         """
         读取偏移频率
         :return:
         """
-        value = self.Fswp.query(f'CALC:DELT{x}:X:REL?')
+        value = self.query(f'CALC:DELT{x}:X:REL?')
         return value
 
     def query_mark_delt_y(self, y):
-        value = float(self.Fswp.query(f'CALC:DELT{y}:Y?'))
+        value = float(self.query(f'CALC:DELT{y}:Y?'))
         return value
 
     def set_continuous_peak(self):
-        self.Fswp.write('CALC:MARK:MAX:AUTO ON')
+        self.write('CALC:MARK:MAX:AUTO ON')
 
     def set_mark_all_off(self):
         """
         关闭所有mark
         :return:
         """
-        self.Fswp.write('CALC:MARK:AOFF')
+        self.write('CALC:MARK:AOFF')
 
     def set_freq_span(self, span):
         """
         sp模式设置span,MHz
         :return:
         """
-        self.Fswp.write(f'SENS:FREQ:SPAN {span}MHz')
+        self.write(f'SENS:FREQ:SPAN {span}MHz', shadow=True)
 
     def set_bw(self, bw):
-        self.Fswp.write(f'SENS:BAND:RES {bw}Hz')
+        self.write(f'SENS:BAND:RES {bw}Hz', shadow=True)
 
     def set_mark_on(self, x):
-        self.Fswp.write(f'CALC:MARK{x}:STAT ON')
+        self.write(f'CALC:MARK{x}:STAT ON')
         time.sleep(0.01)
 
     def set_mark_del_on(self, x):
-        self.Fswp.write(f'CALC:DELT{x}:STAT ON')
+        self.write(f'CALC:DELT{x}:STAT ON')
         time.sleep(0.01)
 
     def set_disp_rlev(self, value):
-        self.Fswp.write(f'DISP:WIND:TRAC:Y:SCAL:RLEV {value}')
+        self.write(f'DISP:WIND:TRAC:Y:SCAL:RLEV {value}', shadow=True)
 
     def set_signal_source_freq(self, freq):
         """
@@ -337,75 +445,110 @@ class Fswp:
         :param freq:
         :return:
         """
-        self.Fswp.write(f'SOUR:GEN:FREQ {freq}MHz')
+        self.write(f'SOUR:GEN:FREQ {freq}MHz', shadow=True)
 
     def set_signal_source_pow(self, power):
         """
         设置源功率，dBm
         :return:
         """
-        self.Fswp.write(f'SOUR:GEN:LEV {power}')
+        self.write(f'SOUR:GEN:LEV {power}', shadow=True)
 
     def set_signal_source_on(self, on_off):
         """
         设置源功率开关,ON,OFF
         :return:
         """
-        self.Fswp.write(f'SOUR:GEN:STAT {on_off}')
+        self.write(f'SOUR:GEN:STAT {on_off}', shadow=True)
+
+    def query_trace(self, window, trace=1, refresh=False):
+        """
+        以二进制块读取交织迹线，频率值需要双精度，固定使用REAL,64
+        单次扫描模式下同一次扫描内只读取一次，发送任何设置或触发命令后重新读取；连续扫描时每次都重新读取
+        :param window: 窗口号，TRAC1~TRAC4
+        :param trace: 迹线号
+        :param refresh: 忽略缓存重新读取
+        :return: 交织的numpy数组
+        """
+        key = (window, trace)
+        data = None if refresh else self._trace_cache.get(key)
+        if data is None:
+            data = self.fetch_trace(f"TRAC{window}? TRACE{trace}", bits=64)
+            if self._continuous is False:
+                self._trace_cache[key] = data
+        return data
+
+    def query_trace_pairs(self, window, trace=1):
+        """
+        读取交织的(x, y)迹线
+        :param window: 窗口号，TRAC1~TRAC4
+        :param trace: 迹线号
+        :return: x, y 两个numpy视图
+        """
+        data = self.query_trace(window, trace)
+        return data[0::2], data[1::2]
+
+    def fetch_phase_noise(self, trace=1, window=1, refresh=False):
+        """
+        读取一次相位噪声迹线，积分抖动、剩余调频与点噪声在主机侧按任意区间计算，无需重新配置仪器
+        :param trace: 迹线号，给出序列时多条迹线堆叠为二维数组
+        :param window: 相位噪声结果窗口号
+        :param refresh: 忽略缓存重新读取
+        :return: PhaseNoiseTrace，例如 fetch_phase_noise().jitter([(1e3, 1e7), (1e4, 1e8)])
+        """
+        traces = [trace] if np.isscalar(trace) else list(trace)
+        offsets = self.query_trace(window, traces[0], refresh)[0::2]
+        noise = np.stack([self.query_trace(window, number, refresh)[1::2] for number in traces])
+        carrier = float(self.query('FREQ:CENT?'))
+        return PhaseNoiseTrace(offsets, noise[0] if np.isscalar(trace) else noise, carrier)
+
+    def fetch_vcochar(self, refresh=False):
+        """
+        读取VCO特性全部迹线TRAC1~TRAC4，结果缓存到下一次run single
+        :param refresh: 忽略缓存重新读取
+        :return: VcoCharResult
+        """
+        return VcoCharResult(*(self.query_trace(window, refresh=refresh) for window in range(1, 5)))
 
     def query_vcochar_freq(self):
         """
         读取trac1,freq
         :return:
         """
-        freq_value = self.Fswp.query("TRAC1? TRACE1")
-        freq_value = freq_value.split(',')
-        freq_value = [freq_value[i] for i in range(1, len(freq_value), 2)]  # 第一个值为vt电压，第二个值为freq，步进为2
-        freq_value = [float(item) / 1e9 for item in freq_value]
-        return freq_value
+        _, freq = self.query_trace_pairs(1)  # 第一个值为vt电压，第二个值为freq，步进为2
+        return (freq / 1e9).tolist()
 
     def query_vcochar_power(self):
         """
         读取trac2,功率
-        :return:
+        :return: 浮点数列表（v0.0.3.3之前返回字符串列表）
         """
-        power = self.Fswp.query("TRAC2? TRACE1")
-        power = power.split(',')
-        power = [power[i] for i in range(1, len(power), 2)]
-        return power
+        _, power = self.query_trace_pairs(2)
+        return power.tolist()
 
     def query_vcochar_sen(self):
         """
         读取trac3,调谐灵敏度
         :return:
         """
-        sen = self.Fswp.query(f"TRAC3? TRACE1")
-        sen = sen.split(',')
-        sen = [sen[i] for i in range(1, len(sen), 2)]
-        sen = [float(item) / 1e6 for item in sen]
-        return sen
+        _, sen = self.query_trace_pairs(3)
+        return (sen / 1e6).tolist()
 
     def query_vcochar_vt(self):
         """
         读取trac1
-        :return:
+        :return: 浮点数列表（v0.0.3.3之前返回字符串列表）
         """
-        vt = self.Fswp.query("TRAC1? TRACE1")
-        vt = vt.split(',')
-        vt = [vt[i] for i in range(0, len(vt), 2)]
-        return vt
+        vt, _ = self.query_trace_pairs(1)
+        return vt.tolist()
 
     def query_vcochar_icc(self):
         """
         读取trac4
         :return:
         """
-        icc = self.Fswp.query(f"TRAC4? TRACE1")
-        icc = icc.split(',')
-        icc = [icc[i] for i in range(1, len(icc), 2)]
-        icc = [float(item) / 1e6 for item in icc]
-        return icc
-
+        _, icc = self.query_trace_pairs(4)
+        return (icc / 1e6).tolist()
 
 class FswpVcoChar(Fswp):
     def __init__(self, instrument_address):
@@ -416,57 +559,39 @@ class FswpVcoChar(Fswp):
         读取trac1
         :return:
         """
-        freq = self.Fswp.query("TRAC1? TRACE1")
-        freq = freq.split(',')
-        freq = [freq[i] for i in range(1, len(freq), 2)]
-        freq = [float(item) / 1e9 for item in freq]
-        return freq
+        return self.query_vcochar_freq()
 
     def query_vt(self):
         """
         读取trac1
-        :return:
+        :return: 浮点数列表（v0.0.3.3之前返回字符串列表）
         """
-        vt = self.Fswp.query("TRAC1? TRACE1")
-        vt = vt.split(',')
-        vt = [vt[i] for i in range(0, len(vt), 2)]
-        return vt
+        return self.query_vcochar_vt()
 
     def query_power(self):
         """
         读取trac2
-        :return:
+        :return: 浮点数列表（v0.0.3.3之前返回字符串列表）
         """
-        power = self.Fswp.query("TRAC2? TRACE1")
-        power = power.split(',')
-        power = [power[i] for i in range(1, len(power), 2)]
-        return power
+        return self.query_vcochar_power()
 
     def query_sen(self):
         """
         读取trac3,调谐灵敏度
         :return:
         """
-        sen = self.Fswp.query(f"TRAC3? TRACE1")
-        sen = sen.split(',')
-        sen = [sen[i] for i in range(1, len(sen), 2)]
-        sen = [float(item) / 1e6 for item in sen]
-        return sen
+        return self.query_vcochar_sen()
 
     def query_icc(self):
         """
         读取trac4
         :return:
         """
-        icc = self.Fswp.query(f"TRAC4? TRACE1")
-        icc = icc.split(',')
-        icc = [icc[i] for i in range(1, len(icc), 2)]
-        icc = [float(item) / 1e6 for item in icc]
-        return icc
+        return self.query_vcochar_icc()
 
     def set_freq_search_range(self, freq_low, freq_high):
-        self.Fswp.write(f"ADJ:CONF:FREQ:LIM:LOW {freq_low}GHz")
-        self.Fswp.write(f"ADJ:CONF:FREQ:LIM:HIGH {freq_high}GHz")
+        self.write(f"ADJ:CONF:FREQ:LIM:LOW {freq_low}GHz", shadow=True)
+        self.write(f"ADJ:CONF:FREQ:LIM:HIGH {freq_high}GHz", shadow=True)
 
 
 class SpotNoiseTune(Fswp):
@@ -474,18 +599,14 @@ class SpotNoiseTune(Fswp):
         super().__init__(instrument_address)
 
     def query_phase(self, trace):
-        phase = self.Fswp.query(f"TRAC1? TRACE{trace}")
-        phase = phase.split(',')
-        phase = [phase[i] for i in range(1, len(phase), 2)]
-        phase[-1] = phase[-1].rstrip("\n")
-        return phase
+        """:return: 浮点数列表（v0.0.3.3之前返回字符串列表）"""
+        _, phase = self.query_trace_pairs(1, trace)
+        return phase.tolist()
 
     def query_phase_vt(self, trace):
-        phase_vt = self.Fswp.query(f"TRAC1? TRACE{trace}")
-        phase_vt = phase_vt.split(',')
-        phase_vt = [phase_vt[i] for i in range(0, len(phase_vt), 2)]
-        return phase_vt
-
+        """:return: 浮点数列表（v0.0.3.3之前返回字符串列表）"""
+        phase_vt, _ = self.query_trace_pairs(1, trace)
+        return phase_vt.tolist()
 
 if __name__ == '__main__':
     addr_fswp = 'TCPIP0::172.16.30.150::inst0::INSTR'
@@ -1,3 +1,3 @@
-from .Fswp import Fswp,FswpVcoChar
+from .Fswp import Fswp,FswpVcoChar,VcoCharResult
 
-__all__ = ['Fswp','FswpVcoChar']
\ No newline at end of file
+__all__ = ['Fswp','FswpVcoChar','VcoCharResult']
\ No newline at end of file
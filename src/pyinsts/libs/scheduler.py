@@ -0,0 +1,222 @@
+"""
+跨仪器重叠调度：以依赖图描述测量步骤，不同仪器的步骤并行执行，
+耗时操作(返回Completion的步骤)等待期间其他仪器继续工作，结束后给出关键路径与各仪器利用率
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pyinsts.libs.baseinstrument import BaseInstrument
+from pyinsts.libs.completion import Completion
+
+HOST = 'host'  # 不访问仪器的步骤(数据处理等)
+
+
+@dataclass
+class Step:
+    """调度步骤
+
+    Args:
+        name: 步骤名称，在调度器内唯一
+        action: 无参函数；返回Completion时等待其完成，结果为查询响应或耗时
+        instrument: 步骤使用的仪器，同一仪器的步骤串行执行；为None时在主机线程池执行
+        after: 依赖的步骤名称
+    """
+    name: str
+    action: Callable[[], Any]
+    instrument: Optional[BaseInstrument] = None
+    after: Sequence[str] = ()
+
+
+@dataclass
+class StepTiming:
+    """步骤执行时间，相对调度开始时刻(秒)"""
+    name: str
+    resource: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class ScheduleReport:
+    """调度结果"""
+    makespan: float
+    timings: Dict[str, StepTiming]
+    critical_path: List[str]
+    critical_time: float
+    utilization: Dict[str, float]
+    results: Dict[str, Any] = field(default_factory=dict)
+
+    def format(self) -> str:
+        """格式化输出各步骤时间线、关键路径与利用率"""
+        lines = [f"总耗时: {self.makespan:.3f}秒, 关键路径耗时: {self.critical_time:.3f}秒",
+                 f"关键路径: {' -> '.join(self.critical_path)}"]
+        for name, utilization in self.utilization.items():
+            lines.append(f"利用率 {name}: {utilization * 100:.1f}%")
+        for timing in sorted(self.timings.values(), key=lambda t: t.start):
+            mark = '*' if timing.name in self.critical_path else ' '
+            lines.append(f"{mark} {timing.name:<24} {timing.resource:<16} "
+                         f"{timing.start:>9.3f} {timing.end:>9.3f} {timing.duration:>9.3f}")
+        return '\n'.join(lines)
+
+
+class Scheduler:
+    """跨仪器重叠调度器
+
+    每台仪器由一个专用线程执行其步骤，不同仪器的步骤在依赖满足后立即并行执行
+
+    example:
+        scheduler = Scheduler()
+        scheduler.add('pn', fswp.run_single, fswp)
+        scheduler.add('spur', lambda: n9020b.query_trace(), n9020b)
+        scheduler.add('jitter', fswp.query_rms, fswp, after=['pn'])
+        scheduler.add('report', lambda: save(scheduler.results), after=['jitter', 'spur'])
+        report = scheduler.run()
+        print(report.format())
+    """
+
+    def __init__(self, host_workers: int = 4):
+        """
+        Args:
+            host_workers: 不访问仪器的步骤使用的线程数
+        """
+        self.host_workers = host_workers
+        self.steps: Dict[str, Step] = {}
+        self.results: Dict[str, Any] = {}
+
+    def add(self, name: str, action: Callable[[], Any], instrument: Optional[BaseInstrument] = None,
+            after: Sequence[str] = ()) -> str:
+        """添加步骤，参数见Step
+
+        Returns:
+            步骤名称，可作为其他步骤的依赖
+        """
+        if name in self.steps:
+            raise ValueError(f"步骤名称重复: {name}")
+        self.steps[name] = Step(name, action, instrument, tuple(after))
+        return name
+
+    def _order(self) -> List[str]:
+        """拓扑排序，检查依赖是否存在及是否有环"""
+        for step in self.steps.values():
+            for dependency in step.after:
+                if dependency not in self.steps:
+                    raise ValueError(f"步骤{step.name}依赖的{dependency}不存在")
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1: 访问中, 2: 已完成
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"步骤依赖存在环: {name}")
+            state[name] = 1
+            for dependency in self.steps[name].after:
+                visit(dependency)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.steps:
+            visit(name)
+        return order
+
+    @staticmethod
+    def _resource(step: Step) -> str:
+        if step.instrument is None:
+            return HOST
+        return f'{step.instrument.model}@{step.instrument.address}'
+
+    def run(self) -> ScheduleReport:
+        """执行全部步骤，任一步骤异常时取消未开始的步骤并抛出该异常"""
+        order = self._order()
+        self.results.clear()
+        executors: Dict[str, ThreadPoolExecutor] = {}
+        for step in self.steps.values():
+            resource = self._resource(step)
+            if resource not in executors:
+                executors[resource] = ThreadPoolExecutor(
+                    max_workers=self.host_workers if resource == HOST else 1,
+                    thread_name_prefix=f'pyinsts-{resource}')
+
+        origin = time.perf_counter()
+        timings: Dict[str, StepTiming] = {}
+        remaining = {name: set(self.steps[name].after) for name in order}
+        running: Dict[Future, str] = {}
+
+        def execute(step: Step) -> Tuple[Any, float, float]:
+            start = time.perf_counter() - origin
+            result = step.action()
+            if isinstance(result, Completion):
+                result = result.result()
+            return result, start, time.perf_counter() - origin
+
+        try:
+            while remaining or running:
+                for name in [name for name in order if name in remaining and not remaining[name]]:
+                    del remaining[name]
+                    step = self.steps[name]
+                    running[executors[self._resource(step)].submit(execute, step)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result, start, end = future.result()
+                    self.results[name] = result
+                    timings[name] = StepTiming(name, self._resource(self.steps[name]), start, end)
+                    for dependencies in remaining.values():
+                        dependencies.discard(name)
+                    logging.debug(f"步骤{name}完成，耗时: {end - start:.3f}秒")
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+
+        makespan = time.perf_counter() - origin
+        critical_path, critical_time = self._critical_path(order, timings)
+        busy: Dict[str, float] = {}
+        for timing in timings.values():
+            busy[timing.resource] = busy.get(timing.resource, 0.0) + timing.duration
+        utilization = {resource: min(total / makespan, 1.0) if makespan else 0.0
+                       for resource, total in busy.items() if resource != HOST}
+        report = ScheduleReport(makespan, timings, critical_path, critical_time, utilization, dict(self.results))
+        logging.info(f"调度完成，总耗时: {makespan:.2f}秒，关键路径: {' -> '.join(critical_path)}")
+        return report
+
+    def _critical_path(self, order: List[str], timings: Dict[str, StepTiming]) -> Tuple[List[str], float]:
+        """按实测耗时计算依赖图中的最长路径
+
+        同一仪器上先后执行的步骤也视为相互依赖，因为它们不能重叠
+        """
+        previous_on_resource: Dict[str, str] = {}
+        predecessors: Dict[str, List[str]] = {}
+        for timing in sorted(timings.values(), key=lambda t: t.start):
+            predecessors[timing.name] = list(self.steps[timing.name].after)
+            if timing.resource != HOST and timing.resource in previous_on_resource:
+                predecessors[timing.name].append(previous_on_resource[timing.resource])
+            previous_on_resource[timing.resource] = timing.name
+
+        length: Dict[str, float] = {}
+        parent: Dict[str, Optional[str]] = {}
+        for name in sorted(timings, key=lambda n: timings[n].start):
+            best = max(predecessors[name], key=lambda n: length[n], default=None)
+            length[name] = timings[name].duration + (length[best] if best else 0.0)
+            parent[name] = best
+        if not length:
+            return [], 0.0
+        name = max(length, key=length.get)
+        total = length[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = parent[name]
+        return path[::-1], total
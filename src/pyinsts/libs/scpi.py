@@ -0,0 +1,76 @@
+"""
+SCPI 通用工具：IEEE 488.2 定长二进制块解析与构造、复合命令拼接、命令模板归一化、数据格式定义
+"""
+import re
+from typing import Iterable, Iterator, Tuple
+
+# FORM REAL 位宽与小端(FORM:BORD SWAP) numpy dtype 的对应关系
+REAL_DTYPES = {
+    32: '<f4',
+    64: '<f8',
+}
+
+
+def parse_block_header(buffer: bytes) -> Tuple[int, int]:
+    """解析IEEE 488.2定长块头 ``#<n><length>``
+
+    Args:
+        buffer: 以 ``#`` 开头的接收缓冲区
+
+    Returns:
+        (数据起始偏移, 数据字节长度)，不定长块(``#0``)返回长度 -1
+    """
+    if buffer[:1] != b'#':
+        raise ValueError(f"无效的二进制块头: {bytes(buffer[:16])!r}")
+    digits = int(buffer[1:2])
+    if digits == 0:
+        return 2, -1
+    return 2 + digits, int(buffer[2:2 + digits])
+
+
+def join_commands(commands: Iterable[str], max_length: int = 1024) -> Iterator[str]:
+    """将多条SCPI命令合并为 ``;:`` 连接的复合命令
+
+    公共命令(``*``开头)使用 ``;`` 连接，单条复合命令不超过 ``max_length``，
+    超出时拆分为多条
+
+    Args:
+        commands: SCPI命令序列
+        max_length: 单条复合命令最大字符数
+
+    Returns:
+        复合命令迭代器
+    """
+    message = ''
+    for command in commands:
+        command = command.strip()
+        if not command:
+            continue
+        separator = ';' if command[0] in '*:' else ';:'
+        if message and len(message) + len(separator) + len(command) > max_length:
+            yield message
+            message = ''
+        message = message + separator + command if message else command
+    if message:
+        yield message
+
+
+_QUOTED = re.compile(r'"[^"]*"|\'[^\']*\'')
+_NUMBER = re.compile(r'(?<![A-Za-z])[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?|(?<=[A-Za-z])\d+')
+
+
+def command_template(command: str) -> str:
+    """将SCPI命令归一化为模板，参数与数字后缀替换为 ``#``，字符串替换为 ``"*"``
+
+    用于按命令类型统计耗时、学习超时时间
+
+    example:
+        command_template('CALC:MARK2:X 1000000Hz')  # 'CALC:MARK#:X #Hz'
+    """
+    return _NUMBER.sub('#', _QUOTED.sub('"*"', command.strip()))
+
+
+def build_block(data: bytes) -> bytes:
+    """构造IEEE 488.2定长二进制块 ``#<n><length><data>``"""
+    length = str(len(data))
+    return b'#' + str(len(length)).encode() + length.encode() + data
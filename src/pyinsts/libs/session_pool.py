@@ -0,0 +1,176 @@
+"""
+进程级共享的 pyvisa.ResourceManager 与按地址复用的VISA会话池
+"""
+import atexit
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from pyinsts.common.lazy import lazy_import
+
+pyvisa = lazy_import('pyvisa')  # 打开会话时才加载
+
+_resource_manager = None
+_rm_lock = threading.Lock()
+
+
+def get_resource_manager() -> 'pyvisa.ResourceManager':
+    """获取进程内共享的ResourceManager，首次调用时创建"""
+    global _resource_manager
+    with _rm_lock:
+        if _resource_manager is None:
+            _resource_manager = pyvisa.ResourceManager()
+        return _resource_manager
+
+
+def close_resource_manager() -> None:
+    """关闭共享的ResourceManager"""
+    global _resource_manager
+    with _rm_lock:
+        if _resource_manager is not None:
+            _resource_manager.close()
+            _resource_manager = None
+
+
+def open_resource(address: str):
+    """按地址打开会话，``sim://`` 地址打开模拟仪器，``replay://`` 地址回放会话记录，其他地址交给VISA"""
+    if address.lower().startswith('sim://'):
+        from pyinsts.libs.sim import open_simulated
+        return open_simulated(address)
+    if address.lower().startswith('replay://'):
+        from pyinsts.libs.recorder import open_replay
+        return open_replay(address)
+    return get_resource_manager().open_resource(address)
+
+
+@dataclass
+class PooledSession:
+    """会话池中的空闲会话"""
+    resource: object
+    idn: str
+    released_at: float = field(default_factory=time.time)
+
+
+class SessionPool:
+    """按仪器地址复用VISA会话
+
+    归还的会话保留仪器标识(*IDN?)，再次获取时无需重新打开、*CLS与*IDN?；
+    空闲超过 health_check_interval 的会话在交出前以 *OPC? 检查是否可用
+    """
+
+    def __init__(self, health_check_interval: float = 30.0, max_idle_per_address: int = 2):
+        """
+        Args:
+            health_check_interval: 空闲会话免检时间(秒)
+            max_idle_per_address: 每个地址最多保留的空闲会话数
+        """
+        self.health_check_interval = health_check_interval
+        self.max_idle_per_address = max_idle_per_address
+        self._idle: Dict[str, List[PooledSession]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, address: str) -> Tuple[object, str]:
+        """获取会话，优先复用空闲会话
+
+        Args:
+            address: 仪器地址
+
+        Returns:
+            (VISA会话, 仪器标识)
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(address)
+                session = idle.pop() if idle else None
+            if session is None:
+                break
+            if time.time() - session.released_at < self.health_check_interval or self._is_alive(session):
+                logging.info(f'复用会话: {address}')
+                return session.resource, session.idn
+            self._discard(session.resource)
+
+        resource = open_resource(address)
+        try:
+            resource.write('*CLS')
+            logging.info('清除仪器寄存器信息')
+            idn = resource.query('*IDN?')
+        except Exception:
+            self._discard(resource)
+            raise
+        return resource, idn
+
+    def release(self, address: str, resource, idn: str) -> None:
+        """归还会话，清除状态寄存器后放入空闲列表；回放会话只能使用一次，直接关闭"""
+        if address.lower().startswith('replay://'):
+            self._discard(resource)
+            return
+        try:
+            resource.write('*CLS')
+        except (pyvisa.VisaIOError, OSError) as e:
+            logging.warning(f'会话归还失败，直接关闭: {address}, {e}')
+            self._discard(resource)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(address, [])
+            if len(idle) < self.max_idle_per_address:
+                idle.append(PooledSession(resource, idn))
+                return
+        self._discard(resource)
+
+    def discard(self, address: str, resource=None) -> None:
+        """丢弃已断开的会话，同时关闭该地址的全部空闲会话(通常也已失效)"""
+        with self._lock:
+            sessions = self._idle.pop(address, [])
+        for session in sessions:
+            self._discard(session.resource)
+        if resource is not None:
+            self._discard(resource)
+
+    def health_check(self) -> int:
+        """立即检查所有空闲会话，关闭不可用的会话
+
+        Returns:
+            被关闭的会话数
+        """
+        with self._lock:
+            sessions = [(address, session) for address, idle in self._idle.items() for session in idle]
+            self._idle.clear()
+        dead = 0
+        for address, session in sessions:
+            if self._is_alive(session):
+                session.released_at = time.time()
+                with self._lock:
+                    self._idle.setdefault(address, []).append(session)
+            else:
+                dead += 1
+                self._discard(session.resource)
+        return dead
+
+    def close_all(self) -> None:
+        """关闭全部空闲会话与共享的ResourceManager"""
+        with self._lock:
+            sessions = [session for idle in self._idle.values() for session in idle]
+            self._idle.clear()
+        for session in sessions:
+            self._discard(session.resource)
+        close_resource_manager()
+
+    @staticmethod
+    def _is_alive(session: PooledSession) -> bool:
+        try:
+            return session.resource.query('*OPC?').strip() == '1'
+        except (pyvisa.VisaIOError, OSError):
+            return False
+
+    @staticmethod
+    def _discard(resource) -> None:
+        try:
+            resource.close()
+        except (pyvisa.VisaIOError, OSError):
+            pass
+
+
+session_pool = SessionPool()
+atexit.register(session_pool.close_all)
@@ -0,0 +1,100 @@
+"""
+仪器设置影子缓存：记录每个设置参数最后一次写入的值，跳过未变化的重复写入
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 会改变仪器整体状态的命令：复位、调用状态、预置、模式切换、自动调谐、mark到中心频率等
+_INVALIDATE_ALL = re.compile(
+    r'^(\*RST|\*RCL|SYST(EM)?:PRES|INST|CONF|FREQ:TUNE|CALC:MARK\d*:(CENT|SET)|MMEM:LOAD:STAT)',
+    re.IGNORECASE)
+
+# 相互耦合的参数，写入其中之一时其余参数的缓存失效
+_COUPLED_GROUPS = (
+    ('FREQ', 'FREQ:CENT', 'FREQ:SPAN', 'FREQ:STAR', 'FREQ:STOP'),
+    ('BAND', 'BAND:RES', 'BAND:AUTO', 'BAND:RES:AUTO'),
+    ('BAND:VID', 'BAND:VID:AUTO'),
+)
+_COUPLED = {header: group for group in _COUPLED_GROUPS for header in group}
+
+
+def split_setting(command: str) -> Tuple[str, str]:
+    """拆分设置命令为(规范化命令头, 参数)
+
+    只取复合命令的第一段，去掉前导 ``:``、``SENS:`` 并统一为大写，
+    ``BWID`` 视为 ``BAND``
+
+    example:
+        split_setting('SENS:BAND:RES 1kHz; *WAI')  # ('BAND:RES', '1kHz')
+    """
+    header, _, value = command.split(';', 1)[0].strip().partition(' ')
+    header = header.lstrip(':').upper()
+    header = re.sub(r'^SENS(E)?:', '', header)
+    header = re.sub(r'^BWID(TH)?\b', 'BAND', header)
+    return header, ' '.join(value.split())
+
+
+def coupled_headers(header: str) -> Tuple[str, ...]:
+    """返回与规范化命令头相互耦合的参数(含自身)"""
+    return _COUPLED.get(header, (header,))
+
+
+class ShadowState:
+    """仪器设置影子缓存"""
+
+    def __init__(self):
+        self._values: Dict[str, str] = {}
+        # 设置记录：不受耦合参数失效与invalidate()影响，只在复位、模式切换等命令后清空，用于重连后重放
+        self._log: Dict[str, str] = {}
+        self.hits = 0  # 被跳过的重复写入次数
+        self.misses = 0  # 实际发送的设置写入次数
+
+    def is_unchanged(self, command: str) -> bool:
+        """判断设置命令的值是否与缓存一致，并更新命中计数"""
+        header, value = split_setting(command)
+        if self._values.get(header) == value:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def update(self, command: str, shadow: bool = True) -> None:
+        """记录已写入的命令
+
+        Args:
+            command: 已写入仪器的命令
+            shadow: 是否记录该命令(第一段)的值；为False时清除该参数的缓存
+        """
+        for segment in command.split(';'):
+            header, _ = split_setting(segment)
+            if _INVALIDATE_ALL.match(header):
+                self._values.clear()
+                self._log.clear()
+            for coupled in _COUPLED.get(header, ()):
+                self._values.pop(coupled, None)
+        header, value = split_setting(command)
+        self._log.pop(header, None)
+        if shadow:
+            self._values[header] = value
+            self._log[header] = value  # 按最后写入的顺序记录
+        else:
+            self._values.pop(header, None)
+
+    def invalidate(self, header: Optional[str] = None) -> None:
+        """清除缓存
+
+        Args:
+            header: 只清除该参数，None表示全部清除
+        """
+        if header is None:
+            self._values.clear()
+        else:
+            self._values.pop(split_setting(header)[0], None)
+
+    def settings(self) -> List[str]:
+        """按写入顺序返回设置记录中的命令，重连后重放以恢复仪器状态"""
+        return [f'{header} {value}' if value else header for header, value in self._log.items()]
+
+    def stats(self) -> Dict[str, int]:
+        """返回命中统计"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._values)}
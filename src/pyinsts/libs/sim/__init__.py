@@ -0,0 +1,4 @@
+from .resource import SimulatedResource, open_simulated
+from .models import MODELS, SimFswp, SimInstrument, SimN9020B
+
+__all__ = ['SimulatedResource', 'open_simulated', 'MODELS', 'SimInstrument', 'SimN9020B', 'SimFswp']
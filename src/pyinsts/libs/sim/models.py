@@ -0,0 +1,364 @@
+"""
+模拟仪器行为模型：N9020B频谱仪与FSWP信号源分析仪所用SCPI子集，
+生成合成频谱、相位噪声曲线与VCO特性曲线
+"""
+import re
+import struct
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from pyinsts.libs.scpi import build_block
+from pyinsts.libs.shadow import split_setting
+
+_UNITS = {'': 1.0, 'HZ': 1.0, 'KHZ': 1e3, 'MHZ': 1e6, 'GHZ': 1e9, 'DBM': 1.0, 'DB': 1.0,
+          'V': 1.0, 'MV': 1e-3, 'S': 1.0, 'MS': 1e-3, 'US': 1e-6, 'A': 1.0, 'MA': 1e-3}
+_QUANTITY = re.compile(r'^([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([A-Za-z]*)$')
+
+
+def parse_value(text: str):
+    """解析带单位的数值参数，无法解析时返回去掉引号的字符串"""
+    match = _QUANTITY.match(text.strip())
+    if match and match.group(2).upper() in _UNITS:
+        return float(match.group(1)) * _UNITS[match.group(2).upper()]
+    return text.strip().strip('"\'')
+
+
+def format_value(value) -> str:
+    if isinstance(value, float):
+        return f'{value:.12g}'
+    return str(value)
+
+
+def blank_png(width: int = 800, height: int = 480) -> bytes:
+    """生成纯黑灰度PNG，作为模拟截图"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    raw = (b'\x00' + b'\x00' * width) * height
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+class SimInstrument:
+    """模拟仪器基类：通用参数存取、频率耦合、迹线格式与扫描触发"""
+    idn = 'Simulated,SIM,000001,1.0'
+    max_freq = 26.5e9
+    defaults: Dict[str, object] = {}
+    handlers: List[Tuple[str, str]] = []
+
+    def __init__(self, resource, sweep_time: float = 0.02, points: float = 1001,
+                 cal_time: float = 0.2, seed: float = 0, **_):
+        self.resource = resource
+        self.sweep_time = sweep_time
+        self.points = int(points)
+        self.cal_time = cal_time
+        self.rng = np.random.default_rng(int(seed))
+        self._handlers = [(re.compile(pattern + r'$'), getattr(self, name))
+                          for pattern, name in self.handlers + SimInstrument.handlers]
+        self.reset()
+
+    def reset(self) -> None:
+        self.state = dict(self.defaults)
+        self.state.setdefault('FORM', 'ASC')
+        self.state.setdefault('FORM:BORD', 'NORM')
+        self.state.setdefault('SWE:POIN', float(self.points))
+        self.files: Dict[str, bytes] = {}
+
+    def handle(self, header: str, args: str, query: bool):
+        key = split_setting(header.rstrip('?'))[0]
+        for pattern, handler in self._handlers:
+            match = pattern.match(key)
+            if match:
+                return handler(match, args, query)
+        if query:
+            return format_value(self.state.get(key, 0.0))
+        self.state[key] = parse_value(args)
+        return None
+
+    # ---- 通用命令 ----
+    handlers = [
+        (r'FREQ(:CENT)?', '_freq_center'),
+        (r'FREQ:SPAN', '_freq_span'),
+        (r'FREQ:(STAR|STOP)', '_freq_edge'),
+        (r'FORM(:DATA)?', '_format'),
+        (r'INIT(:IMM)?', '_init'),
+        (r'SYST:ERR', '_error'),
+        (r'MMEM:STOR:SCR', '_store_screen'),
+        (r'HCOP(:IMM)?', '_hardcopy'),
+        (r'MMEM:DATA', '_file_data'),
+        (r'MMEM:DEL', '_delete_file'),
+    ]
+
+    def _freq_center(self, match, args, query):
+        if query:
+            return format_value(self.state['FREQ:CENT'])
+        self.state['FREQ:CENT'] = parse_value(args)
+
+    def _freq_span(self, match, args, query):
+        if query:
+            return format_value(self.state['FREQ:SPAN'])
+        value = parse_value(args)
+        if isinstance(value, str):  # MAX/FULL
+            self.state['FREQ:CENT'] = self.max_freq / 2
+            value = self.max_freq
+        self.state['FREQ:SPAN'] = value
+
+    def _freq_edge(self, match, args, query):
+        start, stop = self.freq_range()
+        if query:
+            return format_value(start if match.group(1) == 'STAR' else stop)
+        if match.group(1) == 'STAR':
+            start = parse_value(args)
+        else:
+            stop = parse_value(args)
+        self.state['FREQ:CENT'] = (start + stop) / 2
+        self.state['FREQ:SPAN'] = abs(stop - start)
+
+    def _format(self, match, args, query):
+        if query:
+            return self.state['FORM']
+        self.state['FORM'] = args.upper().replace(' ', '')
+
+    def _init(self, match, args, query):
+        self.resource.begin_operation(self.sweep_time)
+
+    def _error(self, match, args, query):
+        return '0,"No error"'
+
+    def _store_screen(self, match, args, query):
+        self.files[parse_value(args)] = blank_png()
+
+    def _hardcopy(self, match, args, query):
+        self.files[self.state.get('MMEM:NAME', 'screen.png')] = blank_png()
+
+    def _file_data(self, match, args, query):
+        return build_block(self.files.get(parse_value(args), b''))
+
+    def _delete_file(self, match, args, query):
+        self.files.pop(parse_value(args), None)
+
+    # ---- 工具 ----
+    def freq_range(self) -> Tuple[float, float]:
+        center, span = self.state['FREQ:CENT'], self.state['FREQ:SPAN']
+        return center - span / 2, center + span / 2
+
+    def trace_response(self, values: np.ndarray) -> bytes:
+        """按FORM与FORM:BORD设置输出迹线"""
+        form = self.state['FORM']
+        if form.startswith('REAL'):
+            bits = 64 if form.endswith('64') else 32
+            order = '<' if self.state['FORM:BORD'].upper().startswith('SWAP') else '>'
+            return build_block(np.asarray(values, dtype=f'{order}f{bits // 8}').tobytes())
+        return ','.join(f'{value:.9g}' for value in values).encode()
+
+
+class SimN9020B(SimInstrument):
+    """模拟Keysight N9020B频谱仪，频谱由若干单音与RBW相关的噪底合成"""
+    idn = 'Keysight Technologies,N9020B,SIM0000001,A.33.03'
+    defaults = {
+        'FREQ:CENT': 1e9,
+        'FREQ:SPAN': 100e6,
+        'BAND:RES': 'AUTO',
+        'BAND:VID': 'AUTO',
+        'DISP:WIND:TRAC:Y:RLEV': 0.0,
+        'INIT:CONT': 1.0,
+    }
+    handlers = [
+        (r'TRAC(:DATA)?', '_trace'),
+        (r'CALC:MARK(\d*):(X|FREQ)', '_marker_x'),
+        (r'CALC:MARK(\d*):Y', '_marker_y'),
+        (r'CALC:MARK(\d*):MAX(:PEAK)?', '_marker_peak'),
+        (r'CALC:MARK(\d*):MAX:NEXT', '_marker_next'),
+        (r'CALC:MARK(\d*):CENT', '_marker_center'),
+        (r'CALC:MARK(\d*):MODE', '_marker_mode'),
+        (r'CALC:MARK:AOFF', '_marker_all_off'),
+        (r'FREQ:TUNE:IMM', '_auto_tune'),
+    ]
+
+    def __init__(self, resource, **options):
+        super().__init__(resource, **options)
+        self.tones = [(1e9, -10.0), (1.2e9, -55.0), (2e9, -35.0), (3e9, -48.0), (5.6e9, -62.0)]
+        self.tones += [(float(freq), float(level)) for freq, level in
+                       zip(self.rng.uniform(10e6, self.max_freq, 20), self.rng.uniform(-75, -50, 20))]
+
+    def reset(self) -> None:
+        super().reset()
+        self.markers: Dict[int, Dict[str, object]] = {}
+
+    def rbw(self) -> float:
+        rbw = self.state['BAND:RES']
+        if isinstance(rbw, float):
+            return rbw
+        return max(self.state['FREQ:SPAN'] / max(self.state['SWE:POIN'] - 1, 1), 1.0)
+
+    def spectrum(self, freqs: np.ndarray, noise: bool = True) -> np.ndarray:
+        """计算频点上的功率(dBm)"""
+        rbw = self.rbw()
+        sigma = rbw / 2.3548
+        power = np.full(freqs.shape, 10 ** ((-150 + 10 * np.log10(rbw)) / 10))
+        if noise:
+            power *= self.rng.exponential(1.0, freqs.shape)
+        low, high = freqs.min() - 10 * rbw, freqs.max() + 10 * rbw
+        for freq, level in self.tones:
+            if low <= freq <= high:
+                power += 10 ** (level / 10) * np.exp(-0.5 * ((freqs - freq) / sigma) ** 2)
+        return 10 * np.log10(power)
+
+    def trace_freqs(self) -> np.ndarray:
+        start, stop = self.freq_range()
+        return np.linspace(start, stop, int(self.state['SWE:POIN']))
+
+    def _trace(self, match, args, query):
+        return self.trace_response(self.spectrum(self.trace_freqs()))
+
+    def _marker(self, match) -> Dict[str, object]:
+        number = int(match.group(1) or 1)
+        return self.markers.setdefault(number, {'X': self.state['FREQ:CENT'], 'MODE': 'POS'})
+
+    def _marker_x(self, match, args, query):
+        marker = self._marker(match)
+        if query:
+            return format_value(marker['X'])
+        marker['X'] = parse_value(args)
+
+    def _marker_y(self, match, args, query):
+        marker = self._marker(match)
+        return format_value(float(self.spectrum(np.array([marker['X']]), noise=False)[0]))
+
+    def _peaks(self) -> Tuple[np.ndarray, np.ndarray]:
+        freqs = self.trace_freqs()
+        level = self.spectrum(freqs, noise=False)
+        inner = (level[1:-1] > level[:-2]) & (level[1:-1] >= level[2:])
+        index = np.flatnonzero(inner) + 1
+        order = np.argsort(level[index])[::-1]
+        return freqs[index][order], level[index][order]
+
+    def _marker_peak(self, match, args, query):
+        freqs, _ = self._peaks()
+        if freqs.size:
+            self._marker(match)['X'] = float(freqs[0])
+
+    def _marker_next(self, match, args, query):
+        marker = self._marker(match)
+        current = float(self.spectrum(np.array([marker['X']]), noise=False)[0])
+        freqs, levels = self._peaks()
+        lower = np.flatnonzero(levels < current - 1e-9)
+        if lower.size:
+            marker['X'] = float(freqs[lower[0]])
+
+    def _marker_center(self, match, args, query):
+        self.state['FREQ:CENT'] = self._marker(match)['X']
+
+    def _marker_mode(self, match, args, query):
+        marker = self._marker(match)
+        if query:
+            return marker['MODE']
+        marker['MODE'] = args.upper()[:4]
+
+    def _marker_all_off(self, match, args, query):
+        self.markers.clear()
+
+    def _auto_tune(self, match, args, query):
+        self.resource.begin_operation(self.sweep_time * 5)
+        self.state['FREQ:CENT'] = max(self.tones, key=lambda tone: tone[1])[0]
+
+
+class SimFswp(SimInstrument):
+    """模拟R&S FSWP信号源分析仪：相位噪声(PNO)与VCO特性迹线"""
+    idn = 'Rohde&Schwarz,FSWP26,SIM000001,2.30'
+    defaults = {
+        'INST': 'PNO',
+        'FREQ:CENT': 10e9,
+        'FREQ:SPAN': 10e6,
+        'POW:RLEV': 0.0,
+        'SOUR:VOLT:CONT:LEV:AMPL': 0.0,
+        'INIT:CONT': 1.0,
+    }
+    handlers = [
+        (r'INST', '_instrument'),
+        (r'TRAC(\d?)', '_trace'),
+        (r'CALC:MARK(\d*)(:STAT)?', '_marker_state'),
+        (r'CALC:MARK(\d*):X', '_marker_x'),
+        (r'CALC:MARK(\d*):Y', '_marker_y'),
+        (r'FETC:RANG(\d*):PNO(\d*):RMS', '_rms_jitter'),
+    ]
+
+    def __init__(self, resource, points: float = 501, **options):
+        super().__init__(resource, points=points, **options)
+
+    def reset(self) -> None:
+        super().reset()
+        self.markers: Dict[int, float] = {}
+
+    def offsets(self) -> np.ndarray:
+        return np.logspace(3, 8, self.points)
+
+    def phase_noise(self, offsets: np.ndarray, noise: bool = True) -> np.ndarray:
+        """单边带相位噪声L(f),dBc/Hz：1/f^3 闪烁、1/f^2 热噪声与噪底，随载波频率按20log缩放"""
+        carrier = self.state['FREQ:CENT']
+        power = 1e2 / offsets ** 3 + 3.16e-2 / offsets ** 2 + 1e-16
+        level = 10 * np.log10(power) + 20 * np.log10(carrier / 10e9)
+        if noise:
+            level = level + self.rng.normal(0, 0.5, offsets.shape)
+        return level
+
+    def vco_traces(self, window: int) -> np.ndarray:
+        """VCO特性：x为调谐电压，y依窗口为频率/功率/调谐灵敏度/电流"""
+        vt = np.linspace(0, 5, self.points)
+        carrier = self.state['FREQ:CENT']
+        freq = carrier * (1 + 0.05 * np.tanh((vt - 2.5) / 1.5))
+        values = {
+            1: freq,
+            2: 5 - 0.2 * (vt - 2.5) ** 2,
+            3: np.gradient(freq, vt),
+            4: 30e-3 + 2e-3 * vt,
+        }[window]
+        return np.column_stack((vt, values)).ravel()
+
+    def _instrument(self, match, args, query):
+        if query:
+            return self.state['INST']
+        self.state['INST'] = parse_value(args).upper()
+
+    def _trace(self, match, args, query):
+        window = int(match.group(1) or 1)
+        if self.state['INST'] == 'PNO' and window == 1:
+            offsets = self.offsets()
+            data = np.column_stack((offsets, self.phase_noise(offsets))).ravel()
+        else:
+            data = self.vco_traces(window)
+        return self.trace_response(data)
+
+    def _marker_x(self, match, args, query):
+        number = int(match.group(1) or 1)
+        if query:
+            return format_value(self.markers.get(number, 1e3))
+        self.markers[number] = parse_value(args)
+
+    def _marker_state(self, match, args, query):
+        number = int(match.group(1) or 1)
+        if query:
+            return '1' if number in self.markers else '0'
+        if args.upper() in ('OFF', '0'):
+            self.markers.pop(number, None)
+        else:
+            self.markers.setdefault(number, 1e3)
+
+    def _marker_y(self, match, args, query):
+        offset = self.markers.get(int(match.group(1) or 1), 1e3)
+        return format_value(float(self.phase_noise(np.array([offset]), noise=False)[0]))
+
+    def _rms_jitter(self, match, args, query):
+        offsets = self.offsets()
+        power = 10 ** (self.phase_noise(offsets, noise=False) / 10)
+        integral = np.sum((power[1:] + power[:-1]) / 2 * np.diff(offsets))
+        return format_value(float(np.sqrt(2 * integral) / (2 * np.pi * self.state['FREQ:CENT'])))
+
+
+MODELS = {
+    'N9020B': SimN9020B,
+    'N9030B': SimN9020B,
+    'FSWP': SimFswp,
+}
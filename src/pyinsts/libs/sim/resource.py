@@ -0,0 +1,243 @@
+"""
+模拟VISA消息型会话：命令解析、IEEE 488.2状态系统(*ESE/*SRE/*OPC/*WAI)、SRQ事件与传输延时
+
+仪器处理按时间戳惰性推进：扫描等耗时操作只记录完成时刻，
+响应在就绪时刻之前读取会阻塞，超过VISA超时抛出VI_ERROR_TMO
+"""
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from pyvisa import VisaIOError
+from pyvisa.constants import StatusCode
+
+ESB_BIT = 0x20
+MAV_BIT = 0x10
+RQS_BIT = 0x40
+
+
+@dataclass
+class SimEvent:
+    """wait_on_event的返回值"""
+    timed_out: bool
+
+
+class SimulatedResource:
+    """模拟VISA会话，接口与pyvisa.resources.MessageBasedResource一致"""
+
+    def __init__(self, address: str, model_class, latency: float = 0.0002,
+                 bandwidth: float = 10e6, **options):
+        """
+        Args:
+            address: 资源地址
+            model_class: 仪器行为模型类
+            latency: 每条消息的往返延时(秒)
+            bandwidth: 传输速率(字节/秒)
+            options: 传给仪器模型的参数，例如sweep_time、points
+        """
+        self.resource_name = address
+        self.timeout = 2000
+        self.read_termination = '\n'
+        self.write_termination = '\n'
+        self.chunk_size = 20 * 1024
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self._output: List[list] = []  # [响应字节, 就绪时刻]
+        self._events_enabled = False
+        self._srq_delivered = True
+        self.busy_until = 0.0
+        self._barrier = 0.0
+        self._opc_at: Optional[float] = None
+        self._response_ready_at = 0.0
+        self.esr = 0
+        self.ese = 0
+        self.sre = 0
+        self.connected = True
+        self.model = model_class(self, **options)
+
+    # ---- 传输 ----
+    def disconnect(self) -> None:
+        """模拟网络中断，之后的读写抛出VI_ERROR_CONN_LOST"""
+        self.connected = False
+
+    def _check_connected(self) -> None:
+        if not self.connected:
+            raise VisaIOError(StatusCode.error_connection_lost)
+
+    def write(self, message: str) -> int:
+        self._check_connected()
+        self._sleep(self.latency)
+        self._response_ready_at = 0.0
+        responses = []
+        for command in message.split(';'):
+            command = command.strip()
+            if not command:
+                continue
+            response = self._execute(command)
+            if response is not None:
+                responses.append(response if isinstance(response, bytes) else str(response).encode())
+        if responses:
+            ready_at = max(time.time(), self._barrier, self._response_ready_at)
+            self._output.append([bytearray(b';'.join(responses) + b'\n'), ready_at])
+        return len(message) + len(self.write_termination)
+
+    def write_raw(self, message: bytes) -> int:
+        return self.write(message.decode('latin-1').rstrip('\r\n'))
+
+    def query(self, message: str, delay: Optional[float] = None) -> str:
+        self.write(message)
+        return self.read()
+
+    def read(self) -> str:
+        return self.read_raw().decode('latin-1').rstrip('\r\n')
+
+    def read_raw(self, size: Optional[int] = None) -> bytes:
+        data = self._wait_output()
+        self._output.pop(0)
+        self._sleep(len(data) / self.bandwidth)
+        return bytes(data)
+
+    def read_bytes(self, count: int, chunk_size: Optional[int] = None,
+                   break_on_termchar: bool = False) -> bytes:
+        data = self._wait_output()
+        chunk = bytes(data[:count])
+        del data[:count]
+        if not data:
+            self._output.pop(0)
+        self._sleep(len(chunk) / self.bandwidth)
+        return chunk
+
+    def clear(self) -> None:
+        self._output.clear()
+
+    def close(self) -> None:
+        self._output.clear()
+
+    # ---- 状态与事件 ----
+    def read_stb(self) -> int:
+        self._check_connected()
+        self._update_status()
+        stb = (ESB_BIT if self.esr & self.ese else 0) | (MAV_BIT if self._output else 0)
+        if stb & self.sre:
+            stb |= RQS_BIT
+        return stb
+
+    def enable_event(self, event_type, mechanism, context=None) -> None:
+        self._events_enabled = True
+
+    def disable_event(self, event_type, mechanism) -> None:
+        self._events_enabled = False
+
+    def discard_events(self, event_type, mechanism) -> None:
+        self._srq_delivered = True
+
+    def wait_on_event(self, in_event_type, timeout: int, capture_timeout: bool = False) -> SimEvent:
+        if not self._events_enabled:
+            raise VisaIOError(StatusCode.error_not_enabled)
+        fire_at = math.inf
+        if not self._srq_delivered and self.sre & ESB_BIT:
+            if self._opc_at is not None and self.ese & 1:
+                fire_at = self._opc_at
+            elif self.read_stb() & ESB_BIT:
+                fire_at = time.time()
+        wait = fire_at - time.time()
+        if wait > timeout / 1000:
+            self._sleep(timeout / 1000)
+            if capture_timeout:
+                return SimEvent(timed_out=True)
+            raise VisaIOError(StatusCode.error_timeout)
+        self._sleep(wait)
+        self._srq_delivered = True
+        return SimEvent(timed_out=False)
+
+    # ---- 仪器侧 ----
+    def begin_operation(self, duration: float) -> None:
+        """开始一个耗时操作(扫描、校准等)，与之前的操作串行执行"""
+        self.busy_until = max(time.time(), self.busy_until) + duration
+
+    def _execute(self, command: str):
+        header, _, args = command.partition(' ')
+        header = header.lstrip(':').upper()
+        if header == '*IDN?':
+            return self.model.idn
+        if header == '*CLS':
+            self.esr = 0
+            self._opc_at = None
+            return None
+        if header == '*RST':
+            self.model.reset()
+            return None
+        if header == '*OPC':
+            self._opc_at = max(time.time(), self.busy_until)
+            self._srq_delivered = False
+            return None
+        if header == '*OPC?':
+            self._response_ready_at = max(self._response_ready_at, self.busy_until)
+            return '1'
+        if header == '*WAI':
+            self._barrier = self.busy_until
+            return None
+        if header == '*ESE':
+            self.ese = int(args)
+            return None
+        if header == '*SRE':
+            self.sre = int(args)
+            return None
+        if header == '*ESE?':
+            return str(self.ese)
+        if header == '*SRE?':
+            return str(self.sre)
+        if header == '*ESR?':
+            self._update_status()
+            esr, self.esr = self.esr, 0
+            return str(esr)
+        if header == '*STB?':
+            return str(self.read_stb())
+        if header == '*CAL?':
+            self.begin_operation(self.model.cal_time)
+            self._response_ready_at = max(self._response_ready_at, self.busy_until)
+            return '0'
+        return self.model.handle(header, args.strip(), header.endswith('?'))
+
+    def _update_status(self) -> None:
+        if self._opc_at is not None and time.time() >= self._opc_at:
+            self.esr |= 1
+            self._opc_at = None
+
+    def _wait_output(self) -> bytearray:
+        self._check_connected()
+        timeout = self.timeout / 1000 if self.timeout is not None else math.inf
+        if not self._output:
+            self._sleep(timeout)
+            raise VisaIOError(StatusCode.error_timeout)
+        data, ready_at = self._output[0]
+        wait = ready_at - time.time()
+        if wait > timeout:
+            self._sleep(timeout)
+            raise VisaIOError(StatusCode.error_timeout)
+        self._sleep(wait)
+        return data
+
+    @staticmethod
+    def _sleep(seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+def open_simulated(address: str) -> SimulatedResource:
+    """按 ``sim://<型号>?参数`` 打开模拟会话
+
+    example:
+        open_simulated('sim://N9020B?latency=0.001&sweep_time=0.05&points=1001')
+        open_simulated('sim://FSWP?bandwidth=5e6')
+    """
+    from pyinsts.libs.sim.models import MODELS
+
+    parts = urlsplit(address)
+    name = (parts.netloc or parts.path.lstrip('/')).upper()
+    if name not in MODELS:
+        raise ValueError(f"不支持的模拟仪器型号: {name}，可选: {', '.join(MODELS)}")
+    options = {key: float(value) for key, value in parse_qsl(parts.query)}
+    return SimulatedResource(address, MODELS[name], **options)
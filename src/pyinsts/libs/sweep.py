@@ -0,0 +1,217 @@
+"""
+声明式扫描引擎：按扫描轴的笛卡尔积逐点设置仪器、触发测量并以NumPy结构化数组分块输出结果
+
+每个测量点内，同一仪器的设置命令与触发命令合并为一次传输，影子缓存跳过未变化的外层轴，
+各仪器的触发并行等待，标量测量合并为一次复合查询
+"""
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from pyinsts.libs.baseinstrument import BaseInstrument
+
+
+@dataclass
+class Axis:
+    """扫描轴
+
+    Args:
+        name: 轴名称，即结果记录中的字段名
+        values: 扫描值序列
+        instrument: 被设置的仪器，setter为普通函数时可为None
+        setter: SCPI命令模板(以 ``{}`` 代入扫描值，按可缓存设置命令发送)，
+            或接收扫描值的函数(例如 ``fswp.set_vt``)
+        settle: 该轴变化后的稳定等待时间(秒)
+    """
+    name: str
+    values: Sequence[float]
+    instrument: Optional[BaseInstrument]
+    setter: Union[str, Callable[[float], None]]
+    settle: float = 0.0
+
+    def apply(self, value) -> None:
+        if isinstance(self.setter, str):
+            self.instrument.write(self.setter.format(value), shadow=True)
+        else:
+            self.setter(value)
+
+
+@dataclass
+class Measurement:
+    """每个扫描点采集的测量
+
+    Args:
+        name: 结果记录中的字段名
+        instrument: 测量仪器
+        command: 查询命令，例如 "CALC:MARK1:Y?"；points不为None时为迹线查询，例如 "TRAC:DATA? TRACE1"
+        setup: 查询前发送的设置命令，与查询合并为一次传输，例如 ["CALC:MARK1:MAX"]
+        trigger: 查询前触发的操作，SCPI命令(例如 "INIT:IMM")或返回Completion的函数(例如 ``fswp.run_single``)；
+            同一仪器的多个测量只触发一次
+        points: 迹线点数，为None时为标量测量
+        dtype: 记录中的数据类型
+    """
+    name: str
+    instrument: BaseInstrument
+    command: str
+    setup: Sequence[str] = field(default_factory=tuple)
+    trigger: Union[str, Callable[[], object], None] = None
+    points: Optional[int] = None
+    dtype: str = 'f8'
+
+
+class Sweep:
+    """声明式扫描
+
+    扫描点为各轴取值的笛卡尔积，第一个轴变化最慢
+
+    example:
+        sweep = Sweep(
+            axes=[Axis('freq', np.arange(1e9, 2e9, 1e6), n9020b, 'FREQ:CENT {}Hz'),
+                  Axis('rbw', [1e3, 1e4], n9020b, 'BAND {}Hz')],
+            measurements=[Measurement('power', n9020b, 'CALC:MARK1:Y?',
+                                      setup=['CALC:MARK1:MAX'], trigger='INIT:IMM')])
+        for records in sweep.run(chunk_size=1000):
+            print(records['freq'], records['power'])
+        sweep.save('sweep.npy')
+    """
+
+    def __init__(self, axes: Sequence[Axis], measurements: Sequence[Measurement],
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            axes: 扫描轴，第一个轴变化最慢
+            measurements: 每点采集的测量
+            timeout: 单点触发等待超时(秒)，默认使用仪器的opc_timeout
+        """
+        names = [axis.name for axis in axes] + [measurement.name for measurement in measurements]
+        if len(set(names)) != len(names):
+            raise ValueError(f"扫描轴与测量名称重复: {names}")
+        self.axes = list(axes)
+        self.measurements = list(measurements)
+        self.timeout = timeout
+        self.values = [np.asarray(axis.values) for axis in self.axes]
+        self.shape = tuple(len(values) for values in self.values)
+        self.dtype = np.dtype(
+            [(axis.name, values.dtype if values.dtype.kind in 'biuf' else 'f8')
+             for axis, values in zip(self.axes, self.values)]
+            + [(m.name, m.dtype) if m.points is None else (m.name, m.dtype, (m.points,))
+               for m in self.measurements])
+
+    def __len__(self) -> int:
+        return math.prod(self.shape)
+
+    def _instruments(self) -> List[BaseInstrument]:
+        instruments: List[BaseInstrument] = []
+        for item in self.axes + self.measurements:
+            if item.instrument is not None and all(item.instrument is not i for i in instruments):
+                instruments.append(item.instrument)
+        return instruments
+
+    def run(self, chunk_size: int = 1024) -> Iterator[np.ndarray]:
+        """执行扫描，逐块产出结果记录
+
+        Args:
+            chunk_size: 每块记录数
+
+        Returns:
+            结构化数组迭代器，字段为扫描轴与测量名称
+        """
+        instruments = self._instruments()
+        triggers: Dict[int, Measurement] = {}
+        for measurement in self.measurements:
+            if measurement.trigger is not None:
+                triggers.setdefault(id(measurement.instrument), measurement)
+
+        records = np.empty(min(chunk_size, len(self)) or 1, dtype=self.dtype)
+        filled = 0
+        previous = None
+        start_time = time.time()
+        for index in np.ndindex(*self.shape):
+            values = [values[i] for values, i in zip(self.values, index)]
+            changed = [True] * len(index) if previous is None else [i != p for i, p in zip(index, previous)]
+            previous = index
+
+            # 设置与触发：同一仪器的命令合并为一次传输
+            settle = max([axis.settle for axis, c in zip(self.axes, changed) if c], default=0.0)
+            pending = []
+            for instrument in instruments:
+                with instrument.batch():
+                    for axis, value, c in zip(self.axes, values, changed):
+                        if c and axis.instrument is instrument:
+                            axis.apply(value)
+                    measurement = triggers.get(id(instrument))
+                    if measurement is not None and not settle:
+                        pending.append(self._trigger(measurement))
+            for axis, value, c in zip(self.axes, values, changed):
+                if c and axis.instrument is None:
+                    axis.apply(value)
+            if settle:
+                time.sleep(settle)
+                pending = [self._trigger(measurement) for measurement in triggers.values()]
+            for completion in pending:
+                if completion is not None:
+                    completion.wait(self.timeout)
+
+            # 读取：标量测量合并为一次复合查询
+            record = records[filled]
+            for axis, value in zip(self.axes, values):
+                record[axis.name] = value
+            for instrument in instruments:
+                self._read(instrument, record)
+
+            filled += 1
+            if filled == len(records):
+                yield records[:filled].copy()
+                filled = 0
+        if filled:
+            yield records[:filled].copy()
+        logging.info(f"扫描完成，共{len(self)}点，耗时: {time.time() - start_time:.2f}秒")
+
+    def _trigger(self, measurement: Measurement):
+        if isinstance(measurement.trigger, str):
+            return measurement.instrument.start(measurement.trigger, timeout=self.timeout)
+        return measurement.trigger()
+
+    def _read(self, instrument: BaseInstrument, record) -> None:
+        scalars = [m for m in self.measurements if m.instrument is instrument and m.points is None]
+        if scalars:
+            commands = []
+            for measurement in scalars:
+                commands.extend(measurement.setup)
+                commands.append(measurement.command)
+            responses = instrument.query_many(commands)
+            for measurement, response in zip(scalars, responses):
+                record[measurement.name] = float(response)
+        for measurement in self.measurements:
+            if measurement.instrument is instrument and measurement.points is not None:
+                for command in measurement.setup:
+                    instrument.write(command)
+                bits = 64 if np.dtype(measurement.dtype).itemsize == 8 else 32
+                record[measurement.name] = instrument.fetch_trace(measurement.command, bits=bits)
+
+    def collect(self, chunk_size: int = 1024) -> np.ndarray:
+        """执行扫描并返回全部结果记录"""
+        return np.concatenate(list(self.run(chunk_size)))
+
+    def save(self, path: str, chunk_size: int = 1024) -> np.ndarray:
+        """执行扫描，结果逐块写入.npy文件，不在内存中累积
+
+        Args:
+            path: 输出文件路径
+            chunk_size: 每块记录数
+
+        Returns:
+            以只读方式映射的结果数组
+        """
+        output = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype, shape=(len(self),))
+        offset = 0
+        for records in self.run(chunk_size):
+            output[offset:offset + len(records)] = records
+            offset += len(records)
+        output.flush()
+        del output
+        return np.load(path, mmap_mode='r')
@@ -0,0 +1,107 @@
+"""
+VISA超时策略：按命令模式配置超时，只在超时值变化时设置VISA属性，
+可选按命令实测耗时百分位自适应超时
+"""
+import math
+import re
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from pyinsts.libs.scpi import command_template
+
+# 默认超时配置(毫秒)，按顺序匹配命令，先匹配者生效
+DEFAULT_PROFILES = (
+    (r'^\*(CAL|TST)\?', 600000),  # 自校准、自检
+    (r'^(MMEM|HCOP)', 60000),  # 文件存取、截图
+    (r'^:?TRAC', 30000),  # 迹线读取
+)
+
+
+class TimeoutPolicy:
+    """VISA超时策略"""
+
+    def __init__(self, write_timeout: int = 100000, query_timeout: int = 20000,
+                 profiles=DEFAULT_PROFILES, adaptive: bool = False,
+                 adaptive_factor: float = 4.0, adaptive_percentile: float = 99.0,
+                 adaptive_floor: int = 200, adaptive_min_samples: int = 20,
+                 adaptive_window: int = 200):
+        """
+        Args:
+            write_timeout: 写入命令默认超时(毫秒)
+            query_timeout: 查询命令默认超时(毫秒)
+            profiles: (正则表达式, 超时毫秒) 序列，按命令文本匹配
+            adaptive: 是否按实测耗时自适应超时
+            adaptive_factor: 自适应超时为耗时百分位的倍数
+            adaptive_percentile: 自适应使用的耗时百分位
+            adaptive_floor: 自适应超时下限(毫秒)
+            adaptive_min_samples: 开始自适应所需的最少样本数
+            adaptive_window: 每种命令保留的最近样本数
+        """
+        self.write_timeout = write_timeout
+        self.query_timeout = query_timeout
+        self.profiles: List[Tuple[re.Pattern, int]] = []
+        for pattern, timeout in profiles:
+            self.add_profile(pattern, timeout)
+        self.adaptive = adaptive
+        self.adaptive_factor = adaptive_factor
+        self.adaptive_percentile = adaptive_percentile
+        self.adaptive_floor = adaptive_floor
+        self.adaptive_min_samples = adaptive_min_samples
+        self.adaptive_window = adaptive_window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._observed: Dict[str, int] = {}  # 各命令累计记录次数，样本窗口写满后仍每10次重新计算
+        self._learned: Dict[str, int] = {}
+        self._current: Optional[int] = None  # 当前会话已设置的VISA超时
+
+    def add_profile(self, pattern: str, timeout: int) -> None:
+        """添加命令超时配置，优先于已有配置
+
+        Args:
+            pattern: 匹配命令文本的正则表达式(不区分大小写)
+            timeout: 超时时间(毫秒)
+        """
+        self.profiles.insert(0, (re.compile(pattern, re.IGNORECASE), timeout))
+
+    def timeout_for(self, command: str, query: bool = False) -> int:
+        """计算命令的超时时间(毫秒)"""
+        command = command.strip()
+        for pattern, timeout in self.profiles:
+            if pattern.search(command):
+                break
+        else:
+            timeout = self.query_timeout if query else self.write_timeout
+        if self.adaptive:
+            learned = self._learned.get(command_template(command))
+            if learned is not None:
+                timeout = min(timeout, learned)
+        return timeout
+
+    def apply(self, resource, timeout: int) -> None:
+        """设置VISA会话超时，与当前值相同时不访问VISA属性"""
+        if timeout != self._current:
+            resource.timeout = timeout
+            self._current = timeout
+
+    def reset(self) -> None:
+        """会话更换后调用，下次apply时重新设置VISA属性"""
+        self._current = None
+
+    def observe(self, command: str, elapsed: float) -> None:
+        """记录命令耗时(秒)，用于自适应超时"""
+        if not self.adaptive:
+            return
+        template = command_template(command)
+        samples = self._samples.get(template)
+        if samples is None:
+            samples = self._samples[template] = deque(maxlen=self.adaptive_window)
+        samples.append(elapsed)
+        count = self._observed[template] = self._observed.get(template, 0) + 1
+        if len(samples) >= self.adaptive_min_samples and count % 10 == 0:
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, math.ceil(self.adaptive_percentile / 100 * len(ordered)) - 1)
+            self._learned[template] = max(self.adaptive_floor,
+                                          int(ordered[index] * 1000 * self.adaptive_factor))
+
+    def learned(self) -> Dict[str, int]:
+        """返回已学习的各命令超时(毫秒)"""
+        return dict(self._learned)
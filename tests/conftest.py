@@ -0,0 +1,34 @@
+import pytest
+
+from pyinsts.libs.keysight.N9020B import N9020b
+from pyinsts.libs.rs.Fswp import Fswp
+from pyinsts.libs.session_pool import session_pool
+
+N9020B_SIM = 'sim://N9020B?latency=0&sweep_time=0.01'
+FSWP_SIM = 'sim://FSWP?latency=0&sweep_time=0.01'
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    """每个用例使用新的模拟仪器，避免会话池复用上一个用例的仪器状态"""
+    yield
+    session_pool.close_all()
+
+
+@pytest.fixture
+def n9020b_address():
+    return N9020B_SIM
+
+
+@pytest.fixture
+def n9020b():
+    instrument = N9020b(N9020B_SIM)
+    yield instrument
+    instrument.close()
+
+
+@pytest.fixture
+def fswp():
+    instrument = Fswp(FSWP_SIM)
+    yield instrument
+    instrument.close()
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from pyinsts.libs.actor import coalesce
+from pyinsts.libs.recorder import WRITE, read_records
+
+
+def test_coalesce_keeps_last_write_per_setting():
+    writes = [('FREQ:CENT 1GHz', True), ('BAND:RES 1kHz', True), ('FREQ:CENT 2GHz', True)]
+    assert coalesce(writes) == [1, 2]
+
+
+def test_coalesce_keeps_writes_across_coupled_or_plain_commands():
+    assert coalesce([('FREQ:CENT 1GHz', True), ('FREQ:STAR 1MHz', True), ('FREQ:CENT 2GHz', True)]) == [0, 1, 2]
+    assert coalesce([('FREQ:CENT 1GHz', True), ('INIT:IMM', False), ('FREQ:CENT 2GHz', True)]) == [0, 1, 2]
+    assert coalesce([('FREQ:CENT 1GHz', False), ('FREQ:CENT 2GHz', False)]) == [0, 1]
+
+
+def test_actor_write_and_query(n9020b, tmp_path):
+    path = str(tmp_path / 'actor.scpi')
+    n9020b.record(path)
+    actor = n9020b.actor()
+    # 先占住I/O线程，使随后的写入在队列中合并
+    gate = threading.Event()
+    actor.call(gate.wait)
+    for freq in (1, 2, 3):
+        actor.write(f'FREQ:CENT {freq}GHz', shadow=True)
+    actor.write('BAND:RES 1kHz', shadow=True)
+    gate.set()
+    assert float(actor.query('FREQ:CENT?').result()) == 3e9
+    assert actor.coalesced == 2
+    actor.stop()
+    n9020b.stop_recording()
+    writes = [record.data.decode() for record in read_records(path) if record.kind == WRITE]
+    assert writes == ['FREQ:CENT 3GHz;:BAND:RES 1kHz', 'FREQ:CENT?']
+
+
+def test_actor_owns_session_exclusively(n9020b):
+    actor = n9020b.actor()
+    assert n9020b.actor() is actor
+    with pytest.raises(RuntimeError):
+        n9020b.query('*IDN?')
+    with pytest.raises(RuntimeError):
+        n9020b.wait_opc()
+    handle = actor.run_single().result()
+    with pytest.raises(RuntimeError):
+        handle.wait()
+    actor.call(handle.wait).result()
+    actor.stop()
+    assert n9020b.query('*OPC?').strip() == '1'
+
+
+def test_actor_reports_write_errors(n9020b):
+    actor = n9020b.actor()
+    n9020b.auto_reconnect = False
+    actor.call(n9020b.instrument.disconnect).result()
+    with pytest.raises(Exception):
+        actor.write('FREQ:CENT 1GHz').result()
+    actor.stop()
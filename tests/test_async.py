@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+from pyinsts.libs.asyncinstrument import AsyncFswp, AsyncN9020b
+
+N9020B = 'sim://N9020B?latency=0&sweep_time=0.2'
+FSWP = 'sim://FSWP?latency=0&sweep_time=0.2'
+
+
+def test_parallel_sweeps_overlap():
+    async def main():
+        async with await AsyncN9020b.open(N9020B) as sa, await AsyncFswp.open(FSWP) as fswp:
+            await sa.write('FREQ:CENT 1GHz')
+            start = time.perf_counter()
+            await asyncio.gather(sa.run_single(), fswp.run_single())
+            elapsed = time.perf_counter() - start
+            return elapsed, await sa.query('FREQ:CENT?')
+
+    elapsed, center = asyncio.run(main())
+    assert elapsed < 0.35
+    assert float(center) == 1e9
+
+
+def test_wrapped_methods_and_wait_complete():
+    async def main():
+        async with await AsyncN9020b.open(N9020B) as sa:
+            await sa.set_freq_cent(2, 'GHz')
+            trace = await sa.fetch_trace('TRAC:DATA? TRACE1')
+            response = await sa.wait_complete('*CAL?', response=True)
+            return await sa.query('FREQ:CENT?'), trace, response
+
+    center, trace, response = asyncio.run(main())
+    assert float(center) == 2e9
+    assert trace.size > 0
+    assert response.strip() == '0'
@@ -0,0 +1,76 @@
+from pyinsts.libs.metrics import IoMetrics
+from pyinsts.libs.recorder import WRITE, read_records
+
+
+def _writes(path):
+    return [record.data.decode() for record in read_records(path) if record.kind == WRITE]
+
+
+def test_batch_sends_one_compound_command(n9020b, tmp_path):
+    path = str(tmp_path / 'batch.scpi')
+    n9020b.record(path)
+    with n9020b.batch():
+        n9020b.write('FREQ:CENT 1GHz')
+        n9020b.write('BAND:RES 1kHz')
+    n9020b.stop_recording()
+    assert _writes(path) == ['FREQ:CENT 1GHz;:BAND:RES 1kHz']
+
+
+def test_query_flushes_queued_writes_first(n9020b, tmp_path):
+    path = str(tmp_path / 'query.scpi')
+    n9020b.record(path)
+    with n9020b.batch():
+        n9020b.write('FREQ:CENT 2GHz')
+        assert float(n9020b.query('FREQ:CENT?')) == 2e9
+    n9020b.stop_recording()
+    assert _writes(path) == ['FREQ:CENT 2GHz', 'FREQ:CENT?']
+
+
+def test_check_complete_defers_opc_to_batch_exit(n9020b, tmp_path):
+    path = str(tmp_path / 'opc.scpi')
+    n9020b.record(path)
+    with n9020b.batch():
+        n9020b.write('FREQ:CENT 1GHz')
+        n9020b.write('INIT:IMM', check_complete=True)
+        n9020b.write('BAND:RES 1kHz')
+    n9020b.stop_recording()
+    assert _writes(path) == ['FREQ:CENT 1GHz;:INIT:IMM;:BAND:RES 1kHz', '*OPC?']
+
+
+def test_wait_opc_sends_queued_writes_first(n9020b, tmp_path):
+    path = str(tmp_path / 'wait.scpi')
+    n9020b.record(path)
+    with n9020b.batch():
+        n9020b.write('FREQ:SPAN 1MHz')
+        n9020b.wait_opc()
+    n9020b.stop_recording()
+    assert _writes(path) == ['FREQ:SPAN 1MHz', '*OPC?']
+
+
+def test_exception_discards_queued_writes(n9020b, tmp_path):
+    path = str(tmp_path / 'error.scpi')
+    n9020b.record(path)
+    try:
+        with n9020b.batch():
+            n9020b.write('FREQ:CENT 5GHz')
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    n9020b.stop_recording()
+    assert _writes(path) == []
+
+
+def test_batch_opc_waits_with_opc_timeout(n9020b):
+    n9020b.metrics = IoMetrics()
+    n9020b.timeout_policy.adaptive = True
+    n9020b.opc_timeout = 321
+    applied = []
+    apply = n9020b.timeout_policy.apply
+    n9020b.timeout_policy.apply = lambda resource, timeout: (applied.append(timeout), apply(resource, timeout))
+    with n9020b.batch(opc=True):
+        n9020b.write('INIT:IMM')
+    assert applied[-1] == 321000
+    kinds = {(row['kind'], row['command']) for row in n9020b.metrics.stats()}
+    assert ('wait', '*OPC?') in kinds
+    assert not any(kind == 'query' for kind, _ in kinds)
+    assert '*OPC?' not in n9020b.timeout_policy._samples
@@ -0,0 +1,49 @@
+import pytest
+
+from pyinsts.libs.keysight.N9020B import N9020b
+
+
+@pytest.fixture
+def slow_n9020b():
+    instrument = N9020b('sim://N9020B?latency=0&sweep_time=0.2')
+    yield instrument
+    instrument.close()
+
+
+def test_srq_completion(slow_n9020b):
+    handle = slow_n9020b.start('INIT:IMM')
+    assert handle.srq
+    assert not handle.done()
+    elapsed = handle.wait()
+    assert elapsed >= 0.15
+    assert handle.done()
+    assert handle.wait() == elapsed
+    # 状态寄存器已清除，下一次操作重新等待
+    assert not slow_n9020b.start('INIT:IMM').done()
+
+
+def test_completion_returns_query_response(n9020b):
+    assert n9020b.start('*CAL?', response=True).result().strip() == '0'
+
+
+def test_completion_timeout(slow_n9020b):
+    handle = slow_n9020b.start('INIT:IMM', timeout=0.05)
+    with pytest.raises(TimeoutError):
+        handle.wait()
+    assert slow_n9020b.query('*OPC?').strip() == '1'
+
+
+def test_fallback_without_srq(slow_n9020b, monkeypatch):
+    def unsupported(*args, **kwargs):
+        raise NotImplementedError
+
+    monkeypatch.setattr(slow_n9020b.instrument, 'enable_event', unsupported)
+    handle = slow_n9020b.start('INIT:IMM')
+    assert not handle.srq
+    assert handle.wait() >= 0.15
+    assert float(slow_n9020b.query('FREQ:CENT?')) > 0
+
+
+def test_run_single_then_trace(slow_n9020b):
+    slow_n9020b.run_single().wait()
+    assert slow_n9020b.query_trace().size > 0
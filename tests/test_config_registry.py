@@ -0,0 +1,52 @@
+import json
+import os
+
+import pytest
+
+from pyinsts.libs.data.registry import ConfigRegistry
+
+CONFIG = {'instruments': {'FSWP': 'sim://FSWP',
+                          'N9030B': {'address': 'sim://N9020B', 'timeouts': {'opc': 60}}}}
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(CONFIG), encoding='utf-8')
+    return str(path)
+
+
+def test_inventory_is_parsed_once(config_path):
+    registry = ConfigRegistry()
+    assert registry.resolve('N9030B', config_path).timeouts == {'opc': 60}
+    assert registry.resolve('FSWP', config_path).address == 'sim://FSWP'
+    assert registry.parses == 1
+
+
+def test_compiled_cache_skips_parsing(config_path, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    ConfigRegistry(cache_dir).inventory(config_path)
+    registry = ConfigRegistry(cache_dir)
+    assert registry.resolve('FSWP', config_path).address == 'sim://FSWP'
+    assert registry.parses == 0
+    assert oct(os.stat(cache_dir).st_mode & 0o777) == oct(0o700)
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='POSIX权限检查')
+def test_shared_cache_dir_is_ignored(config_path, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    ConfigRegistry(str(cache_dir)).inventory(config_path)
+    cached = next(cache_dir.iterdir())
+    cached.write_text(cached.read_text(encoding='utf-8').replace('sim://FSWP', 'TCPIP0::evil'), encoding='utf-8')
+    os.chmod(cache_dir, 0o777)
+    registry = ConfigRegistry(str(cache_dir))
+    assert registry.resolve('FSWP', config_path).address == 'sim://FSWP'
+    assert registry.parses == 1
+
+
+def test_default_cache_dir_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    registry = ConfigRegistry()
+    registry.enable_compiled_cache()
+    assert registry.cache_dir == os.path.join(str(tmp_path), 'pyinsts')
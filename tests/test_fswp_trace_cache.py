@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.fixture
+def fetches(fswp, monkeypatch):
+    calls = []
+    fetch_trace = fswp.fetch_trace
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return fetch_trace(*args, **kwargs)
+
+    monkeypatch.setattr(fswp, 'fetch_trace', counting)
+    return calls
+
+
+def test_continuous_sweep_is_not_cached(fswp, fetches):
+    fswp.run_cont()
+    fswp.query_trace(1)
+    fswp.query_trace(1)
+    assert len(fetches) == 2
+
+
+def test_single_sweep_is_cached_until_next_sweep(fswp, fetches):
+    fswp.run_single().wait()
+    fswp.query_trace(1)
+    fswp.query_trace(1)
+    assert len(fetches) == 1
+    fswp.run_single().wait()
+    fswp.query_trace(1)
+    assert len(fetches) == 2
+
+
+def test_setting_invalidates_cache(fswp, fetches):
+    fswp.run_single().wait()
+    fswp.query_trace(1)
+    fswp.set_cent_freq(5)
+    fswp.query_trace(1)
+    assert len(fetches) == 2
+    fswp.query('FREQ:CENT?')
+    fswp.query_trace(1)
+    assert len(fetches) == 2
+
+
+def test_refresh_and_reset(fswp, fetches):
+    fswp.run_single().wait()
+    fswp.query_trace(1)
+    fswp.query_trace(1, refresh=True)
+    assert len(fetches) == 2
+    fswp.write('*RST')
+    fswp.write('INIT:IMM')
+    fswp.query_trace(1)
+    fswp.query_trace(1)
+    assert len(fetches) == 4
@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+
+from pyinsts.common import ScpiLogSampler
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger('pyinsts.scpi.test_sampler')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = Collect()
+    logger.addHandler(handler)
+    yield logger
+    logger.removeHandler(handler)
+    logger.filters.clear()
+
+
+def _messages(logger):
+    return [record.getMessage() for record in logger.handlers[0].records]
+
+
+def test_interval_aggregation(logger):
+    sampler = ScpiLogSampler(interval=60)
+    logger.addFilter(sampler)
+    for index in range(5):
+        logger.info('%s 写入: %s', 'N9030B', f'FREQ:CENT {index}')
+    logger.info('%s 查询: %s', 'N9030B', 'FREQ:CENT?')
+    sampler.interval = 0
+    logger.info('%s 写入: %s', 'N9030B', 'FREQ:CENT 9')
+    assert _messages(logger) == ['N9030B 写入: FREQ:CENT 0', 'N9030B 查询: FREQ:CENT?',
+                                 'N9030B 写入: FREQ:CENT 9 (合并4条)']
+
+
+def test_every_sampling(logger):
+    logger.addFilter(ScpiLogSampler(interval=0, every=3))
+    for index in range(7):
+        logger.info('写入: %s', index)
+    assert _messages(logger) == ['写入: 2 (合并2条)', '写入: 5 (合并2条)']
+
+
+def test_summary_is_a_new_record(logger):
+    sampler = ScpiLogSampler(interval=0, every=2)
+    logger.addFilter(sampler)
+    record = logger.makeRecord(logger.name, logging.INFO, __file__, 0, '写入: %s', ('A',), None)
+    assert not sampler.filter(record)
+    second = logger.makeRecord(logger.name, logging.INFO, __file__, 0, '写入: %s', ('B',), None)
+    assert not sampler.filter(second)
+    summary = logger.handlers[0].records[-1]
+    assert summary is not second
+    assert (second.msg, second.args) == ('写入: %s', ('B',))
+    assert summary.getMessage() == '写入: B (合并1条)'
+
+
+def test_summary_without_args():
+    record = logging.makeLogRecord({'msg': '100% 完成', 'args': ()})
+    assert ScpiLogSampler.summarize(record, 3).getMessage() == '100% 完成 (合并3条)'
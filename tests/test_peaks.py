@@ -0,0 +1,39 @@
+import numpy as np
+
+from pyinsts.libs.peaks import find_peaks
+
+# 峰值: 序号2高10，序号10高8，序号6高4，两侧基底均为0
+TRACE = np.array([0, 5, 10, 5, 0, 1, 4, 1, 0, 2, 8, 2, 0], dtype=float)
+
+
+def test_peaks_sorted_by_height():
+    peaks = find_peaks(TRACE)
+    assert list(peaks['index']) == [2, 10, 6]
+    assert list(peaks['y']) == [10, 8, 4]
+
+
+def test_threshold_count_and_x():
+    x = np.arange(TRACE.size) * 1e6
+    peaks = find_peaks(TRACE, x, count=1, threshold=5)
+    assert list(peaks['x']) == [2e6]
+
+
+def test_excursion_uses_prominence():
+    assert list(find_peaks(TRACE, excursion=4)['index']) == [2, 10, 6]
+    assert list(find_peaks(TRACE, excursion=4.5)['index']) == [2, 10]
+    # 高峰旁的小凸起：相对两侧较高的基底只突出1
+    trace = np.array([0, 10, 8, 9, 0], dtype=float)
+    assert list(find_peaks(trace, excursion=2)['index']) == [1]
+    assert list(find_peaks(trace, excursion=1)['index']) == [1, 3]
+
+
+def test_spacing_drops_lower_neighbours():
+    assert list(find_peaks(TRACE, spacing=5)['index']) == [2, 10]
+
+
+def test_stacked_traces_are_padded():
+    peaks = find_peaks(np.stack([TRACE, np.zeros_like(TRACE)]), count=2)
+    assert peaks.shape == (2, 2)
+    assert list(peaks[0]['index']) == [2, 10]
+    assert list(peaks[1]['index']) == [-1, -1]
+    assert np.isnan(peaks[1]['y']).all()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from pyinsts.libs.phase_noise import (PhaseNoiseTrace, integrated_phase_noise, residual_fm, rms_jitter,
+                                      rms_phase, spot_noise)
+
+OFFSETS = np.logspace(3, 7, 41)
+
+
+def test_flat_noise_integrates_exactly():
+    noise = np.full(OFFSETS.size, -120.0)
+    expected = 2 * 1e-12 * (1e6 - 1e4)
+    assert integrated_phase_noise(OFFSETS, noise, (1e4, 1e6))[0] == pytest.approx(10 * np.log10(expected))
+    assert rms_phase(OFFSETS, noise, (1e4, 1e6))[0] == pytest.approx(np.sqrt(expected))
+    jitter = rms_jitter(OFFSETS, noise, 1e9, (1e4, 1e6))[0]
+    assert jitter == pytest.approx(np.sqrt(expected) / (2 * np.pi * 1e9) * 1e15)
+
+
+def test_power_law_noise_between_trace_points():
+    # L(f) = -80 dBc/Hz * (1e3/f)^2，区间端点不在迹线点上
+    noise = -80 - 20 * np.log10(OFFSETS / 1e3)
+    start, stop = 1.5e3, 7.7e5
+    expected = 1e-8 * 1e6 * (1 / start - 1 / stop)
+    assert rms_phase(OFFSETS, noise, (start, stop))[0] == pytest.approx(np.sqrt(2 * expected))
+    # f^2加权后为常数密度
+    assert residual_fm(OFFSETS, noise, (start, stop))[0] == pytest.approx(np.sqrt(2 * 1e-2 * (stop - start)))
+
+
+def test_spot_noise_interpolates_in_log_frequency():
+    noise = -80 - 20 * np.log10(OFFSETS / 1e3)
+    np.testing.assert_allclose(spot_noise(OFFSETS, noise, [3e3, 5.5e4, 1e9]),
+                               [-80 - 20 * np.log10(3), -80 - 20 * np.log10(55), noise[-1]])
+
+
+def test_multiple_traces_and_ranges():
+    noise = np.stack([np.full(OFFSETS.size, -120.0), np.full(OFFSETS.size, -110.0)])
+    trace = PhaseNoiseTrace(OFFSETS, noise, carrier=np.array([1e9, 2e9]))
+    result = trace.integrated([(1e3, 1e5), (1e4, 1e6)])
+    assert result.shape == (2, 2)
+    assert result[1, 0] - result[0, 0] == pytest.approx(10)
+    assert trace.jitter((1e3, 1e5)).shape == (2, 1)
+    assert trace.spot([1e4]).shape == (2, 1)
+
+
+def test_descending_offsets_and_mismatch():
+    noise = np.full(OFFSETS.size, -120.0)
+    assert rms_phase(OFFSETS[::-1], noise, (1e4, 1e6))[0] == pytest.approx(rms_phase(OFFSETS, noise, (1e4, 1e6))[0])
+    with pytest.raises(ValueError):
+        rms_phase(OFFSETS, noise[:-1], (1e4, 1e6))
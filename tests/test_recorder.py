@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from pyinsts.libs.keysight.N9020B import N9020b
+from pyinsts.libs.recorder import HEADER, read_sessions
+
+
+def _job(instrument):
+    table = instrument.query_markers([1, 2], positions=[1e9, 2e9])
+    instrument.run_single(5).wait()
+    return table['y'], np.array(instrument.query_trace(1))
+
+
+def test_replay_reproduces_recorded_session(tmp_path, n9020b_address):
+    path = str(tmp_path / 'session.scpi')
+    instrument = N9020b(n9020b_address)
+    instrument.record(path)
+    recorded = _job(instrument)
+    instrument.close()
+    sessions = read_sessions(path)
+    assert len(sessions) == 1 and sessions[0][0].kind == HEADER
+
+    replay = N9020b(f'replay://{path}?speed=0')
+    replayed = _job(replay)
+    assert replay._session().remaining == 0
+    replay.close()
+    for expected, actual in zip(recorded, replayed):
+        np.testing.assert_array_equal(expected, actual)
+
+
+def test_replay_rejects_different_command(tmp_path, n9020b_address):
+    path = str(tmp_path / 'session.scpi')
+    instrument = N9020b(n9020b_address)
+    instrument.record(path)
+    instrument.query('FREQ:CENT?')
+    instrument.close()
+
+    replay = N9020b(f'replay://{path}?speed=0')
+    with pytest.raises(ValueError):
+        replay.query('FREQ:SPAN?')
+    replay.close()
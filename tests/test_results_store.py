@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from pyinsts.common import ResultsStore
+from pyinsts.libs.markers import MARKER_DTYPE, marker_table
+
+
+def test_append_reopen_and_query(tmp_path):
+    root = str(tmp_path / 'store')
+    with ResultsStore(root, chunk_rows=4) as store:
+        for index in range(10):
+            store.append('spectrum', np.full(8, index, np.float32), dut=f'SN{index % 2}',
+                         center_freq=1e9 + index, timestamp=float(index), lot='42')
+        store.append('jitter_fs', 203.4, dut='SN0')
+
+    with ResultsStore(root) as store:
+        assert store.datasets['spectrum'] == ((8,), '<f4', 10)
+        entries = store.query('spectrum', dut='SN1')
+        assert [entry.row for entry in entries] == [1, 3, 5, 7, 9]
+        assert entries[0].meta == {'lot': '42'}
+        np.testing.assert_array_equal(store.load(entries)[:, 0], [1, 3, 5, 7, 9])
+        # 重新打开后继续追加到未写满的数据块
+        store.append('spectrum', np.full(8, 10, np.float32))
+        assert store.query('spectrum', center_freq=(1e9 + 2, 1e9 + 3), limit=5)[-1].row == 3
+
+    with ResultsStore(root) as store:
+        chunks = [[entry.row for entry in block] for block, _ in store.iter_chunks(store.query('spectrum'))]
+        assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10]]
+        np.testing.assert_array_equal(store.load(store.query('spectrum'))[-1], np.full(8, 10))
+
+
+def test_append_validates_shape_and_dtype(tmp_path):
+    with ResultsStore(str(tmp_path)) as store:
+        store.append('trace', np.zeros(4, np.float32))
+        with pytest.raises(ValueError):
+            store.append('trace', np.zeros(5, np.float32))
+        with pytest.raises(ValueError):
+            store.append('trace', np.zeros(4))
+        store.append('trace', np.zeros(4, np.int8))
+        store.append('trace', np.zeros(4), cast=True)
+        assert store.datasets['trace'][2] == 3
+
+
+def test_structured_dtype_survives_reopen(tmp_path):
+    root = str(tmp_path / 'store')
+    with ResultsStore(root) as store:
+        store.append('markers', marker_table([1, 2], ['1e9', '2e9'], ['-10', '-20'], ['POS', 'DELT']))
+    with ResultsStore(root) as store:
+        assert store.datasets['markers'][1] == np.lib.format.dtype_to_descr(MARKER_DTYPE)
+        store.append('markers', marker_table([1, 2], ['3e9', '4e9'], ['-30', '-40'], ['POS', 'POS']))
+        table = store.load(store.query('markers'))
+    assert table.dtype == MARKER_DTYPE
+    np.testing.assert_array_equal(table['x'][:, 1], [2e9, 4e9])
+    assert list(table['mode'][0]) == ['POS', 'DELT']
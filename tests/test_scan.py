@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from pyinsts.libs.keysight.N9020B import plan_segments
+
+
+def test_plan_segments_respects_rbw_and_point_limit():
+    segments, points = plan_segments(10e6, 6e9, 1e6, max_points=2001)
+    assert points <= 2001
+    assert segments[0][0] == 10e6 and segments[-1][1] == 6e9
+    np.testing.assert_allclose(segments[1:, 0], segments[:-1, 1])
+    spacing = (segments[0][1] - segments[0][0]) / (points - 1)
+    assert spacing <= 1e6 / 2
+
+
+def test_plan_segments_rejects_invalid_range():
+    with pytest.raises(ValueError):
+        plan_segments(2e9, 1e9, 1e6)
+
+
+def test_scan_stitches_segments(n9020b):
+    freq, power = n9020b.scan(10e6, 3e9, 1e6, max_points=2001)
+    segments, points = plan_segments(10e6, 3e9, 1e6, max_points=2001)
+    assert isinstance(freq, np.memmap) and isinstance(power, np.memmap)
+    assert freq.size == power.size == len(segments) * (points - 1) + 1
+    np.testing.assert_allclose(freq, np.linspace(10e6, 3e9, freq.size))
+    assert np.all(np.isfinite(power))
+
+
+def test_scan_into_out(n9020b):
+    segments, points = plan_segments(10e6, 3e9, 1e6, max_points=2001)
+    out = np.empty(len(segments) * (points - 1) + 1, dtype=np.float32)
+    freq, power = n9020b.scan(10e6, 3e9, 1e6, max_points=2001, out=out)
+    assert power is out and isinstance(freq, np.memmap)
+    with pytest.raises(ValueError):
+        n9020b.scan(10e6, 3e9, 1e6, max_points=2001, out=out[:-1])
+
+
+def test_iter_scan_can_stop_early(n9020b):
+    scanned = n9020b.iter_scan(10e6, 3e9, 1e6, max_points=2001)
+    segment_freq, data = next(scanned)
+    assert segment_freq.size == data.size
+    scanned.close()
+    assert n9020b.query('*OPC?').strip() == '1'
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from pyinsts.libs.scheduler import Scheduler
+
+
+def _sleep(seconds, result=None):
+    def action():
+        time.sleep(seconds)
+        return result
+    return action
+
+
+def test_instruments_overlap_and_critical_path(n9020b, fswp):
+    scheduler = Scheduler()
+    scheduler.add('fswp_sweep', _sleep(0.3), fswp)
+    scheduler.add('sa_1', _sleep(0.1, 1), n9020b)
+    scheduler.add('sa_2', _sleep(0.1, 2), n9020b)
+    scheduler.add('analyse', _sleep(0.05), after=['fswp_sweep', 'sa_2'])
+    report = scheduler.run()
+    assert report.makespan < 0.3 + 0.2 + 0.05
+    assert report.critical_path == ['fswp_sweep', 'analyse']
+    assert report.critical_time == pytest.approx(0.35, abs=0.05)
+    assert report.results['sa_2'] == 2
+    # 同一仪器上的步骤串行执行
+    assert report.timings['sa_2'].start >= report.timings['sa_1'].end
+    assert report.timings['analyse'].start >= report.timings['fswp_sweep'].end
+    assert set(report.utilization) == {f'{n9020b.model}@{n9020b.address}', f'{fswp.model}@{fswp.address}'}
+
+
+def test_same_instrument_steps_count_on_critical_path(n9020b):
+    scheduler = Scheduler()
+    scheduler.add('a', _sleep(0.1), n9020b)
+    scheduler.add('b', _sleep(0.1), n9020b)
+    scheduler.add('host', _sleep(0.05))
+    report = scheduler.run()
+    assert report.critical_path == ['a', 'b']
+
+
+def test_completion_results_are_awaited(n9020b):
+    scheduler = Scheduler()
+    scheduler.add('cal', lambda: n9020b.start('*CAL?', response=True), n9020b)
+    assert scheduler.run().results['cal'].strip() == '0'
+
+
+def test_invalid_graphs():
+    scheduler = Scheduler()
+    scheduler.add('a', _sleep(0), after=['b'])
+    with pytest.raises(ValueError):
+        scheduler.run()
+    scheduler.add('b', _sleep(0), after=['a'])
+    with pytest.raises(ValueError):
+        scheduler.run()
+    with pytest.raises(ValueError):
+        scheduler.add('a', _sleep(0))
+
+
+def test_step_error_propagates():
+    scheduler = Scheduler()
+    scheduler.add('fail', lambda: 1 / 0)
+    scheduler.add('later', _sleep(0), after=['fail'])
+    with pytest.raises(ZeroDivisionError):
+        scheduler.run()
@@ -0,0 +1,40 @@
+from pyinsts.libs.shadow import ShadowState
+
+
+def test_unchanged_setting_is_skipped(n9020b):
+    n9020b.write('FREQ:CENT 1GHz', shadow=True)
+    n9020b.write('FREQ:CENT 1GHz', shadow=True)
+    assert n9020b.shadow.hits == 1
+    n9020b.write('FREQ:CENT 2GHz', shadow=True)
+    assert float(n9020b.query('FREQ:CENT?')) == 2e9
+
+
+def test_reset_invalidates_all():
+    shadow = ShadowState()
+    shadow.update('FREQ:CENT 1GHz')
+    shadow.update('BAND:RES 1kHz')
+    shadow.update('*RST', shadow=False)
+    assert not shadow.is_unchanged('FREQ:CENT 1GHz')
+    assert not shadow.is_unchanged('BAND:RES 1kHz')
+    assert shadow.settings() == []
+
+
+def test_coupled_setting_invalidates_span():
+    shadow = ShadowState()
+    shadow.update('FREQ:SPAN 1MHz')
+    shadow.update('FREQ:STAR 1GHz')
+    assert not shadow.is_unchanged('FREQ:SPAN 1MHz')
+
+
+def test_invalidate_keeps_replay_log():
+    shadow = ShadowState()
+    shadow.update('FREQ:CENT 1GHz')
+    shadow.invalidate()
+    assert not shadow.is_unchanged('FREQ:CENT 1GHz')
+    assert shadow.settings() == ['FREQ:CENT 1GHz']
+
+
+def test_reconnect_replays_settings(n9020b):
+    n9020b.write('FREQ:CENT 3GHz', shadow=True)
+    n9020b.instrument.disconnect()
+    assert float(n9020b.query('FREQ:CENT?')) == 3e9
@@ -0,0 +1,28 @@
+import numpy as np
+
+
+def test_n9020b_settings_round_trip(n9020b):
+    n9020b.set_freq_cent(1, 'GHz')
+    n9020b.set_freq_span(100, 'MHz')
+    assert float(n9020b.query('FREQ:CENT?')) == 1e9
+    assert float(n9020b.query('FREQ:SPAN?')) == 100e6
+
+
+def test_n9020b_single_sweep_and_trace(n9020b):
+    n9020b.run_single().wait()
+    trace = n9020b.query_trace()
+    assert isinstance(trace, np.ndarray)
+    assert trace.size == int(n9020b.query('SWE:POIN?'))
+
+
+def test_n9020b_markers(n9020b):
+    table = n9020b.query_markers([1, 2], positions=[1e9, 2e9])
+    assert list(table['marker']) == [1, 2]
+    assert list(table['x']) == [1e9, 2e9]
+
+
+def test_fswp_phase_noise_trace(fswp):
+    fswp.set_select_pn()
+    offsets, noise = fswp.query_trace_pairs(1)
+    assert offsets.size == noise.size > 1
+    assert np.all(np.diff(offsets) > 0)
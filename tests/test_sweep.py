@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from pyinsts.libs.recorder import WRITE, read_records
+from pyinsts.libs.sweep import Axis, Measurement, Sweep
+
+
+def _sweep(n9020b, **kwargs):
+    return Sweep(axes=[Axis('freq', [1e9, 2e9], n9020b, 'FREQ:CENT {}Hz'),
+                       Axis('span', [1e6, 2e6, 5e6], n9020b, 'FREQ:SPAN {}Hz')],
+                 measurements=[Measurement('center', n9020b, 'FREQ:CENT?', trigger='INIT:IMM'),
+                               Measurement('span_read', n9020b, 'FREQ:SPAN?')], **kwargs)
+
+
+def test_collect_records_cartesian_product(n9020b):
+    sweep = _sweep(n9020b)
+    records = sweep.collect(chunk_size=4)
+    assert len(sweep) == records.size == 6
+    assert records.dtype.names == ('freq', 'span', 'center', 'span_read')
+    np.testing.assert_array_equal(records['freq'], [1e9] * 3 + [2e9] * 3)
+    np.testing.assert_array_equal(records['center'], records['freq'])
+    np.testing.assert_array_equal(records['span_read'], records['span'])
+
+
+def test_run_yields_chunks(n9020b):
+    assert [chunk.size for chunk in _sweep(n9020b).run(chunk_size=4)] == [4, 2]
+
+
+def test_settings_and_trigger_share_one_transfer(n9020b, tmp_path):
+    path = str(tmp_path / 'sweep.scpi')
+    n9020b.record(path)
+    _sweep(n9020b).collect()
+    n9020b.stop_recording()
+    writes = [record.data.decode() for record in read_records(path) if record.kind == WRITE]
+    setups = [write for write in writes if 'INIT:IMM' in write]
+    assert len(setups) == 6
+    # 外层轴只在变化时发送
+    assert sum('FREQ:CENT 1000000000.0Hz' in write for write in setups) == 1
+    assert setups[1].startswith('FREQ:SPAN 2000000.0Hz;:INIT:IMM')
+    assert sum(write == 'FREQ:CENT?;:FREQ:SPAN?' for write in writes) == 6
+
+
+def test_trace_measurement_and_save(n9020b, tmp_path):
+    points = int(n9020b.query('SWE:POIN?'))
+    sweep = Sweep(axes=[Axis('freq', [1e9, 2e9], n9020b, 'FREQ:CENT {}Hz')],
+                  measurements=[Measurement('trace', n9020b, 'TRAC:DATA? TRACE1', trigger='INIT:IMM',
+                                            points=points, dtype='f4')])
+    saved = sweep.save(str(tmp_path / 'sweep.npy'))
+    assert saved.shape == (2,) and saved['trace'].shape == (2, points)
+    np.testing.assert_array_equal(np.load(str(tmp_path / 'sweep.npy'))['freq'], [1e9, 2e9])
+
+
+def test_function_axis_and_duplicate_names(n9020b):
+    applied = []
+    sweep = Sweep(axes=[Axis('vt', [0.5, 1.5], None, applied.append)],
+                  measurements=[Measurement('center', n9020b, 'FREQ:CENT?')])
+    assert sweep.collect().size == 2
+    assert applied == [0.5, 1.5]
+    with pytest.raises(ValueError):
+        Sweep(axes=[Axis('x', [1], None, applied.append)], measurements=[Measurement('x', n9020b, '*OPC?')])
@@ -0,0 +1,60 @@
+from pyinsts.libs.timeouts import TimeoutPolicy
+
+
+class Resource:
+    def __init__(self):
+        self.assigned = []
+
+    def __setattr__(self, name, value):
+        if name == 'timeout':
+            self.assigned.append(value)
+        object.__setattr__(self, name, value)
+
+
+def test_profiles_and_defaults():
+    policy = TimeoutPolicy(write_timeout=1000, query_timeout=500)
+    assert policy.timeout_for('FREQ:CENT 1GHz') == 1000
+    assert policy.timeout_for('FREQ:CENT?', query=True) == 500
+    assert policy.timeout_for('MMEM:STOR:SCR "a.png"') == 60000
+    policy.add_profile(r'^FREQ', 42)
+    assert policy.timeout_for('FREQ:CENT 1GHz') == 42
+
+
+def test_apply_only_sets_changed_timeout():
+    policy = TimeoutPolicy()
+    resource = Resource()
+    for timeout in (1000, 1000, 2000, 2000):
+        policy.apply(resource, timeout)
+    assert resource.assigned == [1000, 2000]
+    policy.reset()
+    policy.apply(resource, 2000)
+    assert resource.assigned == [1000, 2000, 2000]
+
+
+def test_adaptive_timeout_learns_from_samples():
+    policy = TimeoutPolicy(query_timeout=20000, adaptive=True, adaptive_factor=4.0, adaptive_min_samples=20)
+    for _ in range(19):
+        policy.observe('CALC:MARK1:Y?', 0.1)
+    assert policy.timeout_for('CALC:MARK2:Y?', query=True) == 20000
+    policy.observe('CALC:MARK1:Y?', 0.1)
+    assert policy.timeout_for('CALC:MARK2:Y?', query=True) == 400
+    assert policy.learned() == {'CALC:MARK#:Y?': 400}
+
+
+def test_adaptive_timeout_has_floor_and_never_exceeds_profile():
+    policy = TimeoutPolicy(query_timeout=300, adaptive=True, adaptive_floor=200)
+    for _ in range(20):
+        policy.observe('*IDN?', 0.001)
+        policy.observe('TRAC? TRACE1', 10.0)
+    assert policy.timeout_for('*IDN?', query=True) == 200
+    assert policy.timeout_for('TRAC? TRACE1', query=True) == 30000
+
+
+def test_adaptive_timeout_keeps_updating_after_window_is_full():
+    policy = TimeoutPolicy(adaptive=True, adaptive_window=20, adaptive_min_samples=20)
+    for _ in range(20):
+        policy.observe('*IDN?', 0.5)
+    assert policy.learned()['*IDN?'] == 2000
+    for _ in range(20):
+        policy.observe('*IDN?', 0.1)
+    assert policy.learned()['*IDN?'] == 400